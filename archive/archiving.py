@@ -0,0 +1,127 @@
+import time
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from reservations.choices import Status
+from reservations.models import Reservation, ReservationFood, Comment, Reply
+from seating.models import TimeSlot
+from .models import (
+    ArchivedTimeSlot, ArchivedReservation, ArchivedReservationFood,
+    ArchivedComment, ArchivedReply,
+)
+
+ARCHIVE_STATUSES = [Status.COMPELETED, Status.CANCELLED]
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 500
+
+SLOT_FIELDS = [
+    "id", "table_id", "date", "start_time", "end_time",
+    "duration_minutes", "is_active", "is_deleted", "note",
+]
+RESERVATION_FIELDS = [
+    "id", "user_id", "time_slot_id", "date", "status", "attendance_status",
+    "number_of_people", "total_price", "note", "is_deleted", "created_at", "updated_at",
+]
+LINE_FIELDS = [
+    "id", "reservation_id", "food_item_id", "quantity", "final_price",
+    "is_deleted", "created_at", "updated_at",
+]
+COMMENT_FIELDS = [
+    "id", "user_id", "reservation_id", "comment", "rating",
+    "is_deleted", "created_at", "updated_at",
+]
+REPLY_FIELDS = ["id", "user_id", "comment_id", "reply", "is_deleted", "created_at"]
+
+
+def archive_cutoff(days):
+    return timezone.now().date() - timedelta(days=days)
+
+
+def _move(queryset, archive_model, fields, delete=True):
+    archive_model.objects.bulk_create(
+        [archive_model(**row) for row in queryset.values(*fields)],
+        ignore_conflicts=True,
+    )
+
+    # A raw DELETE skips the model signals on purpose: archived rows keep
+    # counting towards ratings and the daily stats.
+    if delete:
+        return queryset._raw_delete(queryset.db)
+
+    return 0
+
+
+def archive_reservation_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    with transaction.atomic():
+        reservation_ids = list(
+            Reservation.all_objects.select_for_update(skip_locked=True).filter(
+                date__lt=cutoff,
+                status__in=ARCHIVE_STATUSES,
+            ).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+
+        if not reservation_ids:
+            return 0
+
+        reservations = Reservation.all_objects.filter(id__in=reservation_ids)
+
+        _move(
+            TimeSlot.all_objects.filter(id__in=reservations.values("time_slot_id")),
+            ArchivedTimeSlot, SLOT_FIELDS, delete=False,
+        )
+        _move(
+            Reply.all_objects.filter(comment__reservation_id__in=reservation_ids),
+            ArchivedReply, REPLY_FIELDS,
+        )
+        _move(
+            Comment.all_objects.filter(reservation_id__in=reservation_ids),
+            ArchivedComment, COMMENT_FIELDS,
+        )
+        _move(
+            ReservationFood.all_objects.filter(reservation_id__in=reservation_ids),
+            ArchivedReservationFood, LINE_FIELDS,
+        )
+
+        return _move(reservations, ArchivedReservation, RESERVATION_FIELDS)
+
+
+def archive_slot_batch(cutoff, batch_size=ARCHIVE_BATCH_SIZE):
+    with transaction.atomic():
+        slot_ids = list(
+            TimeSlot.all_objects.select_for_update(skip_locked=True, of=("self",)).filter(
+                date__lt=cutoff,
+                reservations__isnull=True,
+            ).order_by("id").values_list("id", flat=True)[:batch_size]
+        )
+
+        if not slot_ids:
+            return 0
+
+        return _move(
+            TimeSlot.all_objects.filter(id__in=slot_ids),
+            ArchivedTimeSlot, SLOT_FIELDS,
+        )
+
+
+def archive_before(cutoff, batch_size=ARCHIVE_BATCH_SIZE, pause=0, on_batch=None):
+    totals = {"reservations": 0, "slots": 0}
+
+    for name, archive_batch in (
+        ("reservations", archive_reservation_batch),
+        ("slots", archive_slot_batch),
+    ):
+        while True:
+            moved = archive_batch(cutoff, batch_size)
+
+            if not moved:
+                break
+
+            totals[name] += moved
+
+            if on_batch:
+                on_batch(name, moved)
+
+            if pause:
+                time.sleep(pause)
+
+    return totals
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from archive.archiving import (
+    ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, archive_before, archive_cutoff,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed and cancelled reservations, and past time slots, older than "
+        "--days into the archive tables. Each batch commits on its own, so an "
+        "interrupted run simply continues where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to sleep between batches, to go easy on a busy database.",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options["days"])
+
+        def report(name, moved):
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Archived {moved} {name}.")
+
+        totals = archive_before(
+            cutoff,
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            on_batch=report,
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {totals['reservations']} reservations and "
+            f"{totals['slots']} time slots dated before {cutoff}."
+        ))
@@ -0,0 +1,133 @@
+from django.db import models
+from django.contrib.auth import get_user_model
+from seating.models import CafeTable
+from menu.models import FoodItem
+
+User = get_user_model()
+
+
+class ArchivedTimeSlot(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    table = models.ForeignKey(
+        CafeTable,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    date = models.DateField(db_index=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+    duration_minutes = models.PositiveIntegerField()
+    is_active = models.BooleanField()
+    is_deleted = models.BooleanField()
+    note = models.CharField(max_length=255, blank=True, null=True)
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.start_time} - {self.end_time}"
+
+
+class ArchivedReservation(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    time_slot = models.ForeignKey(
+        ArchivedTimeSlot,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="reservations"
+    )
+
+    date = models.DateField(db_index=True)
+    status = models.CharField(max_length=3)
+    attendance_status = models.CharField(max_length=3)
+    number_of_people = models.PositiveIntegerField()
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    note = models.TextField(blank=True, null=True)
+    is_deleted = models.BooleanField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived reservation {self.id}"
+
+
+class ArchivedReservationFood(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    reservation = models.ForeignKey(
+        ArchivedReservation,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="reservation_foods"
+    )
+
+    food_item = models.ForeignKey(
+        FoodItem,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    quantity = models.PositiveIntegerField()
+    final_price = models.DecimalField(max_digits=10, decimal_places=2)
+    is_deleted = models.BooleanField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+
+class ArchivedComment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    reservation = models.OneToOneField(
+        ArchivedReservation,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="comment"
+    )
+
+    comment = models.TextField()
+    rating = models.IntegerField()
+    is_deleted = models.BooleanField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+
+class ArchivedReply(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+"
+    )
+
+    comment = models.OneToOneField(
+        ArchivedComment,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="replies"
+    )
+
+    reply = models.TextField()
+    is_deleted = models.BooleanField()
+    created_at = models.DateTimeField()
@@ -0,0 +1,165 @@
+import io
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from dashboard.exports import export_queryset, iter_export_records
+from dashboard.models import DailyReservationStats
+from dashboard.stats import rebuild_daily_stats
+from menu.models import Category, FoodItem
+from reservations.choices import Status
+from reservations.models import Reservation, ReservationFood, Comment, Reply
+from reservations.ratings import rebuild_rating_summaries
+from seating.models import CafeTable, TimeSlot
+from .archiving import archive_before
+from .models import (
+    ArchivedTimeSlot, ArchivedReservation, ArchivedReservationFood,
+    ArchivedComment, ArchivedReply,
+)
+
+User = get_user_model()
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.table = CafeTable.objects.create(
+            table_number=1,
+            capacity=6,
+            price_per_person=Decimal("5.00"),
+        )
+        self.food = FoodItem.objects.create(
+            name="Latte",
+            price=Decimal("4.00"),
+            category=Category.objects.create(name="Drinks"),
+        )
+        self.old_day = date.today() - timedelta(days=400)
+        self.cutoff = date.today() - timedelta(days=180)
+
+    def reserve(self, day, hour, status, people=2):
+        slot = TimeSlot.objects.create(
+            table=self.table,
+            date=day,
+            start_time=time(hour),
+            end_time=time(hour + 1),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation = Reservation.objects.create(
+                user=self.user,
+                time_slot=slot,
+                date=day,
+                number_of_people=people,
+                status=status,
+            )
+            ReservationFood.objects.create(
+                reservation=reservation,
+                food_item=self.food,
+                quantity=2,
+            )
+
+        return reservation
+
+    def test_old_finished_reservations_move_to_the_archive(self):
+        done = self.reserve(self.old_day, 10, Status.COMPELETED)
+        cancelled = self.reserve(self.old_day, 12, Status.CANCELLED)
+        pending = self.reserve(self.old_day, 14, Status.PENDING)
+        recent = self.reserve(date.today(), 10, Status.COMPELETED)
+        empty_slot = TimeSlot.objects.create(
+            table=self.table,
+            date=self.old_day,
+            start_time=time(16),
+            end_time=time(17),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            comment = Comment.objects.create(
+                user=self.user, reservation=done, comment="Nice", rating=4
+            )
+            Reply.objects.create(user=self.staff, comment=comment, reply="Thanks")
+
+        totals = archive_before(self.cutoff, batch_size=1)
+
+        self.assertEqual(totals, {"reservations": 2, "slots": 3})
+        self.assertEqual(
+            set(Reservation.all_objects.values_list("id", flat=True)),
+            {pending.id, recent.id},
+        )
+        self.assertEqual(
+            set(ArchivedReservation.objects.values_list("id", flat=True)),
+            {done.id, cancelled.id},
+        )
+        self.assertEqual(ArchivedReservationFood.objects.count(), 2)
+        self.assertEqual(ArchivedComment.objects.get().reservation_id, done.id)
+        self.assertEqual(ArchivedReply.objects.get().reply, "Thanks")
+
+        self.assertFalse(TimeSlot.all_objects.filter(id=empty_slot.id).exists())
+        self.assertTrue(TimeSlot.all_objects.filter(id=pending.time_slot_id).exists())
+        self.assertEqual(
+            ArchivedReservation.objects.get(id=done.id).time_slot.start_time,
+            time(10),
+        )
+        self.assertFalse(ArchivedTimeSlot.objects.filter(id=pending.time_slot_id).exists())
+
+    def test_rerun_is_a_no_op(self):
+        self.reserve(self.old_day, 10, Status.COMPELETED)
+
+        archive_before(self.cutoff)
+
+        self.assertEqual(archive_before(self.cutoff), {"reservations": 0, "slots": 0})
+        self.assertEqual(ArchivedReservation.objects.count(), 1)
+
+    def test_stats_and_ratings_survive_archiving_and_rebuilds(self):
+        done = self.reserve(self.old_day, 10, Status.COMPELETED, people=3)
+        self.reserve(self.old_day, 12, Status.CANCELLED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(user=self.user, reservation=done, comment="Nice", rating=4)
+
+        rebuild_daily_stats()
+        before = DailyReservationStats.objects.values().get(date=self.old_day)
+
+        archive_before(self.cutoff)
+        rebuild_daily_stats()
+        rebuild_rating_summaries()
+
+        after = DailyReservationStats.objects.values().get(date=self.old_day)
+        self.assertEqual(
+            {key: value for key, value in after.items() if key not in ("id", "updated_at")},
+            {key: value for key, value in before.items() if key not in ("id", "updated_at")},
+        )
+        self.assertEqual(after["covers"], 3)
+
+        self.food.refresh_from_db()
+        self.assertEqual(self.food.rating_count, 1)
+        self.assertEqual(self.food.rating_sum, 4)
+
+    def test_export_can_include_archived_reservations(self):
+        done = self.reserve(self.old_day, 10, Status.COMPELETED)
+        recent = self.reserve(date.today(), 10, Status.COMPELETED)
+
+        archive_before(self.cutoff)
+
+        records = list(iter_export_records(export_queryset()))
+        self.assertEqual([record["id"] for record in records], [recent.id])
+
+        records = list(iter_export_records(
+            export_queryset(archived=True), include_lines=True, archived=True
+        ))
+        self.assertEqual([record["id"] for record in records], [done.id, recent.id])
+        self.assertEqual(records[0]["table"], 1)
+        self.assertEqual(records[0]["lines"][0]["food_name"], "Latte")
+
+    def test_command_uses_the_days_option(self):
+        self.reserve(self.old_day, 10, Status.COMPELETED)
+        out = io.StringIO()
+
+        call_command("archive_reservations", days=500, stdout=out)
+        self.assertIn("Archived 0 reservations", out.getvalue())
+
+        call_command("archive_reservations", days=30, stdout=out)
+        self.assertIn("Archived 1 reservations", out.getvalue())
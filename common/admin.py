@@ -1,4 +1,21 @@
 from django.contrib import admin
+from .models import BaseModel
 
 class BaseAdmin(admin.ModelAdmin):
-    exclude = ("is_deleted",)
\ No newline at end of file
+    exclude = ("is_deleted",)
+
+    # Soft delete the rows that point at a deleted one as well. Off by default:
+    # food lines and comments are history and must outlive their menu items.
+    cascade_delete = False
+
+    def delete_model(self, request, obj):
+        if not isinstance(obj, BaseModel):
+            return super().delete_model(request, obj)
+
+        obj.delete(cascade=self.cascade_delete)
+
+    def delete_queryset(self, request, queryset):
+        if not issubclass(queryset.model, BaseModel):
+            return super().delete_queryset(request, queryset)
+
+        queryset.soft_delete(cascade=self.cascade_delete)
@@ -0,0 +1,62 @@
+import json
+from django.db import connection
+
+INDEX_SCANS = {"Index Scan", "Index Only Scan", "Bitmap Index Scan"}
+
+
+def query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return plan[0]["Plan"]
+
+
+def table_scans(queryset):
+    """
+    Return how the plan reads the queryset's own table: "Seq Scan" for
+    sequential scans and the index name for index scans. Joined tables are
+    ignored.
+    """
+    table = queryset.model._meta.db_table
+    scans = []
+    nodes = [(query_plan(queryset), table)]
+
+    while nodes:
+        node, relation = nodes.pop()
+        relation = node.get("Relation Name", relation)
+        node_type = node["Node Type"]
+
+        if relation == table:
+            if node_type == "Seq Scan":
+                scans.append(node_type)
+
+            elif node_type in INDEX_SCANS:
+                scans.append(node["Index Name"])
+
+        nodes.extend((child, relation) for child in node.get("Plans", []))
+
+    return scans
+
+
+class QueryPlanAssertions:
+    def assertUsesIndex(self, queryset, *index_names):
+        """
+        Assert that the table is read through exactly one index scan, on one
+        of index_names if any are given.
+        """
+        scans = table_scans(queryset)
+        expected = " or ".join(index_names) or "any index"
+
+        self.assertTrue(
+            len(scans) == 1
+            and scans[0] != "Seq Scan"
+            and (not index_names or scans[0] in index_names),
+            f"Expected a scan on {expected}, got {', '.join(scans) or 'none'} for:\n"
+            f"{queryset.query}",
+        )
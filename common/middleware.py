@@ -0,0 +1,121 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+IN_LIST = re.compile(r"\((?:%s, )+%s\)")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """
+    Declare the most queries a view may run per request. Works on function views
+    and on class based views (or set query_budget on the class directly).
+    """
+
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
+def fingerprint(sql):
+    return IN_LIST.sub("(%s...)", sql)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_ms(self):
+        return sum(duration for sql, duration in self.queries) * 1000
+
+    def duplicates(self):
+        counts = Counter(fingerprint(sql) for sql, duration in self.queries)
+        return {sql: count for sql, count in counts.items() if count > 1}
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the SQL run while a request is handled and reports it in one JSON
+    log line, and in X-Query-* response headers when QUERY_BUDGET_HEADERS is
+    set. Views that declare a query_budget are checked against it: over
+    budget raises when QUERY_BUDGET_RAISE is set (the test runner) and logs a
+    warning otherwise. Queries run while a streaming response is consumed are
+    not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+
+            response = self.get_response(request)
+
+        duplicates = recorder.duplicates()
+        budget = getattr(request, "_query_budget", None)
+        report = {
+            "method": request.method,
+            "path": request.path,
+            "view": getattr(request, "_query_view", None),
+            "status": response.status_code,
+            "queries": recorder.count,
+            "sql_ms": round(recorder.total_ms, 2),
+            "duplicates": sum(duplicates.values()) - len(duplicates),
+            "budget": budget,
+        }
+
+        if getattr(settings, "QUERY_BUDGET_HEADERS", False):
+            response["X-Query-Count"] = str(report["queries"])
+            response["X-Query-Time-Ms"] = str(report["sql_ms"])
+            response["X-Query-Duplicates"] = str(report["duplicates"])
+
+        if budget is None or recorder.count <= budget:
+            logger.info(json.dumps(report))
+            return response
+
+        report["duplicate_queries"] = duplicates
+        message = f"{report['view']} ran {recorder.count} queries, budget is {budget}."
+
+        if getattr(settings, "QUERY_BUDGET_RAISE", False):
+            raise QueryBudgetExceeded(f"{message} Duplicates: {duplicates}")
+
+        logger.warning(json.dumps(report))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        view = view_class or view_func
+
+        request._query_view = f"{view.__module__}.{view.__qualname__}"
+        request._query_budget = getattr(
+            view_func, "query_budget", getattr(view_class, "query_budget", None)
+        )
@@ -1,24 +1,94 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+from .signals import pre_set_deleted
 
 
-class CustomManager(models.Manager):
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    Bulk soft delete and restore. With cascade=True, rows that point at these ones
+    through a CASCADE foreign key are updated first, one UPDATE per model. A
+    cascade stamps every row it deletes with the same deleted_at, and a cascade
+    restore only brings back dependents carrying their parent's stamp, so rows
+    deleted on their own stay deleted.
+    Restore through all_objects, since objects hides the deleted rows.
+    """
+
+    def soft_delete(self, cascade=False):
+        return self._set_deleted(True, cascade)
+
+    def restore(self, cascade=False):
+        return self._set_deleted(False, cascade)
+
+    def _set_deleted(self, is_deleted, cascade):
+        deleted_at = timezone.now() if is_deleted else None
+
+        with transaction.atomic(using=self.db):
+            return self._update_deleted(is_deleted, deleted_at, cascade)
+
+    def _update_deleted(self, is_deleted, deleted_at, cascade):
+        queryset = self.filter(is_deleted=not is_deleted)
+
+        if not queryset.exists():
+            return 0
+
+        if cascade:
+            for related in self.model._meta.related_objects:
+                if related.on_delete is not models.CASCADE:
+                    continue
+                if not issubclass(related.related_model, BaseModel):
+                    continue
+
+                dependents = related.related_model.all_objects.filter(**{
+                    f"{related.field.name}__in": queryset.values("pk")
+                })
+
+                if not is_deleted:
+                    dependents = dependents.filter(
+                        deleted_at=models.F(f"{related.field.name}__deleted_at")
+                    )
+
+                dependents._update_deleted(is_deleted, deleted_at, cascade)
+
+        pre_set_deleted.send(sender=self.model, queryset=queryset, is_deleted=is_deleted)
+
+        return queryset.update(is_deleted=is_deleted, deleted_at=deleted_at)
+
+
+class CustomManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(is_deleted=False)
 
 
+class AllObjectsManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    pass
+
+
 class BaseModel(models.Model):
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     objects = CustomManager()      # hides deleted
-    all_objects = models.Manager() # shows all rows
+    all_objects = AllObjectsManager() # shows all rows
 
     class Meta:
         abstract = True
 
-    def delete(self, *args, **kwargs):
+    def delete(self, *args, cascade=False, **kwargs):
+        if cascade:
+            type(self).all_objects.filter(pk=self.pk).soft_delete(cascade=True)
+            self.is_deleted = True
+            return
+
         self.is_deleted = True
-        self.save(update_fields=["is_deleted"])
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["is_deleted", "deleted_at"])
+
+    def restore(self, cascade=False):
+        if cascade:
+            type(self).all_objects.filter(pk=self.pk).restore(cascade=True)
+            self.is_deleted = False
+            return
 
-    def restore(self):
         self.is_deleted = False
-        self.save(update_fields=["is_deleted"])
+        self.deleted_at = None
+        self.save(update_fields=["is_deleted", "deleted_at"])
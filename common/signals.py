@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent before a queryset's is_deleted flag is flipped in bulk, for both soft
+# delete and restore, and only when some row will change. Arguments:
+# queryset, is_deleted.
+pre_set_deleted = Signal()
@@ -38,6 +38,7 @@ LOCAL_APPS = [
     'reservations.apps.ReservationsConfig',
     'seating.apps.SeatingConfig',
     'dashboard.apps.DashboardConfig',
+    'archive.apps.ArchiveConfig',
 ]
 
 INSTALLED_APPS = [
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'common.middleware.QueryBudgetMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -95,6 +97,53 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv("CACHE_BACKEND") or 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': os.getenv("CACHE_LOCATION") or '',
+    }
+}
+
+
+# Per-request SQL query budgets, see common.middleware.QueryBudgetMiddleware.
+# Views over their budget log a warning; the test runner turns
+# QUERY_BUDGET_RAISE on so they fail the test suite instead. The X-Query-*
+# headers expose SQL timings, so they are off unless QUERY_BUDGET_HEADERS=1.
+
+QUERY_BUDGET_HEADERS = os.getenv("QUERY_BUDGET_HEADERS", "").lower() in ("1", "true", "yes")
+QUERY_BUDGET_RAISE = False
+
+TEST_RUNNER = 'common.runner.QueryBudgetRunner'
+
+
+# Sessions are read from the cache and written through to the database, and
+# the logged in user is cached by users.backends.CachedModelBackend, so a warm
+# authenticated request spends no queries on either. ModelBackend stays listed
+# so sessions that name it remain valid; CachedModelBackend stops a failed
+# login before it is asked to check the same password again.
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
+# Login and activation resend throttling, see users.throttling. The buckets
+# live in the default cache, which must be shared by every worker (Redis or
+# Memcached): with the local memory cache each process keeps its own buckets
+# and the limits multiply by the number of workers.
+# Behind a reverse proxy, name the META key of the forwarded-for header it
+# appends to (e.g. HTTP_X_FORWARDED_FOR) and how many proxies append to it.
+
+THROTTLE_CLIENT_IP_HEADER = os.getenv("THROTTLE_CLIENT_IP_HEADER")
+THROTTLE_TRUSTED_PROXIES = int(os.getenv("THROTTLE_TRUSTED_PROXIES") or 1)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
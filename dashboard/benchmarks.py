@@ -0,0 +1,198 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from menu.models import FoodItem
+from reservations.choices import Status
+from reservations.models import Reservation
+from reservations.utils import generate_slots
+from seating.models import TimeSlot
+
+DUMMY_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "benchmarks",
+    }
+}
+
+# Session and user lookup strategies compared by BookingBenchmarks.auth_path().
+AUTH_STRATEGIES = {
+    "db": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+        "AUTHENTICATION_BACKENDS": ["django.contrib.auth.backends.ModelBackend"],
+    },
+    "cached": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+        "AUTHENTICATION_BACKENDS": ["users.backends.CachedModelBackend"],
+    },
+}
+
+
+def _summary(name, timings, queries):
+    timings = sorted(timings)
+
+    return {
+        "name": name,
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 2),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 2),
+        "max_ms": round(timings[-1] * 1000, 2),
+        "queries": max(queries),
+    }
+
+
+@override_settings(QUERY_BUDGET_HEADERS=True)
+def _time_request(client, repeat, method, path, **kwargs):
+    timings = []
+    queries = []
+
+    for _ in range(repeat):
+        # Benchmarks run inside a transaction that is rolled back, so work
+        # deferred with transaction.on_commit is run here to keep it in the
+        # timings.
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            started = time.perf_counter()
+            response = getattr(client, method)(path, **kwargs)
+
+        timings.append(time.perf_counter() - started)
+
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method.upper()} {path} returned {response.status_code}.")
+
+        queries.append(int(response["X-Query-Count"]))
+
+    return timings, queries
+
+
+class BookingBenchmarks:
+    """
+    Times the booking flows through the full middleware stack with the test
+    client. Query counts come from the X-Query-Count header that
+    QueryBudgetMiddleware adds.
+    """
+
+    def __init__(self, repeat=10):
+        self.repeat = repeat
+        self.today = timezone.now().date()
+
+        User = get_user_model()
+        stamp = time.time_ns()
+        self.guest = User.objects.create_user(username=f"benchmark-guest-{stamp}")
+        self.staff = User.objects.create_user(username=f"benchmark-staff-{stamp}", is_staff=True)
+
+        self.guest_client = Client()
+        self.guest_client.force_login(self.guest)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def run(self):
+        return [
+            self.make_reservation(),
+            self.menu(),
+            self.order(),
+            self.dashboard(),
+            self.reservation_list(),
+            self.slot_generation(),
+            *self.auth_path(),
+        ]
+
+    def make_reservation(self):
+        path = reverse("make_reservation")
+        day = self.today + timedelta(days=1)
+
+        return _summary("make_reservation", *_time_request(
+            self.guest_client, self.repeat, "get", path, data={"date": day.isoformat()},
+        ))
+
+    def menu(self):
+        return _summary("menu", *_time_request(
+            self.guest_client, self.repeat, "get", reverse("menu_list"),
+        ))
+
+    def order(self):
+        slot = TimeSlot.objects.filter(
+            date__gt=self.today,
+            reservations__isnull=True,
+        ).select_related("table").order_by("date", "start_time").first()
+
+        if slot is None:
+            raise RuntimeError("No free future time slot to order for.")
+
+        reservation = Reservation.objects.create(
+            user=self.guest,
+            time_slot=slot,
+            date=slot.date,
+            number_of_people=1,
+            status=Status.PENDING,
+        )
+        foods = FoodItem.objects.filter(is_available=True).values_list("id", flat=True)[:5]
+        payload = json.dumps({
+            "items": [{"food_item_id": str(food_id), "quantity": 1} for food_id in foods]
+        })
+
+        return _summary("order_post", *_time_request(
+            self.guest_client, self.repeat, "post",
+            reverse("reservation_order", args=[reservation.pk]),
+            data=payload, content_type="application/json",
+        ))
+
+    def dashboard(self):
+        return _summary("dashboard", *_time_request(
+            self.staff_client, self.repeat, "get", reverse("dashboard"),
+        ))
+
+    def reservation_list(self):
+        return _summary("admin_reservations", *_time_request(
+            self.staff_client, self.repeat, "get", reverse("reservations"),
+        ))
+
+    def auth_path(self):
+        """
+        Hot guest pages with sessions and users read from the database versus
+        from the cache. Both run against a warm local memory cache, so the
+        difference is only the per-request session and user lookups.
+        """
+        day = self.today + timedelta(days=1)
+        pages = [
+            ("my_reservations", reverse("my_reservations"), {}),
+            ("make_reservation", reverse("make_reservation"), {"date": day.isoformat()}),
+        ]
+        results = []
+
+        for strategy, overrides in AUTH_STRATEGIES.items():
+            with override_settings(CACHES=LOCMEM_CACHES, **overrides):
+                client = Client()
+                client.force_login(self.guest)
+
+                for name, path, data in pages:
+                    _time_request(client, 1, "get", path, data=data)
+                    results.append(_summary(f"{name}[{strategy}_auth]", *_time_request(
+                        client, self.repeat, "get", path, data=data,
+                    )))
+
+        return results
+
+    def slot_generation(self):
+        latest = TimeSlot.all_objects.order_by("-date").values_list("date", flat=True).first()
+        start_date = max(latest or self.today, self.today) + timedelta(days=1)
+        timings = []
+        queries = []
+
+        for run in range(self.repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                generate_slots(start_date + timedelta(days=7 * run), 7)
+                timings.append(time.perf_counter() - started)
+
+            queries.append(len(captured))
+
+        return _summary("generate_slots_7_days", timings, queries)
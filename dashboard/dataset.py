@@ -0,0 +1,254 @@
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from menu.models import Category, FoodItem
+from menu.snapshot import bump_menu_version
+from reservations.availability import invalidate_all_availability
+from reservations.choices import Status, AttendanceStatus
+from reservations.models import Reservation, ReservationFood, Comment
+from reservations.ratings import rebuild_rating_summaries
+from reservations.utils import generate_slots
+from seating.choices import DayofWeek
+from seating.models import CafeTable, TimeSlot, WorkingHour
+from .stats import rebuild_daily_stats
+
+DATASET_BATCH_SIZE = 5000
+DATASET_PASSWORD = "password"
+SLOT_DAYS_PER_BATCH = 7
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def ensure_menu(count, rng):
+    existing = FoodItem.objects.count()
+
+    if existing >= count:
+        return 0
+
+    categories = list(Category.objects.all()) or Category.objects.bulk_create([
+        Category(name=f"Category {number}") for number in range(1, 9)
+    ])
+
+    foods = []
+    for number in range(existing + 1, count + 1):
+        price = Decimal(rng.randrange(200, 1500)) / 100
+        foods.append(FoodItem(
+            name=f"Dish {number}",
+            category=rng.choice(categories),
+            price=price,
+            effective_price=price,
+        ))
+
+    FoodItem.objects.bulk_create(foods, batch_size=DATASET_BATCH_SIZE)
+    bump_menu_version()
+
+    return len(foods)
+
+
+def ensure_working_hours():
+    existing = set(WorkingHour.all_objects.values_list("day_of_week", flat=True))
+
+    WorkingHour.objects.bulk_create([
+        WorkingHour(day_of_week=day, start_time=time(8), end_time=time(22))
+        for day in DayofWeek.values
+        if day not in existing
+    ])
+
+
+def create_tables(count, rng):
+    start_number = (CafeTable.all_objects.aggregate(
+        top=Max("table_number")
+    )["top"] or 0) + 1
+
+    CafeTable.objects.bulk_create([
+        CafeTable(
+            table_number=number,
+            capacity=rng.choice([2, 2, 4, 4, 4, 6, 8]),
+            price_per_person=Decimal(rng.choice([3, 4, 5, 6])),
+        )
+        for number in range(start_number, start_number + count)
+    ], batch_size=DATASET_BATCH_SIZE)
+
+    return count
+
+
+def create_users(count, prefix):
+    User = get_user_model()
+    start = User.objects.filter(username__startswith=prefix).count()
+    password = make_password(DATASET_PASSWORD)
+
+    for chunk in _batches(range(start, start + count), DATASET_BATCH_SIZE):
+        User.objects.bulk_create([
+            User(
+                username=f"{prefix}{number}",
+                email=f"{prefix}{number}@example.com",
+                password=password,
+            )
+            for number in chunk
+        ])
+
+    return list(
+        User.objects.filter(username__startswith=prefix).values_list("id", flat=True)
+    )
+
+
+def create_slots(start_date, days):
+    created = 0
+
+    for offset in range(0, days, SLOT_DAYS_PER_BATCH):
+        created += generate_slots(
+            start_date + timedelta(days=offset),
+            min(SLOT_DAYS_PER_BATCH, days - offset),
+        )[0]
+
+    return created
+
+
+def _reservation_status(slot_date, today, rng):
+    if slot_date < today:
+        if rng.random() < 0.15:
+            return Status.CANCELLED, AttendanceStatus.UNKNOWN
+
+        attendance = AttendanceStatus.PRESENT if rng.random() < 0.9 else AttendanceStatus.ABSENT
+        return Status.COMPELETED, attendance
+
+    return rng.choice([Status.PENDING, Status.CONFIRMED]), AttendanceStatus.UNKNOWN
+
+
+def create_reservations(
+    start_date, days, user_ids, occupancy, max_lines, comment_rate, rng,
+    batch_size=DATASET_BATCH_SIZE,
+):
+    today = timezone.now().date()
+    foods = list(FoodItem.objects.filter(is_available=True).values_list("id", "effective_price"))
+    commented = set(Comment.all_objects.values_list("user_id", flat=True))
+    counts = {"reservations": 0, "lines": 0, "comments": 0}
+
+    slots = TimeSlot.objects.filter(
+        date__range=(start_date, start_date + timedelta(days=days - 1)),
+        is_active=True,
+        reservations__isnull=True,
+    ).values_list(
+        "id", "date", "table__capacity", "table__price_per_person"
+    ).order_by("id").iterator(chunk_size=batch_size)
+
+    for chunk in _batches(slots, batch_size):
+        reservations = []
+        food_lines = []
+
+        for slot_id, slot_date, capacity, price_per_person in chunk:
+            if rng.random() >= occupancy:
+                continue
+
+            status, attendance = _reservation_status(slot_date, today, rng)
+            people = rng.randint(1, capacity)
+            lines = {}
+
+            if foods and max_lines:
+                picked = rng.sample(foods, min(len(foods), rng.randint(0, max_lines)))
+
+                for food_id, effective_price in picked:
+                    quantity = rng.randint(1, 3)
+                    lines[food_id] = (quantity, effective_price * quantity)
+
+            reservation = Reservation(
+                user_id=rng.choice(user_ids),
+                time_slot_id=slot_id,
+                date=slot_date,
+                status=status,
+                attendance_status=attendance,
+                number_of_people=people,
+                total_price=price_per_person * people + sum(
+                    final_price for quantity, final_price in lines.values()
+                ),
+            )
+            reservations.append(reservation)
+            food_lines.append(lines)
+
+        with transaction.atomic():
+            Reservation.objects.bulk_create(reservations)
+
+            ReservationFood.objects.bulk_create([
+                ReservationFood(
+                    reservation_id=reservation.pk,
+                    food_item_id=food_id,
+                    quantity=quantity,
+                    final_price=final_price,
+                )
+                for reservation, lines in zip(reservations, food_lines)
+                for food_id, (quantity, final_price) in lines.items()
+            ], batch_size=batch_size)
+
+            comments = []
+            for reservation, lines in zip(reservations, food_lines):
+                if (
+                    reservation.status != Status.COMPELETED
+                    or not lines
+                    or reservation.user_id in commented
+                    or rng.random() >= comment_rate
+                ):
+                    continue
+
+                commented.add(reservation.user_id)
+                comments.append(Comment(
+                    user_id=reservation.user_id,
+                    reservation_id=reservation.pk,
+                    comment="Generated review.",
+                    rating=rng.randint(1, 5),
+                ))
+
+            Comment.objects.bulk_create(comments, batch_size=batch_size)
+
+        counts["reservations"] += len(reservations)
+        counts["lines"] += sum(len(lines) for lines in food_lines)
+        counts["comments"] += len(comments)
+
+    return counts
+
+
+def generate_dataset(
+    tables, days, users, start_date=None, occupancy=0.5, max_lines=3,
+    comment_rate=0.3, foods=40, user_prefix="dataset-user-", seed=0,
+):
+    """
+    Bulk load a synthetic cafe: tables, working hours, slots for days starting at
+    start_date, users, and reservations with food lines and comments. Model
+    save() and signals are bypassed, so totals are computed here and the
+    rating summaries, daily stats and caches are rebuilt once at the end.
+    """
+    rng = random.Random(seed)
+
+    if start_date is None:
+        start_date = timezone.now().date() - timedelta(days=days // 2)
+
+    counts = {
+        "foods": ensure_menu(foods, rng),
+        "tables": create_tables(tables, rng),
+    }
+
+    ensure_working_hours()
+    counts["slots"] = create_slots(start_date, days)
+
+    user_ids = create_users(users, user_prefix)
+    counts["users"] = users
+
+    counts.update(create_reservations(
+        start_date, days, user_ids, occupancy, max_lines, comment_rate, rng,
+    ))
+
+    rebuild_rating_summaries()
+    rebuild_daily_stats()
+    invalidate_all_availability()
+
+    return counts
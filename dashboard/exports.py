@@ -0,0 +1,138 @@
+import csv
+import json
+from itertools import islice
+from django.core.serializers.json import DjangoJSONEncoder
+from archive.models import ArchivedReservation, ArchivedReservationFood
+from reservations.models import Reservation, ReservationFood
+
+EXPORT_CHUNK_SIZE = 2000
+
+RESERVATION_COLUMNS = {
+    "id": "id",
+    "date": "date",
+    "start_time": "time_slot__start_time",
+    "end_time": "time_slot__end_time",
+    "table": "time_slot__table__table_number",
+    "user": "user__username",
+    "number_of_people": "number_of_people",
+    "status": "status",
+    "attendance_status": "attendance_status",
+    "total_price": "total_price",
+    "created_at": "created_at",
+}
+
+LINE_COLUMNS = {
+    "food_id": "food_item_id",
+    "food_name": "food_item__name",
+    "quantity": "quantity",
+    "final_price": "final_price",
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def _filtered(queryset, date_from, date_to, status, table, user):
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if status:
+        queryset = queryset.filter(status=status)
+    if table:
+        queryset = queryset.filter(time_slot__table__table_number=table)
+    if user:
+        queryset = queryset.filter(user__username=user)
+
+    return queryset.values_list(*RESERVATION_COLUMNS.values())
+
+
+def export_queryset(
+    date_from=None, date_to=None, status=None, archived=False, table=None, user=None
+):
+    filters = (date_from, date_to, status, table, user)
+    queryset = _filtered(Reservation.objects.all(), *filters)
+
+    if archived:
+        queryset = queryset.union(
+            _filtered(ArchivedReservation.objects.filter(is_deleted=False), *filters),
+            all=True,
+        )
+
+    return queryset.order_by("date", "id")
+
+
+def _lines_for(reservation_ids, archived=False):
+    lines = {}
+    sources = [ReservationFood.objects.all()]
+
+    if archived:
+        sources.append(ArchivedReservationFood.objects.filter(is_deleted=False))
+
+    for source in sources:
+        rows = source.filter(
+            reservation_id__in=reservation_ids
+        ).order_by("id").values_list("reservation_id", *LINE_COLUMNS.values())
+
+        for reservation_id, *values in rows:
+            lines.setdefault(reservation_id, []).append(dict(zip(LINE_COLUMNS, values)))
+
+    return lines
+
+
+def iter_export_records(queryset, include_lines=False, archived=False):
+    rows = queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+
+        if not chunk:
+            return
+
+        lines = {}
+        if include_lines:
+            lines = _lines_for([row[0] for row in chunk], archived)
+
+        for row in chunk:
+            record = dict(zip(RESERVATION_COLUMNS, row))
+
+            if include_lines:
+                record["lines"] = lines.get(record["id"], [])
+
+            yield record
+
+
+def stream_csv(records, include_lines=False):
+    writer = csv.writer(Echo())
+    header = list(RESERVATION_COLUMNS)
+
+    if include_lines:
+        header += list(LINE_COLUMNS)
+
+    yield writer.writerow(header)
+
+    for record in records:
+        values = [record[column] for column in RESERVATION_COLUMNS]
+
+        if not include_lines:
+            yield writer.writerow(values)
+            continue
+
+        for line in record["lines"] or [{}]:
+            yield writer.writerow(values + [line.get(column, "") for column in LINE_COLUMNS])
+
+
+def stream_jsonl(records):
+    for record in records:
+        yield json.dumps(record, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(queryset, export_format, include_lines=False, archived=False):
+    records = iter_export_records(queryset, include_lines, archived)
+
+    if export_format == "jsonl":
+        return stream_jsonl(records)
+
+    return stream_csv(records, include_lines)
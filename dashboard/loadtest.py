@@ -0,0 +1,298 @@
+import json
+import random
+import threading
+import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from menu.models import FoodItem
+from reservations.availability import ACTIVE_STATUSES, get_available_tables
+from reservations.models import Reservation
+from reservations.utils import generate_slots
+
+LOCK_SAMPLE_INTERVAL = 0.05
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+
+    values = sorted(values)
+    index = max(0, min(len(values) - 1, round(pct / 100 * len(values)) - 1))
+
+    return values[index]
+
+
+def _latency_summary(samples):
+    latencies = [latency for latency, outcome in samples]
+    outcomes = {}
+
+    for latency, outcome in samples:
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    return {
+        "requests": len(samples),
+        "outcomes": outcomes,
+        **{
+            f"{name}_ms": round(percentile(latencies, pct) * 1000, 2) if latencies else None
+            for name, pct in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100))
+        },
+    }
+
+
+def _classify_error(error):
+    message = str(error).lower()
+
+    if "deadlock" in message:
+        return "deadlock"
+    if "lock" in message:
+        return "lock_error"
+
+    return "error"
+
+
+class LockMonitor(threading.Thread):
+    """
+    Samples ungranted locks on PostgreSQL while the load runs. Other backends
+    only report lock errors seen by the clients.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        try:
+            with connection.cursor() as cursor:
+                while not self.stopped.wait(LOCK_SAMPLE_INTERVAL):
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_locks l JOIN pg_database d ON d.oid = l.database "
+                        "WHERE NOT l.granted AND d.datname = current_database()"
+                    )
+                    self.samples.append(cursor.fetchone()[0])
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def _deadlock_count():
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_stat_clear_snapshot()")
+        cursor.execute(
+            "SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()"
+        )
+        return cursor.fetchone()[0]
+
+
+class BookingLoadTest:
+    """
+    Drives the booking (and optionally the order) endpoint from many threads,
+    one test client and database connection per simulated user, all competing
+    for the same few slots. Needs committed data, so it cannot run inside a
+    transaction; the users and reservations it creates are removed by cleanup().
+    """
+
+    def __init__(
+        self, users=200, attempts=3, selected_date=None, after=None,
+        slots=10, order=False, people=2, concurrency=50, seed=0,
+    ):
+        self.users = users
+        self.concurrency = concurrency
+        self.attempts = attempts
+        self.selected_date = selected_date or self.next_friday()
+        self.after = after
+        self.slot_count = slots
+        self.order = order
+        self.people = people
+        self.seed = seed
+        self.prefix = f"loadtest-{time.time_ns()}-"
+        self.samples = {"book": [], "order": []}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def next_friday():
+        today = timezone.localdate()
+        return today + timedelta(days=(4 - today.weekday()) % 7 or 7)
+
+    def setup(self):
+        self.targets = self.target_slots()
+
+        if not self.targets:
+            generate_slots(self.selected_date, 1)
+            self.targets = self.target_slots()
+
+        if not self.targets:
+            raise RuntimeError(f"No free slots on {self.selected_date} to book.")
+
+        User = get_user_model()
+        password = make_password(None)
+        User.objects.bulk_create([
+            User(username=f"{self.prefix}{number}", password=password)
+            for number in range(self.users)
+        ])
+        self.user_ids = list(
+            User.objects.filter(username__startswith=self.prefix).values_list("id", flat=True)
+        )
+        self.food_ids = list(
+            FoodItem.objects.filter(is_available=True).values_list("id", flat=True)[:5]
+        )
+
+    def target_slots(self):
+        keys = []
+
+        for table in get_available_tables(self.selected_date):
+            for slot in table["slots"]:
+                if slot["is_reserved"]:
+                    continue
+
+                if self.after is None or slot["slot"].start_time >= self.after:
+                    keys.append((slot["slot"].start_time, slot["key"]))
+
+        return [key for start_time, key in sorted(keys)[:self.slot_count]]
+
+    def record(self, endpoint, started, outcome):
+        with self.lock:
+            self.samples[endpoint].append((time.perf_counter() - started, outcome))
+
+    def request(self, endpoint, client, path, **kwargs):
+        started = time.perf_counter()
+
+        try:
+            response = client.post(path, **kwargs)
+        except Exception as error:
+            self.record(endpoint, started, _classify_error(error))
+            return None
+
+        if response.status_code == 302:
+            outcome = "booked"
+        elif response.status_code == 200 and endpoint == "book":
+            outcome = "rejected"
+        elif response.status_code == 200:
+            outcome = "ordered"
+        else:
+            outcome = f"http_{response.status_code}"
+
+        self.record(endpoint, started, outcome)
+        return response
+
+    def simulate_user(self, index):
+        rng = random.Random(self.seed * 100003 + index)
+        user = get_user_model().objects.get(pk=self.user_ids[index])
+        client = Client()
+        client.force_login(user)
+
+        try:
+            for _ in range(self.attempts):
+                key = rng.choice(self.targets)
+                response = self.request("book", client, reverse("make_reservation"), data={
+                    "date": self.selected_date.isoformat(),
+                    "time_slot": key,
+                    "number_of_people": self.people,
+                })
+
+                if response is None or response.status_code != 302 or not self.order:
+                    continue
+
+                reservation = Reservation.objects.filter(user=user).order_by("-id").first()
+                self.request(
+                    "order", client,
+                    reverse("reservation_order", args=[reservation.pk]),
+                    data=json.dumps({"items": [
+                        {"food_item_id": str(food_id), "quantity": rng.randint(1, 3)}
+                        for food_id in self.food_ids
+                    ]}),
+                    content_type="application/json",
+                )
+        finally:
+            connections.close_all()
+
+    def run(self):
+        deadlocks_before = _deadlock_count()
+        monitor = LockMonitor() if connection.vendor == "postgresql" else None
+
+        if monitor:
+            monitor.start()
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=min(self.users, self.concurrency)) as pool:
+            list(pool.map(self.simulate_user, range(self.users)))
+
+        duration = time.perf_counter() - started
+
+        if monitor:
+            monitor.stop()
+
+        deadlocks_after = _deadlock_count()
+        total_requests = sum(len(samples) for samples in self.samples.values())
+        lock_samples = monitor.samples if monitor else []
+
+        return {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "config": {
+                "users": self.users,
+                "concurrency": min(self.users, self.concurrency),
+                "attempts": self.attempts,
+                "date": self.selected_date.isoformat(),
+                "slots": len(self.targets),
+                "order": self.order,
+            },
+            "duration_s": round(duration, 3),
+            "throughput_rps": round(total_requests / duration, 2) if duration else None,
+            "endpoints": {
+                endpoint: _latency_summary(samples)
+                for endpoint, samples in self.samples.items()
+                if samples
+            },
+            "lock_waits": {
+                "samples": len(lock_samples),
+                "samples_with_waiters": sum(1 for waiting in lock_samples if waiting),
+                "max_waiting": max(lock_samples, default=0),
+            },
+            "deadlocks": (
+                deadlocks_after - deadlocks_before
+                if deadlocks_before is not None
+                else sum(
+                    1 for samples in self.samples.values()
+                    for latency, outcome in samples if outcome == "deadlock"
+                )
+            ),
+            **self.verify(),
+        }
+
+    def verify(self):
+        reservations = Reservation.objects.filter(
+            date=self.selected_date,
+            status__in=ACTIVE_STATUSES,
+        )
+        double_booked = reservations.values(
+            "time_slot__table_id", "time_slot__start_time"
+        ).annotate(bookings=Count("id")).filter(bookings__gt=1)
+
+        booked = sum(
+            1 for latency, outcome in self.samples["book"] if outcome == "booked"
+        )
+
+        return {
+            "booked": booked,
+            "reservations_created": reservations.filter(user_id__in=self.user_ids).count(),
+            "double_bookings": double_booked.count(),
+        }
+
+    def cleanup(self):
+        Reservation.all_objects.filter(user_id__in=self.user_ids).delete()
+        get_user_model().objects.filter(id__in=self.user_ids).delete()
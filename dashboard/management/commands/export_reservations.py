@@ -0,0 +1,44 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from dashboard.exports import export_queryset, stream_export
+from reservations.choices import Status
+
+
+class Command(BaseCommand):
+    help = "Stream reservations, optionally with their food lines, as CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+        parser.add_argument("--lines", action="store_true", help="Include ReservationFood lines.")
+        parser.add_argument(
+            "--archived", action="store_true", help="Include archived reservations."
+        )
+        parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+        parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+        parser.add_argument("--status", choices=Status.values)
+        parser.add_argument("--table", type=int, help="Table number.")
+        parser.add_argument("--user", help="Username.")
+        parser.add_argument("--output", help="File to write to, defaults to stdout.")
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(
+            options["date_from"],
+            options["date_to"],
+            options["status"],
+            options["archived"],
+            options["table"],
+            options["user"],
+        )
+        chunks = stream_export(
+            queryset, options["format"], options["lines"], options["archived"]
+        )
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as output:
+            output.writelines(chunks)
+
+        self.stderr.write(self.style.SUCCESS(f"Exported to {options['output']}."))
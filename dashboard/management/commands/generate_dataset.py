@@ -0,0 +1,51 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from dashboard.dataset import generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load a synthetic dataset: tables, slots, users, reservations with "
+        "food lines and comments. Adds to whatever is already in the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tables", type=int, default=20)
+        parser.add_argument("--days", type=int, default=60)
+        parser.add_argument("--users", type=int, default=500)
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="First slot date, defaults to --days / 2 days ago.",
+        )
+        parser.add_argument(
+            "--occupancy", type=float, default=0.5, help="Share of slots that get booked."
+        )
+        parser.add_argument("--max-lines", type=int, default=3)
+        parser.add_argument(
+            "--comment-rate", type=float, default=0.3,
+            help="Share of completed reservations that get a review.",
+        )
+        parser.add_argument(
+            "--foods", type=int, default=40, help="Top the menu up to this many items."
+        )
+        parser.add_argument("--user-prefix", default="dataset-user-")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        counts = generate_dataset(
+            tables=options["tables"],
+            days=options["days"],
+            users=options["users"],
+            start_date=options["start"],
+            occupancy=options["occupancy"],
+            max_lines=options["max_lines"],
+            comment_rate=options["comment_rate"],
+            foods=options["foods"],
+            user_prefix=options["user_prefix"],
+            seed=options["seed"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            "Created " + ", ".join(f"{count} {name}" for name, count in counts.items()) + "."
+        ))
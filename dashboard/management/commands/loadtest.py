@@ -0,0 +1,87 @@
+import json
+from datetime import date, time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from dashboard.loadtest import BookingLoadTest
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the booking endpoint from many threads competing for the same "
+        "slots and report throughput, latency percentiles, lock waits, deadlocks "
+        "and double bookings. Runs against the configured database; SQLite "
+        "serializes writers, so expect lock errors there."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument(
+            "--concurrency", type=int, default=50,
+            help="Worker threads, each holding its own database connection.",
+        )
+        parser.add_argument("--attempts", type=int, default=3, help="Booking attempts per user.")
+        parser.add_argument(
+            "--date", dest="selected_date", type=date.fromisoformat,
+            help="Day to book, defaults to next Friday.",
+        )
+        parser.add_argument(
+            "--after", type=time.fromisoformat,
+            help="Only target slots starting at or after this time, e.g. 18:00.",
+        )
+        parser.add_argument("--slots", type=int, default=10, help="How many slots to fight over.")
+        parser.add_argument("--order", action="store_true", help="Also POST a food order after booking.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", default="loadtest.json", help="Result file.")
+        parser.add_argument("--keep", action="store_true", help="Keep the users and reservations.")
+
+    def handle(self, *args, **options):
+        loadtest = BookingLoadTest(
+            users=options["users"],
+            attempts=options["attempts"],
+            selected_date=options["selected_date"],
+            after=options["after"],
+            slots=options["slots"],
+            order=options["order"],
+            concurrency=options["concurrency"],
+            seed=options["seed"],
+        )
+
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            QUERY_BUDGET_RAISE=False,
+        ):
+            loadtest.setup()
+
+            try:
+                result = loadtest.run()
+            finally:
+                if not options["keep"]:
+                    loadtest.cleanup()
+
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(result, output, indent=2)
+
+        self.stdout.write(
+            f"{result['config']['users']} users on {result['config']['slots']} slots: "
+            f"{result['throughput_rps']} req/s over {result['duration_s']}s"
+        )
+
+        for endpoint, summary in result["endpoints"].items():
+            self.stdout.write(
+                f"  {endpoint:<6} p50 {summary['p50_ms']} ms  p95 {summary['p95_ms']} ms  "
+                f"p99 {summary['p99_ms']} ms  {summary['outcomes']}"
+            )
+
+        self.stdout.write(
+            f"  lock waits in {result['lock_waits']['samples_with_waiters']}"
+            f"/{result['lock_waits']['samples']} samples "
+            f"(max {result['lock_waits']['max_waiting']} waiting), "
+            f"deadlocks {result['deadlocks']}"
+        )
+
+        style = self.style.ERROR if result["double_bookings"] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"  {result['booked']} booked, {result['double_bookings']} double bookings. "
+            f"Result written to {options['output']}."
+        ))
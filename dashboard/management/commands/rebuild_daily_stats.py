@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from dashboard.stats import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the daily reservation rollups from the reservations table."
+
+    def handle(self, *args, **options):
+        days = rebuild_daily_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt reservation stats for {days} days."))
@@ -0,0 +1,85 @@
+import json
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from dashboard.benchmarks import DUMMY_CACHES, LOCMEM_CACHES, BookingBenchmarks
+from dashboard.dataset import generate_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the booking flows at one or more scale factors. Each scale loads "
+        "scale x --tables tables and scale x --users users over --days days, runs "
+        "the benchmarks and rolls everything back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="1,5", help="Comma separated scale factors.")
+        parser.add_argument("--tables", type=int, default=10)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--days", type=int, default=60)
+        parser.add_argument("--repeat", type=int, default=10)
+        parser.add_argument(
+            "--cached",
+            action="store_true",
+            help="Measure with a private local memory cache instead of uncached requests.",
+        )
+        parser.add_argument("--json", dest="json_output", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        scales = [int(scale) for scale in options["scales"].split(",")]
+        overrides = {"ALLOWED_HOSTS": [*settings.ALLOWED_HOSTS, "testserver"]}
+
+        # Never the configured cache: entries written for the rolled back
+        # dataset would outlive it.
+        overrides["CACHES"] = LOCMEM_CACHES if options["cached"] else DUMMY_CACHES
+
+        results = []
+
+        with override_settings(**overrides):
+            for scale in scales:
+                results.append(self.run_scale(scale, options))
+
+        if options["json_output"]:
+            with open(options["json_output"], "w", encoding="utf-8") as output:
+                json.dump(results, output, indent=2)
+
+    def run_scale(self, scale, options):
+        cache.clear()
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            dataset = generate_dataset(
+                tables=options["tables"] * scale,
+                days=options["days"],
+                users=options["users"] * scale,
+                seed=scale,
+            )
+            load_seconds = time.perf_counter() - started
+
+            benchmarks = BookingBenchmarks(repeat=options["repeat"]).run()
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"\nscale {scale}: "
+            + ", ".join(f"{count} {name}" for name, count in dataset.items())
+            + f" loaded in {load_seconds:.1f}s"
+        )
+        self.stdout.write(f"  {'benchmark':<32}{'median ms':>11}{'p95 ms':>10}{'max ms':>10}{'queries':>9}")
+
+        for result in benchmarks:
+            self.stdout.write(
+                f"  {result['name']:<32}{result['median_ms']:>11.2f}{result['p95_ms']:>10.2f}"
+                f"{result['max_ms']:>10.2f}{result['queries']:>9}"
+            )
+
+        return {
+            "scale": scale,
+            "dataset": dataset,
+            "load_seconds": round(load_seconds, 2),
+            "benchmarks": benchmarks,
+        }
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_cafesetting_slots_materialized_through'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafesetting',
+            name='virtual_slots',
+            field=models.BooleanField(default=False),
+        ),
+    ]
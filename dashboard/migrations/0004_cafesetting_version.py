@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0003_cafesetting_virtual_slots'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cafesetting',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:50
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_daily_stats(apps, schema_editor):
+    Reservation = apps.get_model("reservations", "Reservation")
+    DailyReservationStats = apps.get_model("dashboard", "DailyReservationStats")
+
+    billable = ~Q(status="CAN")
+
+    rows = Reservation.objects.filter(is_deleted=False).values("date").annotate(
+        reservations=Count("id"),
+        pending=Count("id", filter=Q(status="PEN")),
+        confirmed=Count("id", filter=Q(status="CON")),
+        completed=Count("id", filter=Q(status="COM")),
+        cancelled=Count("id", filter=Q(status="CAN")),
+        present=Count("id", filter=Q(attendance_status="PRE")),
+        absent=Count("id", filter=Q(attendance_status="ABS")),
+        unknown=Count("id", filter=Q(attendance_status="UNK")),
+        covers=Sum("number_of_people", filter=billable),
+        revenue=Sum("total_price", filter=billable),
+    )
+
+    DailyReservationStats.objects.bulk_create(
+        [
+            DailyReservationStats(**{key: value or 0 for key, value in row.items()})
+            for row in rows
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_cafesetting_version'),
+        ('reservations', '0005_backfill_food_ratings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReservationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('reservations', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+                ('confirmed', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('unknown', models.PositiveIntegerField(default=0)),
+                ('covers', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0005_dailyreservationstats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='absent',
+            field=models.PositiveIntegerField(default=0, verbose_name='Absent'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='cancelled',
+            field=models.PositiveIntegerField(default=0, verbose_name='Cancelled'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='completed',
+            field=models.PositiveIntegerField(default=0, verbose_name='Completed'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='confirmed',
+            field=models.PositiveIntegerField(default=0, verbose_name='Confirmed'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='covers',
+            field=models.PositiveIntegerField(default=0, verbose_name='Covers'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='date',
+            field=models.DateField(unique=True, verbose_name='Date'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='pending',
+            field=models.PositiveIntegerField(default=0, verbose_name='Pending'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='present',
+            field=models.PositiveIntegerField(default=0, verbose_name='Present'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='reservations',
+            field=models.PositiveIntegerField(default=0, verbose_name='Reservations'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='revenue',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Revenue'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='unknown',
+            field=models.PositiveIntegerField(default=0, verbose_name='Attendance Unknown'),
+        ),
+        migrations.AlterField(
+            model_name='dailyreservationstats',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Update Time'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from datetime import date
+from django.db.models import Q
+
+PAGE_SIZE = 25
+
+
+def encode_cursor(obj):
+    return f"{obj.date.isoformat()}.{obj.pk}"
+
+
+def decode_cursor(value):
+    try:
+        day, pk = value.split(".")
+        return date.fromisoformat(day), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def keyset_page(queryset, after=None, before=None, page_size=PAGE_SIZE):
+    after = decode_cursor(after)
+    before = decode_cursor(before)
+
+    if before:
+        day, pk = before
+        rows = list(
+            queryset.filter(date__gte=day)
+            .filter(Q(date__gt=day) | Q(pk__gt=pk))
+            .order_by("date", "pk")[:page_size + 1]
+        )
+        has_previous = len(rows) > page_size
+        has_next = True
+        rows = rows[:page_size][::-1]
+    else:
+        if after:
+            day, pk = after
+            queryset = queryset.filter(date__lte=day).filter(Q(date__lt=day) | Q(pk__lt=pk))
+
+        rows = list(queryset.order_by("-date", "-pk")[:page_size + 1])
+        has_previous = after is not None
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+    return {
+        "object_list": rows,
+        "next_cursor": encode_cursor(rows[-1]) if rows and has_next else None,
+        "previous_cursor": encode_cursor(rows[0]) if rows and has_previous else None,
+    }
@@ -0,0 +1,8 @@
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+from .models import CafeSetting
+
+@receiver(post_migrate)
+def clear_cafe_setting_cache(sender, **kwargs):
+    # flush (run after every TransactionTestCase) empties the table behind the cache.
+    CafeSetting.clear_cache()
@@ -0,0 +1,126 @@
+import threading
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from .models import DailyReservationStats
+
+STATS_FIELDS = [
+    "reservations", "pending", "confirmed", "completed", "cancelled",
+    "present", "absent", "unknown", "covers", "revenue",
+]
+
+_state = threading.local()
+
+
+def _dirty_dates():
+    if not hasattr(_state, "dirty"):
+        _state.dirty = set()
+
+    return _state.dirty
+
+
+def mark_stats_dirty(*dates):
+    dates = {selected_date for selected_date in dates if selected_date}
+
+    if not dates:
+        return
+
+    _dirty_dates().update(dates)
+    transaction.on_commit(flush_dirty_stats)
+
+
+def flush_dirty_stats():
+    dirty = _dirty_dates()
+
+    if not dirty:
+        return
+
+    dates = set(dirty)
+    dirty.clear()
+    refresh_daily_stats(dates)
+
+
+def _stats_aggregates():
+    from reservations.choices import Status, AttendanceStatus
+
+    billable = ~Q(status=Status.CANCELLED)
+
+    return {
+        "reservations": Count("id"),
+        "pending": Count("id", filter=Q(status=Status.PENDING)),
+        "confirmed": Count("id", filter=Q(status=Status.CONFIRMED)),
+        "completed": Count("id", filter=Q(status=Status.COMPELETED)),
+        "cancelled": Count("id", filter=Q(status=Status.CANCELLED)),
+        "present": Count("id", filter=Q(attendance_status=AttendanceStatus.PRESENT)),
+        "absent": Count("id", filter=Q(attendance_status=AttendanceStatus.ABSENT)),
+        "unknown": Count("id", filter=Q(attendance_status=AttendanceStatus.UNKNOWN)),
+        "covers": Sum("number_of_people", filter=billable),
+        "revenue": Sum("total_price", filter=billable),
+    }
+
+
+def _stats_row(selected_date, values):
+    return DailyReservationStats(
+        date=selected_date,
+        **{field: values.get(field) or 0 for field in STATS_FIELDS}
+    )
+
+
+def _stats_by_date(**filters):
+    from reservations.models import Reservation
+    from archive.models import ArchivedReservation
+
+    by_date = {}
+
+    for queryset in (
+        Reservation.objects.filter(**filters),
+        ArchivedReservation.objects.filter(is_deleted=False, **filters),
+    ):
+        for row in queryset.values("date").annotate(**_stats_aggregates()):
+            totals = by_date.setdefault(row["date"], dict.fromkeys(STATS_FIELDS, 0))
+
+            for field in STATS_FIELDS:
+                totals[field] += row[field] or 0
+
+    return by_date
+
+
+def refresh_daily_stats(dates):
+    dates = set(dates)
+    _dirty_dates().difference_update(dates)
+
+    by_date = _stats_by_date(date__in=dates)
+
+    DailyReservationStats.objects.bulk_create(
+        [_stats_row(selected_date, by_date.get(selected_date, {})) for selected_date in dates],
+        update_conflicts=True,
+        unique_fields=["date"],
+        update_fields=STATS_FIELDS + ["updated_at"],
+    )
+
+
+@transaction.atomic
+def rebuild_daily_stats():
+    by_date = _stats_by_date()
+
+    DailyReservationStats.objects.all().delete()
+    DailyReservationStats.objects.bulk_create(
+        [_stats_row(selected_date, values) for selected_date, values in by_date.items()],
+        batch_size=500,
+    )
+
+    return len(by_date)
+
+
+def get_dashboard_kpis(today):
+    totals = DailyReservationStats.objects.aggregate(
+        today_reservations=Sum("reservations", filter=Q(date=today)),
+        today_covers=Sum("covers", filter=Q(date=today)),
+        today_revenue=Sum("revenue", filter=Q(date=today)),
+        pending=Sum("pending"),
+        confirmed=Sum("confirmed"),
+        completed=Sum("completed"),
+        canceled=Sum("cancelled"),
+        revenue=Sum("revenue"),
+    )
+
+    return {key: value or 0 for key, value in totals.items()}
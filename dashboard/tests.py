@@ -1,3 +1,473 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from common.middleware import QueryBudgetExceeded
+
+from reservations.choices import Status
+from menu.models import Category, FoodItem
+from menu.snapshot import MENU_VERSION_KEY
+from reservations.models import Reservation, ReservationFood, Comment
+from seating.choices import DayofWeek
+from seating.models import CafeTable, TimeSlot, WorkingHour
+from .models import CafeSetting, DailyReservationStats
+from .benchmarks import BookingBenchmarks
+from .dataset import generate_dataset
+from .stats import rebuild_daily_stats
+from .views import FoodListView
+
+User = get_user_model()
+
+
+class CafeSettingCacheTests(TransactionTestCase):
+    def test_load_is_served_from_memory(self):
+        CafeSetting.load()
+
+        with self.assertNumQueries(0):
+            setting = CafeSetting.load()
+
+        self.assertEqual(setting.pk, 1)
+
+    def test_save_refreshes_this_process(self):
+        setting = CafeSetting.load()
+        setting.slot_duration_minutes = 90
+        setting.save()
+
+        self.assertEqual(CafeSetting.load().slot_duration_minutes, 90)
+
+    def test_change_from_another_worker_is_seen_after_interval(self):
+        with mock.patch("dashboard.models.time.monotonic", return_value=100):
+            setting = CafeSetting.load()
+
+        CafeSetting.objects.filter(pk=1).update(
+            slot_duration_minutes=45,
+            version=setting.version + 1,
+        )
+
+        with mock.patch("dashboard.models.time.monotonic", return_value=101):
+            self.assertEqual(CafeSetting.load().slot_duration_minutes, 120)
+
+        with mock.patch("dashboard.models.time.monotonic", return_value=110):
+            self.assertEqual(CafeSetting.load().slot_duration_minutes, 45)
+
+    def test_unchanged_version_costs_one_query(self):
+        with mock.patch("dashboard.models.time.monotonic", return_value=100):
+            CafeSetting.load()
+
+        with mock.patch("dashboard.models.time.monotonic", return_value=110):
+            with self.assertNumQueries(1):
+                CafeSetting.load()
+
+    def test_rolled_back_read_is_not_cached(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            CafeSetting.objects.create(slot_duration_minutes=45)
+            self.assertEqual(CafeSetting.load().slot_duration_minutes, 45)
+            raise RuntimeError
+
+        self.assertEqual(CafeSetting.load().slot_duration_minutes, 120)
+
+    def test_version_is_bumped_in_the_database(self):
+        setting = CafeSetting.load()
+        stale = CafeSetting.objects.get(pk=1)
+
+        setting.save()
+        stale.save()
+
+        self.assertEqual(stale.version, setting.version + 1)
+        self.assertEqual(CafeSetting.objects.get(pk=1).version, stale.version)
+
+
+class DailyStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.today = date.today()
+        self.table = CafeTable.objects.create(
+            table_number=1,
+            capacity=6,
+            price_per_person=Decimal("5.00"),
+        )
+
+    def reserve(self, day, hour, people):
+        slot = TimeSlot.objects.create(
+            table=self.table,
+            date=day,
+            start_time=time(hour),
+            end_time=time(hour + 1),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return Reservation.objects.create(
+                user=self.user,
+                time_slot=slot,
+                date=day,
+                number_of_people=people,
+            )
+
+    def stats(self, day):
+        return DailyReservationStats.objects.get(date=day)
+
+    def test_rollup_follows_reservation_changes(self):
+        first = self.reserve(self.today, 10, 2)
+        self.reserve(self.today, 12, 3)
+
+        stats = self.stats(self.today)
+        self.assertEqual(stats.reservations, 2)
+        self.assertEqual(stats.pending, 2)
+        self.assertEqual(stats.covers, 5)
+        self.assertEqual(stats.revenue, Decimal("25.00"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.status = Status.CANCELLED
+            first.save()
+
+        stats = self.stats(self.today)
+        self.assertEqual(stats.pending, 1)
+        self.assertEqual(stats.cancelled, 1)
+        self.assertEqual(stats.covers, 3)
+        self.assertEqual(stats.revenue, Decimal("15.00"))
+
+    def test_moving_a_reservation_updates_both_days(self):
+        reservation = self.reserve(self.today, 10, 2)
+        tomorrow = self.today + timedelta(days=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.date = tomorrow
+            reservation.save()
+
+        self.assertEqual(self.stats(self.today).reservations, 0)
+        self.assertEqual(self.stats(tomorrow).reservations, 1)
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.reserve(self.today, 10, 2)
+        self.reserve(self.today + timedelta(days=2), 10, 4)
+
+        incremental = list(DailyReservationStats.objects.order_by("date").values(
+            "date", "reservations", "covers", "revenue"
+        ))
+
+        self.assertEqual(rebuild_daily_stats(), 2)
+        self.assertEqual(
+            list(DailyReservationStats.objects.order_by("date").values(
+                "date", "reservations", "covers", "revenue"
+            )),
+            incremental,
+        )
+
+    def test_dashboard_reads_rollups(self):
+        self.reserve(self.today, 10, 2)
+        self.reserve(self.today + timedelta(days=1), 10, 2)
+
+        staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.client.force_login(staff)
+
+        response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.context["today_reservations"], 1)
+        self.assertEqual(response.context["pending"], 2)
+        self.assertEqual(response.context["canceled"], 0)
+
+
+class ReservationListTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.guest = User.objects.create_user(username="guest", password="secret")
+        self.client.force_login(self.staff)
+
+        tables = [
+            CafeTable.objects.create(
+                table_number=number,
+                capacity=4,
+                price_per_person=Decimal("5.00"),
+            )
+            for number in (1, 2)
+        ]
+
+        for offset in range(30):
+            day = date.today() + timedelta(days=offset // 6)
+            table = tables[offset % 2]
+            slot = TimeSlot.objects.create(
+                table=table,
+                date=day,
+                start_time=time(8 + offset % 6),
+                end_time=time(9 + offset % 6),
+            )
+            Reservation.objects.create(
+                user=self.guest if offset % 3 else self.staff,
+                time_slot=slot,
+                date=day,
+                number_of_people=2,
+                status=Status.CANCELLED if offset % 5 == 0 else Status.PENDING,
+            )
+
+    def walk(self, params=None):
+        seen = []
+        params = dict(params or {})
+
+        while True:
+            response = self.client.get(reverse("reservations"), params)
+            seen.extend(response.context["reservations"])
+
+            if not response.context["next_cursor"]:
+                return seen, response
+
+            params["after"] = response.context["next_cursor"]
+
+    def test_pages_cover_every_reservation_once_in_order(self):
+        seen, response = self.walk()
+
+        expected = list(Reservation.objects.order_by("-date", "-id"))
+        self.assertEqual(seen, expected)
+
+        previous = self.client.get(reverse("reservations"), {
+            "before": response.context["previous_cursor"],
+        })
+        self.assertEqual(list(previous.context["reservations"]), expected[:25])
+
+    def test_filters(self):
+        seen, response = self.walk({"status": Status.CANCELLED, "table": 1, "user": "staff"})
+
+        self.assertEqual(
+            seen,
+            list(Reservation.objects.filter(
+                status=Status.CANCELLED,
+                time_slot__table__table_number=1,
+                user=self.staff,
+            ).order_by("-date", "-id")),
+        )
+
+    def test_deep_page_costs_the_same_as_first(self):
+        first = self.client.get(reverse("reservations"))
+        cursor = first.context["next_cursor"]
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse("reservations"))
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse("reservations"), {"after": cursor})
+
+
+class ReservationExportTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.client.force_login(self.staff)
+        self.day = date.today() + timedelta(days=1)
+
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        category = Category.objects.create(name="Drinks")
+        tea = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=category)
+        coffee = FoodItem.objects.create(name="Coffee", price=Decimal("3.00"), category=category)
+
+        for hour, status in ((10, Status.PENDING), (12, Status.CANCELLED)):
+            slot = TimeSlot.objects.create(
+                table=table,
+                date=self.day,
+                start_time=time(hour),
+                end_time=time(hour + 1),
+            )
+            reservation = Reservation.objects.create(
+                user=self.staff,
+                time_slot=slot,
+                date=self.day,
+                number_of_people=2,
+                status=status,
+            )
+
+        ReservationFood.objects.create(reservation=reservation, food_item=tea, quantity=2)
+        ReservationFood.objects.create(reservation=reservation, food_item=coffee, quantity=1)
+
+    def export(self, **params):
+        response = self.client.get(reverse("reservations_export"), params)
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_with_lines_has_one_row_per_line(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(lines="on"))))
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["food_name"], "")
+        self.assertEqual([row["quantity"] for row in rows[1:]], ["2", "1"])
+
+    def test_jsonl_filters_by_status(self):
+        records = [
+            json.loads(line)
+            for line in self.export(format="jsonl", status=Status.CANCELLED, lines="on").splitlines()
+        ]
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["status"], Status.CANCELLED)
+        self.assertEqual(len(records[0]["lines"]), 2)
+
+    def test_list_filters_carry_over_to_the_export(self):
+        other = User.objects.create_user(username="other", password="secret")
+        table = CafeTable.objects.create(
+            table_number=2,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        Reservation.objects.create(
+            user=other,
+            time_slot=TimeSlot.objects.create(
+                table=table,
+                date=self.day,
+                start_time=time(10),
+                end_time=time(11),
+            ),
+            date=self.day,
+            number_of_people=2,
+        )
+
+        self.assertEqual(len(self.export(format="jsonl", table=2).splitlines()), 1)
+        self.assertEqual(len(self.export(format="jsonl", user="staff").splitlines()), 2)
+        self.assertEqual(len(self.export(format="jsonl", table=1, user="other").splitlines()), 0)
+
+    def test_command_streams_to_stdout(self):
+        out = io.StringIO()
+        call_command("export_reservations", "--to", self.day.isoformat(), stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 3)
+
+    def test_invalid_filters_are_rejected(self):
+        response = self.client.get(reverse("reservations_export"), {"date_from": "soon"})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.client.force_login(self.staff)
+
+        category = Category.objects.create(name="Drinks")
+        for index in range(5):
+            FoodItem.objects.create(name=f"Tea {index}", price=Decimal("2.00"), category=category)
+
+    @override_settings(QUERY_BUDGET_HEADERS=True)
+    def test_query_stats_are_reported_in_headers(self):
+        response = self.client.get(reverse("food"))
+
+        self.assertEqual(response["X-Query-Count"], "2")
+        self.assertEqual(response["X-Query-Duplicates"], "0")
+        self.assertIn("X-Query-Time-Ms", response)
+
+    @override_settings(QUERY_BUDGET_HEADERS=False)
+    def test_headers_can_be_turned_off(self):
+        response = self.client.get(reverse("food"))
+
+        self.assertNotIn("X-Query-Count", response)
+
+    def test_n_plus_one_fails_the_budget_in_tests(self):
+        with mock.patch.object(FoodListView, "queryset", FoodItem.objects.all()):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "ran 7 queries, budget is 4"):
+                self.client.get(reverse("food"))
+
+    @override_settings(QUERY_BUDGET_HEADERS=True, QUERY_BUDGET_RAISE=False)
+    def test_over_budget_only_warns_outside_tests(self):
+        with mock.patch.object(FoodListView, "queryset", FoodItem.objects.all()):
+            with self.assertLogs("common.middleware", "WARNING") as logs:
+                response = self.client.get(reverse("food"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["X-Query-Duplicates"], "4")
+
+        report = json.loads(logs.records[0].getMessage())
+        self.assertEqual(report["view"], "dashboard.views.FoodListView")
+        self.assertEqual(report["queries"], 7)
+        self.assertEqual(report["budget"], 4)
+
+
+class DatasetTests(TestCase):
+    def test_generated_rows_are_consistent(self):
+        counts = generate_dataset(tables=3, days=6, users=5, occupancy=1, comment_rate=1)
+
+        self.assertEqual(counts["tables"], 3)
+        self.assertEqual(counts["users"], 5)
+        self.assertEqual(counts["reservations"], counts["slots"])
+        self.assertEqual(ReservationFood.objects.count(), counts["lines"])
+
+        for reservation in Reservation.objects.select_related("time_slot__table")[:20]:
+            self.assertEqual(reservation.total_price, reservation.calculate_total_price())
+
+        self.assertEqual(
+            sum(DailyReservationStats.objects.values_list("reservations", flat=True)),
+            counts["reservations"],
+        )
+        self.assertEqual(Comment.objects.count(), counts["comments"])
+        self.assertGreaterEqual(
+            sum(FoodItem.objects.values_list("rating_count", flat=True)),
+            counts["comments"],
+        )
+
+    def test_benchmarks_report_every_flow(self):
+        output = io.StringIO()
+        call_command(
+            "run_benchmarks", scales="1", tables=2, users=3, days=4, repeat=1, stdout=output,
+        )
+
+        for name in ["make_reservation", "menu", "order_post", "dashboard", "generate_slots"]:
+            self.assertIn(name, output.getvalue())
+
+    def test_cached_run_leaves_the_configured_cache_alone(self):
+        cache.clear()
+        cache.set("sentinel", 1)
+
+        call_command(
+            "run_benchmarks", scales="1", tables=2, users=3, days=4, repeat=1,
+            cached=True, stdout=io.StringIO(),
+        )
+
+        self.assertEqual(cache.get("sentinel"), 1)
+        self.assertIsNone(cache.get(MENU_VERSION_KEY))
+
+    def test_cached_auth_saves_queries_on_guest_pages(self):
+        results = {result["name"]: result for result in BookingBenchmarks(repeat=2).auth_path()}
+
+        for page in ["my_reservations", "make_reservation"]:
+            self.assertEqual(
+                results[f"{page}[db_auth]"]["queries"] - results[f"{page}[cached_auth]"]["queries"],
+                2,
+            )
+
+
+class LoadTestTests(TransactionTestCase):
+    def setUp(self):
+        CafeTable.objects.create(table_number=1, capacity=4, price_per_person=Decimal("5.00"))
+        CafeTable.objects.create(table_number=2, capacity=4, price_per_person=Decimal("5.00"))
+
+        for day in DayofWeek.values:
+            WorkingHour.objects.create(day_of_week=day, start_time=time(16), end_time=time(22))
+
+    def test_contended_slots_are_booked_once(self):
+        output = os.path.join(tempfile.mkdtemp(), "loadtest.json")
+
+        call_command(
+            "loadtest", "--after", "18:00",
+            users=6, concurrency=1, attempts=2, slots=2, output=output, stdout=io.StringIO(),
+        )
+
+        with open(output, encoding="utf-8") as result_file:
+            result = json.load(result_file)
+
+        self.assertEqual(result["booked"], 2)
+        self.assertEqual(result["double_bookings"], 0)
+        self.assertEqual(result["endpoints"]["book"]["requests"], 12)
+        self.assertEqual(result["endpoints"]["book"]["outcomes"], {"booked": 2, "rejected": 10})
+        self.assertIsNotNone(result["endpoints"]["book"]["p99_ms"])
+
+        self.assertFalse(User.objects.filter(username__startswith="loadtest-").exists())
+        self.assertFalse(Reservation.all_objects.exists())
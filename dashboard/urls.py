@@ -3,6 +3,7 @@ from .views import (
     AdminDashboardView,
     AdminReservationListView,
     AdminReservationDetailView,
+    ReservationExportView,
     TableListView,
     TableCreateView,
     TableUpdateView,
@@ -29,6 +30,7 @@ from .views import (
 urlpatterns = [
     path("", AdminDashboardView.as_view(), name="dashboard"),
     path("reservations/", AdminReservationListView.as_view(), name="reservations"),
+    path("reservations/export/", ReservationExportView.as_view(), name="reservations_export"),
     path("reservations/<int:pk>/", AdminReservationDetailView.as_view(), name="admin_reservation_detail"),
     path("tables/", TableListView.as_view(), name="tables"),
     path("tables/add/", TableCreateView.as_view(), name="table_add"),
@@ -1,8 +1,7 @@
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.shortcuts import redirect, render, get_object_or_404
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
 from django.urls import reverse_lazy
-from django.core.exceptions import ValidationError
-from django.db import IntegrityError
 from django.views.generic import (
     TemplateView, ListView, UpdateView,
     CreateView, DeleteView, View
@@ -10,44 +9,186 @@ from django.views.generic import (
 from django import forms
 from django.contrib import messages
 from django.utils import timezone
-from datetime import datetime, timedelta, time
+from datetime import time
 
 from reservations.models import Reservation, TimeSlot
+from reservations.choices import Status
 from seating.models import CafeTable, WorkingHour
 from menu.models import FoodItem, Category, Discount
 from .models import CafeSetting
+from .stats import get_dashboard_kpis
+from .pagination import keyset_page
+from .exports import export_queryset, stream_export
 from seating.choices import DayofWeek
+from reservations.utils import generate_slots
 
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     def test_func(self):
         return self.request.user.is_staff
 
 class AdminDashboardView(AdminRequiredMixin, TemplateView):
+    query_budget = 5
     template_name = "dashboard/index.html"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         today = timezone.now().date()
 
-        context["today_reservations"] = Reservation.objects.filter(date=today).count()
-        context["pending"] = Reservation.objects.filter(status="PEN").count()
-        context["confirmed"] = Reservation.objects.filter(status="CON").count()
-        context["completed"] = Reservation.objects.filter(status="COM").count()
-        context["canceled"] = Reservation.objects.filter(status="CAN").count()
+        context.update(get_dashboard_kpis(today))
 
         return context
 
+class ReservationFilterForm(forms.Form):
+    status = forms.ChoiceField(
+        choices=[("", "All statuses")] + Status.choices,
+        required=False
+    )
+    date_from = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"})
+    )
+    date_to = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"})
+    )
+    table = forms.IntegerField(
+        required=False,
+        min_value=1,
+        widget=forms.NumberInput(attrs={"placeholder": "Table number"})
+    )
+    user = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"placeholder": "Username"})
+    )
+
 class AdminReservationListView(AdminRequiredMixin, ListView):
+    query_budget = 5
     model = Reservation
     template_name = "dashboard/reservations.html"
     context_object_name = "reservations"
-    ordering = ["-date"]
+
+    def get_queryset(self):
+        queryset = Reservation.objects.select_related(
+            "user", "time_slot__table"
+        ).only(
+            "date", "status", "attendance_status", "total_price",
+            "user__username",
+            "time_slot__start_time", "time_slot__end_time",
+            "time_slot__table__table_number",
+        )
+
+        self.filter_form = ReservationFilterForm(self.request.GET or None)
+
+        if self.filter_form.is_valid():
+            filters = self.filter_form.cleaned_data
+
+            if filters["status"]:
+                queryset = queryset.filter(status=filters["status"])
+            if filters["date_from"]:
+                queryset = queryset.filter(date__gte=filters["date_from"])
+            if filters["date_to"]:
+                queryset = queryset.filter(date__lte=filters["date_to"])
+            if filters["table"]:
+                queryset = queryset.filter(time_slot__table__table_number=filters["table"])
+            if filters["user"]:
+                queryset = queryset.filter(user__username=filters["user"])
+
+        self.page = keyset_page(
+            queryset,
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+
+        return self.page["object_list"]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        query = self.request.GET.copy()
+        query.pop("after", None)
+        query.pop("before", None)
+
+        context["filter_form"] = self.filter_form
+        context["filter_query"] = query.urlencode()
+        context["next_cursor"] = self.page["next_cursor"]
+        context["previous_cursor"] = self.page["previous_cursor"]
+
+        return context
+
+class ReservationExportForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[("csv", "CSV"), ("jsonl", "JSON Lines")],
+        required=False
+    )
+    lines = forms.BooleanField(
+        required=False
+    )
+    archived = forms.BooleanField(
+        required=False
+    )
+    status = forms.ChoiceField(
+        choices=[("", "All statuses")] + Status.choices,
+        required=False
+    )
+    date_from = forms.DateField(
+        required=False
+    )
+    date_to = forms.DateField(
+        required=False
+    )
+    table = forms.IntegerField(
+        required=False,
+        min_value=1
+    )
+    user = forms.CharField(
+        required=False
+    )
+
+class ReservationExportView(AdminRequiredMixin, View):
+    content_types = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+    }
+
+    def get(self, request):
+        form = ReservationExportForm(request.GET)
+
+        if not form.is_valid():
+            return HttpResponseBadRequest(form.errors.as_text())
+
+        options = form.cleaned_data
+        export_format = options["format"] or "csv"
+
+        queryset = export_queryset(
+            options["date_from"],
+            options["date_to"],
+            options["status"],
+            options["archived"],
+            options["table"],
+            options["user"],
+        )
+
+        response = StreamingHttpResponse(
+            stream_export(queryset, export_format, options["lines"], options["archived"]),
+            content_type=self.content_types[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="reservations.{export_format}"'
+        )
+
+        return response
 
 class AdminReservationDetailView(AdminRequiredMixin, View):
+    query_budget = 8
     template_name = "dashboard/reservation_detail.html"
 
     def get(self, request, pk):
-        reservation = get_object_or_404(Reservation, pk=pk)
+        reservation = get_object_or_404(
+            Reservation.objects.select_related(
+                "user", "time_slot__table"
+            ).prefetch_related("reservation_foods__food_item"),
+            pk=pk,
+        )
         return render(request, self.template_name, {"object": reservation})
 
     def post(self, request, pk):
@@ -67,6 +208,7 @@ class AdminReservationDetailView(AdminRequiredMixin, View):
         return redirect("reservation_detail", pk=reservation.pk)
 
 class TableListView(AdminRequiredMixin, ListView):
+    query_budget = 4
     model = CafeTable
     template_name = "dashboard/tables.html"
     context_object_name = "tables"
@@ -100,6 +242,10 @@ class TableDeleteView(DeleteView):
 
         messages.success(request, "Table deleted successfully.")
         return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        self.object.delete(cascade=True)
+        return redirect(self.get_success_url())
     
 class TableUpdateView(AdminRequiredMixin, UpdateView):
     model = CafeTable
@@ -108,7 +254,9 @@ class TableUpdateView(AdminRequiredMixin, UpdateView):
     success_url = reverse_lazy("tables")
 
 class FoodListView(AdminRequiredMixin, ListView):
+    query_budget = 4
     model = FoodItem
+    queryset = FoodItem.objects.select_related("category")
     template_name = "dashboard/food_list.html"
     context_object_name = "foods"
     ordering = ["-id"]
@@ -131,6 +279,7 @@ class FoodDeleteView(AdminRequiredMixin, DeleteView):
     success_url = reverse_lazy("food")
 
 class CategoryListView(AdminRequiredMixin, ListView):
+    query_budget = 4
     model = Category
     template_name = "dashboard/categories.html"
     context_object_name = "categories"
@@ -160,7 +309,8 @@ class CafeSettingsView(AdminRequiredMixin, UpdateView):
     success_url = reverse_lazy("dashboard")
 
     def get_object(self):
-        return CafeSetting.objects.first()
+        obj, created = CafeSetting.objects.get_or_create(pk=1)
+        return obj
     
 class GenerateSlotsView(AdminRequiredMixin, View):
 
@@ -171,58 +321,14 @@ class GenerateSlotsView(AdminRequiredMixin, View):
             messages.error(request, "Cafe settings not configured.")
             return redirect("dashboard")
 
-        today = timezone.now().date()
-
-        tables = CafeTable.objects.filter(is_active=True)
-        working_hours = WorkingHour.objects.filter(is_closed=False)
-
-        if not working_hours.exists():
+        if not WorkingHour.objects.filter(is_closed=False).exists():
             messages.error(request, "Working hours are not defined.")
             return redirect("dashboard")
 
-        created_count = 0
-        skipped_count = 0
-
-        for day_offset in range(settings.auto_generate_days_ahead):
-            current_date = today + timedelta(days=day_offset)
-
-            weekday_code = DayofWeek.values[current_date.weekday()]
-            day_hours = working_hours.filter(day_of_week=weekday_code)
-
-            for hours in day_hours:
-
-                start_dt = datetime.combine(current_date, hours.start_time)
-                end_dt = datetime.combine(current_date, hours.end_time)
-
-                current_time = start_dt
-
-                while current_time < end_dt:
-                    slot_end = current_time + timedelta(
-                        minutes=settings.slot_duration_minutes
-                    )
-
-                    if slot_end > end_dt:
-                        break
-
-                    for table in tables:
-                        try:
-                            slot, created = TimeSlot.objects.get_or_create(
-                                date=current_date,
-                                table=table,
-                                start_time=current_time.time(),
-                                end_time=slot_end.time(),
-                            )
-
-                            if created:
-                                created_count += 1
-                            else:
-                                skipped_count += 1
-
-                        except (ValidationError, IntegrityError):
-                            skipped_count += 1
-                            continue
-
-                    current_time = slot_end
+        created_count, skipped_count = generate_slots(
+            timezone.now().date(),
+            settings.auto_generate_days_ahead
+        )
 
         if created_count > 0:
             messages.success(
@@ -247,9 +353,7 @@ class ClearSlotsView(AdminRequiredMixin, View):
 
         free_slots = future_slots.filter(reservations__isnull=True)
 
-        deleted_count = free_slots.count()
-
-        free_slots.delete()
+        deleted_count = free_slots.soft_delete()
 
         messages.success(
             request,
@@ -273,7 +377,13 @@ class WorkingHoursListView(AdminRequiredMixin, ListView):
     context_object_name = "working_hours"
 
     def get_queryset(self):
-        for day in DayofWeek.values:
+        working_hours = WorkingHour.objects.all().order_by("day_of_week")
+        existing = {working_hour.day_of_week for working_hour in working_hours}
+
+        if existing.issuperset(DayofWeek.values):
+            return working_hours
+
+        for day in set(DayofWeek.values) - existing:
             WorkingHour.objects.get_or_create(
                 day_of_week=day,
                 defaults={
@@ -301,6 +411,7 @@ class DiscountForm(forms.ModelForm):
         fields = ["discount_type", "amount", "description"]
 
 class DiscountListView(AdminRequiredMixin, ListView):
+    query_budget = 4
     model = Discount
     template_name = "dashboard/discounts.html"
     context_object_name = "discounts"
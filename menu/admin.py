@@ -1,6 +1,7 @@
 from django.contrib import admin, messages
 from common.admin import BaseAdmin
 from .models import Category, FoodItem, Discount
+from .snapshot import bump_menu_version
 
 
 @admin.register(Category)
@@ -34,11 +35,13 @@ class FoodItemAdmin(BaseAdmin):
     @admin.action(description="Available of selected food items")
     def available(self, request, queryset):
         queryset.update(is_available=True)
+        bump_menu_version()
         self.message_user(request, "Selected food item or food items are available now!", messages.SUCCESS)
 
     @admin.action(description="Unavailable of selected food items")
     def unavailable(self, request, queryset):
         queryset.update(is_available=False)
+        bump_menu_version()
         self.message_user(request, "Selected food item or food items are unavailable now!", messages.SUCCESS)
 
 @admin.register(Discount)
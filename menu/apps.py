@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MenuConfig(AppConfig):
     name = 'menu'
+
+    def ready(self):
+        import menu.signals
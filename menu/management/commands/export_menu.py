@@ -0,0 +1,41 @@
+import csv
+import json
+import sys
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from menu.sync import CSV_COLUMNS, export_menu, menu_to_csv_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Export discounts, categories and food items, soft-deleted rows included. "
+        "JSON keeps all three lists; CSV has one row per food item."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Output file, defaults to stdout.")
+        parser.add_argument("--format", choices=["csv", "json"])
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        export_format = options["format"] or ("csv" if path and path.endswith(".csv") else "json")
+        menu = export_menu()
+
+        output = open(path, "w", newline="", encoding="utf-8") if path else sys.stdout
+
+        try:
+            if export_format == "csv":
+                writer = csv.DictWriter(output, fieldnames=CSV_COLUMNS)
+                writer.writeheader()
+                writer.writerows(menu_to_csv_rows(menu))
+            else:
+                json.dump(menu, output, cls=DjangoJSONEncoder, indent=2)
+                output.write("\n")
+        finally:
+            if path:
+                output.close()
+
+        if path:
+            self.stderr.write(self.style.SUCCESS(
+                f"Exported {len(menu['foods'])} food items to {path}."
+            ))
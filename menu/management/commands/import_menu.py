@@ -0,0 +1,48 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from menu.sync import import_menu, menu_from_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert discounts, categories and food items from a CSV or JSON export. "
+        "Rows are matched by natural key and nothing is deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"])
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the diff and roll everything back.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["format"] or ("csv" if path.endswith(".csv") else "json")
+
+        with open(path, newline="", encoding="utf-8") as source:
+            menu = menu_from_csv(source) if import_format == "csv" else json.load(source)
+
+        try:
+            with transaction.atomic():
+                diff = import_menu(menu)
+                transaction.set_rollback(options["dry_run"])
+        except ValidationError as e:
+            raise CommandError(f"Import failed, nothing was changed: {'; '.join(e.messages)}")
+        except (KeyError, ValueError, ArithmeticError) as e:
+            raise CommandError(f"Import failed, nothing was changed: {e!r}")
+
+        for name, counts in diff.items():
+            self.stdout.write(
+                f"{name}: {counts['created']} created, "
+                f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+            )
+
+        if options["dry_run"]:
+            self.stdout.write("Dry run, all changes were rolled back.")
+        else:
+            self.stdout.write(self.style.SUCCESS("Menu imported."))
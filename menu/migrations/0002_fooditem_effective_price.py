@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:40
+
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import migrations, models
+
+
+def apply_discount(discount, price):
+    if discount.discount_type == "PER":
+        return price * (Decimal("1") - Decimal(discount.amount) / Decimal("100"))
+
+    if discount.discount_type == "FIX":
+        return max(price - Decimal(discount.amount), Decimal("0"))
+
+    return price
+
+
+def fill_effective_prices(apps, schema_editor):
+    FoodItem = apps.get_model("menu", "FoodItem")
+    foods = list(FoodItem.objects.select_related("discount", "category__discount"))
+
+    for food in foods:
+        price = food.price
+
+        if food.discount:
+            price = apply_discount(food.discount, price)
+
+        if food.category.discount:
+            price = apply_discount(food.category.discount, price)
+
+        food.effective_price = price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+    FoodItem.objects.bulk_update(foods, ["effective_price"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fooditem',
+            name='effective_price',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='Effective Price'),
+        ),
+        migrations.RunPython(fill_effective_prices, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0003_fooditem_rating_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fooditem',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['category', 'is_available'], name='fooditem_live_category_idx'),
+        ),
+    ]
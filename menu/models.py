@@ -102,6 +102,15 @@ class Category(BaseModel):
         return f"{self.name}"
 
 class FoodItem(BaseModel):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["category", "is_available"],
+                condition=models.Q(is_deleted=False),
+                name="fooditem_live_category_idx",
+            ),
+        ]
+
     name = models.CharField(
         max_length=32,
         verbose_name="Name"
@@ -123,6 +132,14 @@ class FoodItem(BaseModel):
         related_name="foods"
     )
 
+    effective_price = models.DecimalField(
+        editable=False,
+        verbose_name="Effective Price",
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+    )
+
     is_available = models.BooleanField(
         default=True,
         verbose_name="Is Available"
@@ -148,6 +165,27 @@ class FoodItem(BaseModel):
         blank=True,
     )
 
+    rating_count = models.PositiveIntegerField(
+        editable=False,
+        verbose_name="Rating Count",
+        default=0,
+    )
+
+    rating_sum = models.PositiveIntegerField(
+        editable=False,
+        verbose_name="Rating Sum",
+        default=0,
+    )
+
+    avg_rating = models.DecimalField(
+        editable=False,
+        verbose_name="Average Rating",
+        max_digits=3,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+
     created_at = models.DateTimeField(
         verbose_name="Write Time",
         auto_now_add=True,
@@ -178,5 +216,17 @@ class FoodItem(BaseModel):
                     "discount": "Fixed discount cannot exceed food price."
                 })
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        if update_fields is None:
+            self.effective_price = self.get_discounted_price()
+
+        elif {"price", "discount", "category"} & set(update_fields):
+            self.effective_price = self.get_discounted_price()
+            kwargs["update_fields"] = {*update_fields, "effective_price"}
+
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.name}"
\ No newline at end of file
@@ -0,0 +1,64 @@
+from decimal import Decimal
+from django.db.models import (
+    Case, DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Value, When,
+)
+from django.db.models.functions import Greatest, Round
+from django.db.models.lookups import Exact
+from .choices import Type
+from .models import Discount
+from .snapshot import bump_menu_version
+
+PRICE_FIELD = DecimalField(max_digits=10, decimal_places=2)
+
+
+def _apply_discount(price, discounts):
+    # Same rules as Discount.apply_to_price, as a SQL expression.
+    discount_type = Subquery(discounts.values("discount_type")[:1])
+    amount = Subquery(discounts.values("amount")[:1])
+
+    return Case(
+        When(
+            Exact(discount_type, Type.PERCENT),
+            then=ExpressionWrapper(
+                price * (Value(100) - amount) * Value(Decimal("0.01")),
+                output_field=PRICE_FIELD,
+            ),
+        ),
+        When(
+            Exact(discount_type, Type.FIXED),
+            then=Greatest(
+                ExpressionWrapper(price - amount, output_field=PRICE_FIELD),
+                Value(Decimal("0")),
+                output_field=PRICE_FIELD,
+            ),
+        ),
+        default=price,
+        output_field=PRICE_FIELD,
+    )
+
+
+def effective_price_expression():
+    price = _apply_discount(
+        F("price"),
+        Discount.all_objects.filter(pk=OuterRef("discount_id")),
+    )
+    price = _apply_discount(
+        price,
+        Discount.all_objects.filter(categories=OuterRef("category_id")),
+    )
+
+    return Round(price, 2, output_field=PRICE_FIELD)
+
+
+def refresh_effective_prices(foods):
+    """
+    Recompute effective_price for the given foods in a single UPDATE, only
+    touching rows whose price actually changed.
+    """
+    expression = effective_price_expression()
+    changed = foods.exclude(effective_price=expression).update(effective_price=expression)
+
+    if changed:
+        bump_menu_version()
+
+    return changed
@@ -0,0 +1,57 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from common.signals import pre_set_deleted
+from .models import Category, Discount, FoodItem
+from .pricing import refresh_effective_prices
+from .snapshot import bump_menu_version
+
+@receiver(post_save, sender=Discount)
+def refresh_prices_after_discount_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+
+    if update_fields and not {"amount", "discount_type"} & set(update_fields):
+        return
+
+    refresh_effective_prices(
+        FoodItem.all_objects.filter(
+            Q(discount=instance) | Q(category__discount=instance)
+        )
+    )
+
+@receiver(pre_delete, sender=Discount)
+def remember_discounted_foods(sender, instance, **kwargs):
+    instance._discounted_food_ids = list(
+        FoodItem.all_objects.filter(
+            Q(discount=instance) | Q(category__discount=instance)
+        ).values_list("id", flat=True)
+    )
+
+@receiver(post_delete, sender=Discount)
+def refresh_prices_after_discount_delete(sender, instance, **kwargs):
+    refresh_effective_prices(
+        FoodItem.all_objects.filter(id__in=instance._discounted_food_ids)
+    )
+
+@receiver(post_save, sender=Category)
+def refresh_prices_after_category_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        return
+
+    if update_fields and "discount" not in update_fields:
+        return
+
+    refresh_effective_prices(FoodItem.all_objects.filter(category=instance))
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=FoodItem)
+@receiver(post_delete, sender=FoodItem)
+@receiver(post_save, sender=Discount)
+@receiver(post_delete, sender=Discount)
+@receiver(pre_set_deleted, sender=Category)
+@receiver(pre_set_deleted, sender=FoodItem)
+@receiver(pre_set_deleted, sender=Discount)
+def bump_menu_version_after_change(sender, **kwargs):
+    bump_menu_version()
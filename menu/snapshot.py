@@ -0,0 +1,81 @@
+import hashlib
+import json
+import time
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.http import quote_etag
+from .models import Category, FoodItem
+
+MENU_VERSION_KEY = "menu:version"
+MENU_SNAPSHOT_TIMEOUT = 10 * 60
+
+
+def get_menu_version():
+    version = cache.get(MENU_VERSION_KEY)
+
+    if version is None:
+        version = time.time_ns()
+        cache.add(MENU_VERSION_KEY, version, None)
+        version = cache.get(MENU_VERSION_KEY, version)
+
+    return version
+
+
+def bump_menu_version():
+    transaction.on_commit(
+        lambda: cache.set(MENU_VERSION_KEY, time.time_ns(), None)
+    )
+
+
+def _discount_amount(discount):
+    return discount.amount if discount else None
+
+
+def build_menu_snapshot():
+    foods = FoodItem.objects.select_related("discount").order_by("id")
+    categories = Category.objects.select_related("discount").prefetch_related(
+        Prefetch("food_items", queryset=foods)
+    ).order_by("id")
+
+    data = []
+
+    for category in categories:
+        data.append({
+            "id": category.id,
+            "name": category.name,
+            "discount_amount": _discount_amount(category.discount),
+            "foods": [
+                {
+                    "id": food.id,
+                    "name": food.name,
+                    "description": food.description,
+                    "image_url": food.image.url if food.image else None,
+                    "price": food.price,
+                    "effective_price": food.effective_price,
+                    "discount_amount": _discount_amount(food.discount),
+                    "is_available": food.is_available,
+                    "avg_rating": food.avg_rating,
+                    "rating_count": food.rating_count,
+                }
+                for food in category.food_items.all()
+            ],
+        })
+
+    payload = json.dumps(data, default=str, sort_keys=True)
+
+    return {
+        "etag": quote_etag(hashlib.sha256(payload.encode()).hexdigest()),
+        "categories": data,
+    }
+
+
+def get_menu_snapshot():
+    key = f"menu:snapshot:{get_menu_version()}"
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        snapshot = build_menu_snapshot()
+        cache.set(key, snapshot, MENU_SNAPSHOT_TIMEOUT)
+
+    return snapshot
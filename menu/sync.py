@@ -0,0 +1,247 @@
+import csv
+from decimal import Decimal
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .models import Category, Discount, FoodItem
+from .pricing import refresh_effective_prices
+from .snapshot import bump_menu_version
+
+CSV_COLUMNS = [
+    "category", "category_discount", "name", "price",
+    "description", "discount", "is_available", "is_deleted",
+]
+
+DISCOUNT_FIELDS = ["discount_type", "amount", "description", "is_deleted"]
+CATEGORY_FIELDS = ["name", "discount", "is_deleted"]
+FOOD_FIELDS = [
+    "name", "category", "price", "description",
+    "discount", "is_available", "is_deleted", "effective_price",
+]
+
+
+def discount_key(discount):
+    return f"{discount.discount_type}:{discount.amount}" if discount else ""
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+
+    return bool(value)
+
+
+def export_menu():
+    discounts = Discount.all_objects.order_by("id")
+    categories = Category.all_objects.select_related("discount").order_by("id")
+    foods = FoodItem.all_objects.select_related(
+        "category", "discount"
+    ).order_by("category__name", "name")
+
+    return {
+        "discounts": [
+            {
+                "discount_type": discount.discount_type,
+                "amount": discount.amount,
+                "description": discount.description,
+                "is_deleted": discount.is_deleted,
+            }
+            for discount in discounts
+        ],
+        "categories": [
+            {
+                "name": category.name,
+                "discount": discount_key(category.discount),
+                "is_deleted": category.is_deleted,
+            }
+            for category in categories
+        ],
+        "foods": [
+            {
+                "category": food.category.name,
+                "name": food.name,
+                "price": food.price,
+                "description": food.description,
+                "discount": discount_key(food.discount),
+                "is_available": food.is_available,
+                "is_deleted": food.is_deleted,
+            }
+            for food in foods
+        ],
+    }
+
+
+def menu_to_csv_rows(menu):
+    category_discounts = {
+        category["name"]: category["discount"] for category in menu["categories"]
+    }
+
+    for food in menu["foods"]:
+        yield {
+            **food,
+            "category_discount": category_discounts.get(food["category"], ""),
+        }
+
+
+def menu_from_csv(lines):
+    discounts = {}
+    categories = {}
+    foods = []
+
+    for row in csv.DictReader(lines):
+        for key in (row.get("category_discount"), row.get("discount")):
+            if key:
+                discount_type, amount = key.split(":")
+                discounts[key] = {"discount_type": discount_type, "amount": amount}
+
+        categories[row["category"]] = {
+            "name": row["category"],
+            "discount": row.get("category_discount", ""),
+        }
+
+        foods.append({key: value for key, value in row.items() if key != "category_discount"})
+
+    return {
+        "discounts": list(discounts.values()),
+        "categories": list(categories.values()),
+        "foods": foods,
+    }
+
+
+def _lookup(objects, key, label):
+    if not key:
+        return None
+
+    if key not in objects:
+        raise ValidationError(f"Unknown {label} {key!r}.")
+
+    return objects[key]
+
+
+def _validate(obj, key):
+    try:
+        obj.full_clean(exclude=["category", "discount"], validate_unique=False)
+    except ValidationError as e:
+        raise ValidationError(f"{type(obj).__name__} {key!r}: {'; '.join(e.messages)}")
+
+
+def _stamp_deleted(obj, now):
+    # Same bookkeeping as soft_delete()/restore(): keep the original stamp on
+    # rows that stay deleted, clear it on rows brought back.
+    if not obj.is_deleted:
+        obj.deleted_at = None
+    elif obj.deleted_at is None:
+        obj.deleted_at = now
+
+
+def _sync(model, existing, records, key_of, assign, fields):
+    created = []
+    updated = []
+    unchanged = 0
+    now = timezone.now()
+
+    for record in records:
+        key = key_of(record)
+        obj = existing.get(key)
+
+        if obj is None:
+            obj = model()
+            assign(obj, record)
+            _stamp_deleted(obj, now)
+            _validate(obj, key)
+            created.append(obj)
+            existing[key] = obj
+            continue
+
+        before = [getattr(obj, field) for field in fields]
+        assign(obj, record)
+        _stamp_deleted(obj, now)
+
+        if obj.pk is None or [getattr(obj, field) for field in fields] == before:
+            unchanged += obj.pk is not None
+            continue
+
+        _validate(obj, key)
+        obj.updated_at = now
+        updated.append(obj)
+
+    model.all_objects.bulk_create(created, batch_size=500)
+
+    if updated:
+        model.all_objects.bulk_update(updated, fields + ["deleted_at", "updated_at"], batch_size=500)
+
+    return {"created": len(created), "updated": len(updated), "unchanged": unchanged}
+
+
+@transaction.atomic
+def import_menu(menu):
+    discounts = {}
+    for discount in Discount.all_objects.order_by("-id"):
+        discounts[discount_key(discount)] = discount
+
+    categories = {}
+    for category in Category.all_objects.select_related("discount").order_by("-id"):
+        categories[category.name] = category
+
+    foods = {}
+    for food in FoodItem.all_objects.select_related("category", "discount").order_by("-id"):
+        foods[(food.category.name, food.name)] = food
+
+    def assign_discount(discount, record):
+        discount.discount_type = record["discount_type"]
+        discount.amount = int(record["amount"])
+
+        if "description" in record:
+            discount.description = record["description"] or None
+        if "is_deleted" in record:
+            discount.is_deleted = _bool(record["is_deleted"])
+
+    def assign_category(category, record):
+        category.name = record["name"]
+
+        if "discount" in record:
+            category.discount = _lookup(discounts, record["discount"], "discount")
+        if "is_deleted" in record:
+            category.is_deleted = _bool(record["is_deleted"])
+
+    def assign_food(food, record):
+        food.name = record["name"]
+        food.category = _lookup(categories, record["category"], "category")
+        food.price = Decimal(str(record["price"]))
+
+        if "description" in record:
+            food.description = record["description"] or None
+        if "discount" in record:
+            food.discount = _lookup(discounts, record["discount"], "discount")
+        if "is_available" in record:
+            food.is_available = _bool(record["is_available"])
+        if "is_deleted" in record:
+            food.is_deleted = _bool(record["is_deleted"])
+
+        food.effective_price = food.get_discounted_price()
+
+    diff = {
+        "discounts": _sync(
+            Discount, discounts, menu.get("discounts", []),
+            lambda record: f"{record['discount_type']}:{int(record['amount'])}",
+            assign_discount, DISCOUNT_FIELDS,
+        ),
+        "categories": _sync(
+            Category, categories, menu.get("categories", []),
+            lambda record: record["name"],
+            assign_category, CATEGORY_FIELDS,
+        ),
+        "foods": _sync(
+            FoodItem, foods, menu.get("foods", []),
+            lambda record: (record["category"], record["name"]),
+            assign_food, FOOD_FIELDS,
+        ),
+    }
+
+    if diff["discounts"]["updated"] or diff["categories"]["updated"]:
+        refresh_effective_prices(FoodItem.all_objects.all())
+
+    if any(counts["created"] or counts["updated"] for counts in diff.values()):
+        bump_menu_version()
+
+    return diff
@@ -1,3 +1,275 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .choices import Type
+from .models import Category, Discount, FoodItem
+from .sync import export_menu, import_menu
+
+User = get_user_model()
+
+
+class MenuSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.drinks = Category.objects.create(name="Drinks")
+        self.tea = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=self.drinks)
+        self.admin = User.objects.create_superuser(username="admin", password="secret")
+
+    def etag(self):
+        return self.client.get(reverse("menu_list"))["ETag"]
+
+    def test_unchanged_menu_is_not_modified(self):
+        etag = self.etag()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("menu_list"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_admin_actions_bump_the_version(self):
+        etag = self.etag()
+        self.client.force_login(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:menu_fooditem_changelist"), {
+                "action": "unavailable",
+                "_selected_action": [self.tea.pk],
+            })
+
+        self.client.logout()
+        response = self.client.get(reverse("menu_list"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertFalse(response.context["categories"][0]["foods"][0]["is_available"])
+
+    def test_dashboard_edits_and_deletes_bump_the_version(self):
+        etags = [self.etag()]
+        self.client.force_login(self.admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("food_edit", args=[self.tea.pk]), {
+                "name": "Green Tea",
+                "category": self.drinks.pk,
+                "price": "2.50",
+                "is_available": "on",
+            })
+        etags.append(self.etag())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:menu_fooditem_changelist"), {
+                "action": "delete_selected",
+                "_selected_action": [self.tea.pk],
+                "post": "yes",
+            })
+        etags.append(self.etag())
+
+        self.assertEqual(len(set(etags)), 3)
+        self.assertFalse(FoodItem.objects.exists())
+
+
+class EffectivePriceTests(TestCase):
+    def setUp(self):
+        self.ten_percent = Discount.objects.create(discount_type=Type.PERCENT, amount=10)
+        self.one_off = Discount.objects.create(discount_type=Type.FIXED, amount=1)
+        self.drinks = Category.objects.create(name="Drinks", discount=self.ten_percent)
+        self.foods = [
+            FoodItem.objects.create(name="Tea", price=Decimal("2.35"), category=self.drinks),
+            FoodItem.objects.create(
+                name="Coffee", price=Decimal("3.10"), category=self.drinks, discount=self.one_off,
+            ),
+            FoodItem.objects.create(
+                name="Water", price=Decimal("0.50"), category=self.drinks, discount=self.one_off,
+            ),
+        ]
+
+    def assertPricesMatchPython(self):
+        for food in FoodItem.objects.select_related("discount", "category__discount"):
+            self.assertEqual(food.effective_price, food.get_discounted_price(), food.name)
+
+    def test_discount_change_is_one_update(self):
+        self.ten_percent.amount = 25
+
+        with CaptureQueriesContext(connection) as queries:
+            self.ten_percent.save()
+
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "menu_fooditem"')]
+
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(FoodItem.objects.order_by("id").values_list("effective_price", flat=True)),
+            [Decimal("1.76"), Decimal("1.58"), Decimal("0.00")],
+        )
+        self.assertPricesMatchPython()
+
+    def test_category_discount_is_swapped_and_removed(self):
+        self.drinks.discount = self.one_off
+        self.drinks.save()
+        self.assertPricesMatchPython()
+
+        self.drinks.discount = None
+        self.drinks.save(update_fields=["discount"])
+
+        self.assertEqual(
+            list(FoodItem.objects.order_by("id").values_list("effective_price", flat=True)),
+            [Decimal("2.35"), Decimal("2.10"), Decimal("0.00")],
+        )
+
+    def test_deleting_a_discount_restores_the_price(self):
+        Discount.all_objects.filter(pk=self.one_off.pk).delete()
+
+        self.assertPricesMatchPython()
+        self.assertEqual(
+            FoodItem.objects.get(name="Coffee").effective_price, Decimal("2.79"),
+        )
+
+    def test_unrelated_discount_change_touches_nothing(self):
+        other = Discount.objects.create(discount_type=Type.PERCENT, amount=50)
+        other.amount = 40
+
+        with mock.patch("menu.pricing.bump_menu_version") as bump:
+            other.save()
+
+        bump.assert_not_called()
+
+
+class MenuSyncTests(TestCase):
+    def setUp(self):
+        self.discount = Discount.objects.create(discount_type=Type.PERCENT, amount=10)
+        self.drinks = Category.objects.create(name="Drinks", discount=self.discount)
+        self.tea = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=self.drinks)
+        self.old = FoodItem.objects.create(name="Old Tea", price=Decimal("1.00"), category=self.drinks)
+        self.old.delete()
+
+    def run_command(self, name, *args):
+        out = io.StringIO()
+        call_command(name, *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_round_trip_is_unchanged_and_keeps_soft_deleted_rows(self):
+        diff = import_menu(json.loads(json.dumps(export_menu(), default=str)))
+
+        self.assertEqual(diff["foods"], {"created": 0, "updated": 0, "unchanged": 2})
+        self.assertTrue(FoodItem.all_objects.get(pk=self.old.pk).is_deleted)
+        self.assertEqual(FoodItem.all_objects.count(), 2)
+
+    def test_upsert_by_natural_key(self):
+        diff = import_menu({
+            "discounts": [{"discount_type": Type.FIXED, "amount": 1}],
+            "categories": [{"name": "Cakes"}],
+            "foods": [
+                {"category": "Drinks", "name": "Tea", "price": "3.00", "discount": "FIX:1"},
+                {"category": "Cakes", "name": "Brownie", "price": "4.00"},
+            ],
+        })
+
+        self.assertEqual(diff["discounts"]["created"], 1)
+        self.assertEqual(diff["foods"], {"created": 1, "updated": 1, "unchanged": 0})
+
+        self.tea.refresh_from_db()
+        self.assertEqual(self.tea.price, Decimal("3.00"))
+        self.assertEqual(self.tea.effective_price, Decimal("1.80"))
+        self.assertEqual(FoodItem.objects.get(name="Brownie").effective_price, Decimal("4.00"))
+
+    def test_deleting_and_restoring_stamps_deleted_at(self):
+        deleted_at = FoodItem.all_objects.get(pk=self.old.pk).deleted_at
+
+        import_menu({"foods": [
+            {"category": "Drinks", "name": "Tea", "price": "2.00", "is_deleted": True},
+            {"category": "Drinks", "name": "Old Tea", "price": "1.50", "is_deleted": True},
+            {"category": "Drinks", "name": "Gone Tea", "price": "1.00", "is_deleted": True},
+        ]})
+
+        self.assertIsNotNone(FoodItem.all_objects.get(pk=self.tea.pk).deleted_at)
+        self.assertEqual(FoodItem.all_objects.get(pk=self.old.pk).deleted_at, deleted_at)
+        self.assertIsNotNone(FoodItem.all_objects.get(name="Gone Tea").deleted_at)
+
+        import_menu({"foods": [
+            {"category": "Drinks", "name": "Tea", "price": "2.00", "is_deleted": False},
+        ]})
+
+        self.assertIsNone(FoodItem.objects.get(pk=self.tea.pk).deleted_at)
+
+    def test_csv_command_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.csv")
+            self.run_command("export_menu", path)
+
+            FoodItem.all_objects.filter(pk=self.tea.pk).update(price=Decimal("9.00"))
+            output = self.run_command("import_menu", path)
+
+        self.assertIn("foods: 0 created, 1 updated, 1 unchanged", output)
+        self.tea.refresh_from_db()
+        self.assertEqual(self.tea.price, Decimal("2.00"))
+
+    def test_invalid_row_rolls_back_everything(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "menu.json")
+
+            with open(path, "w") as f:
+                json.dump({
+                    "categories": [{"name": "Cakes"}],
+                    "foods": [{"category": "Cakes", "name": "Brownie", "price": "-1"}],
+                }, f)
+
+            with self.assertRaises(CommandError):
+                self.run_command("import_menu", path)
+
+        self.assertFalse(Category.all_objects.filter(name="Cakes").exists())
+
+    def test_bulk_import_uses_constant_queries(self):
+        menu = {
+            "categories": [{"name": f"Category {i}"} for i in range(10)],
+            "foods": [
+                {"category": f"Category {i % 10}", "name": f"Food {i}", "price": "2.50"}
+                for i in range(1000)
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            import_menu(menu)
+
+        lookups = [q for q in queries if not q["sql"].startswith("INSERT")]
+
+        self.assertEqual(len(lookups), 5)
+        self.assertEqual(FoodItem.objects.count(), 1001)
+        self.assertEqual(
+            set(FoodItem.objects.exclude(pk=self.tea.pk).values_list("effective_price", flat=True)),
+            {Decimal("2.50")},
+        )
+
+    def test_updating_discounted_foods_without_a_discount_key_uses_constant_queries(self):
+        FoodItem.objects.filter(pk=self.tea.pk).update(discount=self.discount)
+        for i in range(20):
+            FoodItem.objects.create(
+                name=f"Food {i}", price=Decimal("2.00"), category=self.drinks, discount=self.discount
+            )
+
+        menu = {
+            "foods": [
+                {"category": "Drinks", "name": f"Food {i}", "price": "3.00"}
+                for i in range(20)
+            ],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            diff = import_menu(menu)
+
+        reads = [q for q in queries if q["sql"].startswith("SELECT")]
 
-# Create your tests here.
+        self.assertEqual(diff["foods"]["updated"], 20)
+        self.assertEqual(len(reads), 3)
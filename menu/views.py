@@ -1,20 +1,22 @@
-from django.shortcuts import render
-from django.db.models import Avg, Prefetch
-from django.views.generic import ListView, DetailView
-from .models import Category, FoodItem
+from django.utils.cache import get_conditional_response
+from django.views.generic import TemplateView, DetailView
+from .snapshot import get_menu_snapshot
 
-class MenuView(ListView):
-    model = Category
+class MenuView(TemplateView):
+    query_budget = 4
     template_name = "menu/menu.html"
-    context_object_name = "categories"
 
-    def get_queryset(self):
-        food_qs = FoodItem.objects.annotate(
-            avg_rating=Avg("reservation_foods__reservation__comment__rating")
-        )
-        return Category.objects.prefetch_related(
-            Prefetch("food_items", queryset=food_qs)
-        )
+    def get(self, request, *args, **kwargs):
+        snapshot = get_menu_snapshot()
+
+        response = get_conditional_response(request, etag=snapshot["etag"])
+        if response is None:
+            response = self.render_to_response(
+                self.get_context_data(categories=snapshot["categories"], **kwargs)
+            )
+
+        response["ETag"] = snapshot["etag"]
+        return response
 
 class FoodDetailView(DetailView):
-    pass
\ No newline at end of file
+    pass
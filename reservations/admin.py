@@ -2,6 +2,8 @@ from django.contrib import admin, messages
 from common.admin import BaseAdmin
 from .models import Reservation, ReservationFood, Comment, Reply
 from .choices import Status, AttendanceStatus
+from .availability import invalidate_availability
+from dashboard.stats import mark_stats_dirty
 
 class ReservationFoodInline(admin.TabularInline):
     model = ReservationFood
@@ -55,28 +57,41 @@ class ReservationAdmin(BaseAdmin):
 
     @admin.action(description="Confirm selected reservations")
     def confirm_reservation(self, request, queryset):
+        dates = set(queryset.values_list("date", flat=True))
         queryset.update(status=Status.CONFIRMED)
+        invalidate_availability(*dates)
+        mark_stats_dirty(*dates)
         self.message_user(request, "Reservation or Reservations are in Confirmed status now!", messages.SUCCESS)
 
     @admin.action(description="Cancel selected reservations")
     def cancel_reservation(self, request, queryset):
+        dates = set(queryset.values_list("date", flat=True))
         queryset.update(status=Status.CANCELLED)
+        invalidate_availability(*dates)
+        mark_stats_dirty(*dates)
         self.message_user(request, "Reservation or Reservations are in Cancelled status now!", messages.SUCCESS)
 
     @admin.action(description="Compelete selected reservations")
     def compelete_reservation(self, request, queryset):
+        dates = set(queryset.values_list("date", flat=True))
         queryset.update(status=Status.COMPELETED)
+        invalidate_availability(*dates)
+        mark_stats_dirty(*dates)
         self.message_user(request, "Reservation or Reservations are in Compeleted status now!", messages.SUCCESS)
 
     
     @admin.action(description="Absent selected reservations")
     def absent_reservation(self, request, queryset):
+        dates = set(queryset.values_list("date", flat=True))
         queryset.update(attendance_status=AttendanceStatus.ABSENT)
+        mark_stats_dirty(*dates)
         self.message_user(request, "Reservation's attendance status is Absent now!", messages.SUCCESS)
     
     @admin.action(description="Present selected reservations")
     def present_reservation(self, request, queryset):
+        dates = set(queryset.values_list("date", flat=True))
         queryset.update(attendance_status=AttendanceStatus.PRESENT)
+        mark_stats_dirty(*dates)
         self.message_user(request, "Reservation's attendance status is Present now!", messages.SUCCESS)
 
         
@@ -0,0 +1,114 @@
+import time
+from django.core.cache import cache
+from django.db import transaction
+from seating.models import CafeTable, TimeSlot
+from dashboard.models import CafeSetting
+from .models import Reservation
+from .choices import Status
+from .utils import slot_key, virtual_slots_for_date
+
+
+ACTIVE_STATUSES = [Status.PENDING, Status.CONFIRMED]
+
+AVAILABILITY_CACHE_TIMEOUT = 5 * 60
+TABLES_VERSION_KEY = "availability:tables_version"
+
+
+def _tables_version():
+    version = cache.get(TABLES_VERSION_KEY)
+
+    if version is None:
+        version = time.time_ns()
+        cache.add(TABLES_VERSION_KEY, version, None)
+        version = cache.get(TABLES_VERSION_KEY, version)
+
+    return version
+
+
+def _cache_key(selected_date):
+    return f"availability:{_tables_version()}:{selected_date}"
+
+
+def get_available_tables(selected_date):
+    key = _cache_key(selected_date)
+    table_data = cache.get(key)
+
+    if table_data is None:
+        table_data = build_available_tables(selected_date)
+        cache.set(key, table_data, AVAILABILITY_CACHE_TIMEOUT)
+
+    return table_data
+
+
+def invalidate_availability(*dates):
+    keys = {_cache_key(selected_date) for selected_date in dates if selected_date}
+
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_all_availability():
+    transaction.on_commit(
+        lambda: cache.set(TABLES_VERSION_KEY, time.time_ns(), None)
+    )
+
+
+def build_available_tables(selected_date):
+    tables = list(CafeTable.objects.filter(is_active=True).order_by("table_number"))
+
+    if CafeSetting.load().virtual_slots:
+        slots = _merge_virtual_slots(selected_date, tables)
+    else:
+        slots = TimeSlot.objects.filter(
+            date=selected_date,
+            is_active=True,
+            table__is_active=True,
+        )
+
+    reserved_slot_ids = set(
+        Reservation.objects.filter(
+            date=selected_date,
+            status__in=ACTIVE_STATUSES,
+        ).values_list("time_slot_id", flat=True)
+    )
+
+    slots_by_table = {}
+    for slot in slots:
+        slots_by_table.setdefault(slot.table_id, []).append({
+            "slot": slot,
+            "key": slot_key(slot),
+            "is_reserved": slot.id in reserved_slot_ids,
+        })
+
+    table_data = []
+
+    for table in tables:
+        slot_list = slots_by_table.get(table.id, [])
+
+        table_data.append({
+            "table": table,
+            "slots": slot_list,
+            "is_available": any(not s["is_reserved"] for s in slot_list)
+        })
+
+    return table_data
+
+
+def _merge_virtual_slots(selected_date, tables):
+    stored = {
+        (slot.table_id, slot.start_time): slot
+        for slot in TimeSlot.objects.filter(
+            date=selected_date,
+            table__in=tables,
+        )
+    }
+
+    slots = [slot for slot in stored.values() if slot.is_active]
+
+    for slot in virtual_slots_for_date(selected_date, tables):
+        if (slot.table_id, slot.start_time) not in stored:
+            slots.append(slot)
+
+    slots.sort(key=lambda slot: slot.start_time)
+
+    return slots
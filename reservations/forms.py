@@ -8,4 +8,12 @@ class ReservationCreateForm(forms.ModelForm):
 
         widgets = {
             "date": forms.DateInput(attrs={"type": "date"}),
-        }
\ No newline at end of file
+        }
+
+    def __init__(self, *args, virtual_slot=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.virtual_slot = virtual_slot
+
+        # The row for a virtual slot is only stored when the booking is saved.
+        if virtual_slot is not None:
+            self.fields["time_slot"].required = False
@@ -0,0 +1,102 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import timezone
+from dashboard.models import CafeSetting
+from seating.models import CafeTable, TimeSlot, WorkingHour, DayofWeek
+from reservations.utils import generate_slots
+from reservations.views import ReservationCreateView
+
+DUMMY_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare materialized and virtual time slots: TimeSlot rows needed and "
+        "uncached latency of the reservation page. All data is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tables", type=int, default=20)
+        parser.add_argument("--days", type=int, default=30)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with override_settings(CACHES=DUMMY_CACHES), transaction.atomic():
+            self.setup_schedule(options["tables"])
+
+            results = [
+                self.run_mode(False, options["days"], options["repeat"]),
+                self.run_mode(True, options["days"], options["repeat"]),
+            ]
+
+            transaction.set_rollback(True)
+
+        for mode, rows, page_ms in results:
+            self.stdout.write(
+                f"{mode:<13} timeslot rows: {rows:>7}   page: {page_ms:8.2f} ms"
+            )
+
+    def setup_schedule(self, table_count):
+        for day in DayofWeek.values:
+            WorkingHour.objects.update_or_create(
+                day_of_week=day,
+                defaults={
+                    "start_time": "08:00",
+                    "end_time": "22:00",
+                    "is_closed": False,
+                },
+            )
+
+        start_number = (CafeTable.all_objects.aggregate(
+            top=Max("table_number")
+        )["top"] or 0) + 1
+
+        self.tables = CafeTable.objects.bulk_create([
+            CafeTable(
+                table_number=number,
+                capacity=4,
+                price_per_person=Decimal("5.00"),
+            )
+            for number in range(start_number, start_number + table_count)
+        ])
+
+        self.user = get_user_model().objects.create_user(
+            username=f"benchmark-{time.time_ns()}"
+        )
+
+    def run_mode(self, virtual, days, repeat):
+        CafeSetting.objects.update_or_create(pk=1, defaults={"virtual_slots": virtual})
+        slots = TimeSlot.all_objects.filter(table__in=self.tables)
+        slots.delete()
+
+        today = timezone.now().date()
+
+        if not virtual:
+            generate_slots(today, days)
+
+        rows = slots.count()
+        view = ReservationCreateView.as_view()
+        factory = RequestFactory()
+        timings = []
+
+        for _ in range(repeat):
+            for offset in range(days):
+                day = today + timedelta(days=offset)
+                request = factory.get("/", {"date": day.isoformat()})
+                request.user = self.user
+
+                started = time.perf_counter()
+                view(request).render()
+                timings.append(time.perf_counter() - started)
+
+        mode = "virtual" if virtual else "materialized"
+        return mode, rows, sum(timings) / len(timings) * 1000
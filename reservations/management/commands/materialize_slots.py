@@ -0,0 +1,62 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from dashboard.models import CafeSetting
+from reservations.utils import generate_slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Materialize time slots for the next CafeSetting.auto_generate_days_ahead days. "
+        "Only days after the stored watermark are generated, so it is cheap to run from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Regenerate the whole horizon instead of starting after the watermark.",
+        )
+
+    def handle(self, *args, **options):
+        if CafeSetting.load().virtual_slots:
+            self.stdout.write("Virtual slots are enabled, nothing to materialize.")
+            return
+
+        today = timezone.now().date()
+
+        with transaction.atomic():
+            settings = CafeSetting.objects.select_for_update(
+                skip_locked=True
+            ).filter(pk=1).first()
+
+            if settings is None:
+                self.stdout.write("Another run is materializing slots, skipping.")
+                return
+
+            horizon_end = today + timedelta(days=settings.auto_generate_days_ahead - 1)
+            watermark = settings.slots_materialized_through
+
+            if options["full"] or watermark is None or watermark < today:
+                start_date = today
+            else:
+                start_date = watermark + timedelta(days=1)
+
+            if start_date > horizon_end:
+                self.stdout.write(f"Slots are already materialized through {watermark}.")
+                return
+
+            created_count, skipped_count = generate_slots(
+                start_date,
+                (horizon_end - start_date).days + 1
+            )
+
+            CafeSetting.objects.filter(pk=1).update(
+                slots_materialized_through=horizon_end
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Materialized {start_date} to {horizon_end}: "
+            f"{created_count} created, {skipped_count} skipped."
+        ))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from reservations.ratings import rebuild_rating_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-food rating count, sum and average from comments."
+
+    def handle(self, *args, **options):
+        rated = rebuild_rating_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {rated} food items."))
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0003_alter_reservation_status'),
+        ('seating', '0002_workinghour_is_closed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reservation',
+            name='time_slot',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='seating.timeslot', verbose_name='Time Slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_deleted', False), ('status__in', ['PEN', 'CON'])), fields=('time_slot',), name='unique_active_reservation_per_slot', violation_error_message='This time slot is already reserved.'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:06
+
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def backfill_food_ratings(apps, schema_editor):
+    Comment = apps.get_model("reservations", "Comment")
+    FoodItem = apps.get_model("menu", "FoodItem")
+
+    stats = Comment.objects.filter(
+        is_deleted=False,
+        reservation__reservation_foods__is_deleted=False,
+    ).values(
+        "reservation__reservation_foods__food_item_id"
+    ).annotate(
+        count=Count("id", distinct=True),
+        total=Sum("rating"),
+    )
+
+    foods = FoodItem.objects.in_bulk()
+
+    for row in stats:
+        food = foods.get(row["reservation__reservation_foods__food_item_id"])
+
+        if food is None:
+            continue
+
+        food.rating_count = row["count"]
+        food.rating_sum = row["total"]
+        food.avg_rating = (Decimal(row["total"]) / row["count"]).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+
+    FoodItem.objects.bulk_update(
+        foods.values(),
+        ["rating_count", "rating_sum", "avg_rating"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('menu', '0003_fooditem_rating_summary'),
+        ('reservations', '0004_reservation_time_slot_foreign_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_food_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0006_reservation_list_indexes'),
+        ('seating', '0003_live_row_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='reservation_date_id_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='reservation_status_date_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='reservation',
+            name='reservation_user_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['date', 'status'], name='reservation_live_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['-date', '-id'], name='reservation_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', '-date', '-id'], name='reservation_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', '-date', '-id'], name='reservation_user_date_idx'),
+        ),
+    ]
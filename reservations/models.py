@@ -3,15 +3,51 @@ from common.models import BaseModel
 from seating.models import CafeTable, TimeSlot
 from menu.models import FoodItem
 from django.core.validators import MinValueValidator
-from django.db.models import Sum
+from django.db.models import Sum, Q
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
 from decimal import Decimal
 from .choices import Rating, Status, AttendanceStatus
+from .totals import mark_total_dirty, recompute_totals
 
 User = get_user_model()
 
 class Reservation(BaseModel):
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["time_slot"],
+                condition=Q(
+                    status__in=[Status.PENDING, Status.CONFIRMED],
+                    is_deleted=False,
+                ),
+                name="unique_active_reservation_per_slot",
+                violation_error_message="This time slot is already reserved.",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["date", "status"],
+                condition=Q(is_deleted=False),
+                name="reservation_live_date_idx",
+            ),
+            models.Index(
+                fields=["-date", "-id"],
+                condition=Q(is_deleted=False),
+                name="reservation_date_id_idx",
+            ),
+            models.Index(
+                fields=["status", "-date", "-id"],
+                condition=Q(is_deleted=False),
+                name="reservation_status_date_idx",
+            ),
+            models.Index(
+                fields=["user", "-date", "-id"],
+                condition=Q(is_deleted=False),
+                name="reservation_user_date_idx",
+            ),
+        ]
+
     user = models.ForeignKey(
         User,
         verbose_name="User",
@@ -19,7 +55,7 @@ class Reservation(BaseModel):
         related_name="reservations"
     )
 
-    time_slot = models.OneToOneField(
+    time_slot = models.ForeignKey(
         TimeSlot,
         verbose_name="Time Slot",
         on_delete=models.CASCADE,
@@ -84,13 +120,16 @@ class Reservation(BaseModel):
         return food_total + table_total
 
     def update_total_price(self):
-        self.total_price = self.calculate_total_price()
-        self.save(update_fields=["total_price"])
+        recompute_totals([self.pk])
+        self.refresh_from_db(fields=["total_price"])
 
 
     def clean(self):
         super().clean()
 
+        if not self.time_slot_id:
+            return
+
         if self.time_slot.table and self.number_of_people:
             if self.number_of_people > self.time_slot.table.capacity:
                 raise ValidationError({
@@ -105,12 +144,7 @@ class Reservation(BaseModel):
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
-
-        new_total = self.calculate_total_price()
-        if self.total_price != new_total:
-            Reservation.objects.filter(pk=self.pk).update(
-                total_price=new_total
-            )
+        mark_total_dirty(self.pk)
 
     def __str__(self):
         return f"Reservation {self.id} - ${self.total_price}"
@@ -170,18 +204,13 @@ class ReservationFood(BaseModel):
             existing.save()
             return
 
-        base = Decimal(self.food_item.price)
-
-        if self.food_item.discount:
-            base = self.food_item.discount.apply_to_price(base)
-
-        if self.food_item.category.discount:
-            base = self.food_item.category.discount.apply_to_price(base)
-
-        self.final_price = base * self.quantity
+        self.final_price = self.calculate_final_price()
 
         super().save(*args, **kwargs)
 
+    def calculate_final_price(self):
+        return self.food_item.effective_price * self.quantity
+
     def __str__(self):
         if self.quantity <= 1:
             plural = self.food_item.name
@@ -0,0 +1,141 @@
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, IntegerField, Sum, Value
+from django.db.models.functions import NullIf
+from archive.models import ArchivedComment
+from menu.models import FoodItem
+from menu.snapshot import bump_menu_version
+from .models import Comment, ReservationFood
+
+_state = threading.local()
+
+
+def rated_food_ids(reservation_id):
+    return list(
+        ReservationFood.objects.filter(
+            reservation_id=reservation_id
+        ).values_list("food_item_id", flat=True).distinct()
+    )
+
+
+def apply_rating_change(food_ids, count_delta, sum_delta):
+    if not food_ids or (not count_delta and not sum_delta):
+        return
+
+    rating_count = F("rating_count") + count_delta
+    rating_sum = F("rating_sum") + sum_delta
+
+    # Integer division rounds half up to hundredths, like the quantize in
+    # rebuild_rating_summaries, on every backend.
+    hundredths = ExpressionWrapper(
+        (rating_sum * 200 + rating_count) / NullIf(rating_count * 2, 0),
+        output_field=IntegerField(),
+    )
+
+    FoodItem.all_objects.filter(id__in=food_ids).update(
+        rating_count=rating_count,
+        rating_sum=rating_sum,
+        avg_rating=ExpressionWrapper(
+            hundredths * Value(Decimal("0.01")),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        ),
+    )
+    bump_menu_version()
+
+
+def _dirty_foods():
+    if not hasattr(_state, "dirty"):
+        _state.dirty = {}
+
+    return _state.dirty
+
+
+def mark_ratings_dirty(reservation_id, *food_ids):
+    """
+    Food lines changed on a reservation. At commit, the foods of reservations
+    that carry a comment are rebuilt, with one lookup for the whole transaction.
+    """
+    food_ids = {pk for pk in food_ids if pk is not None}
+
+    if reservation_id is None or not food_ids:
+        return
+
+    _dirty_foods().setdefault(reservation_id, set()).update(food_ids)
+    transaction.on_commit(flush_dirty_ratings)
+
+
+def flush_dirty_ratings():
+    dirty = _dirty_foods()
+
+    if not dirty:
+        return
+
+    changed = dict(dirty)
+    dirty.clear()
+
+    food_ids = set()
+    for reservation_id in Comment.objects.filter(
+        reservation_id__in=changed
+    ).values_list("reservation_id", flat=True):
+        food_ids |= changed[reservation_id]
+
+    if food_ids:
+        rebuild_rating_summaries(food_ids)
+
+
+@transaction.atomic
+def rebuild_rating_summaries(food_ids=None):
+    # Both line conditions go in one filter() so they share the join.
+    lines = {"reservation__reservation_foods__is_deleted": False}
+    foods = FoodItem.all_objects.all()
+
+    if food_ids is not None:
+        lines["reservation__reservation_foods__food_item_id__in"] = food_ids
+        foods = foods.filter(id__in=food_ids)
+
+    sources = [
+        Comment.objects.filter(**lines),
+        ArchivedComment.objects.filter(is_deleted=False, **lines),
+    ]
+
+    stats = {}
+    for source in sources:
+        rows = source.values(
+            "reservation__reservation_foods__food_item_id"
+        ).annotate(
+            count=Count("id", distinct=True),
+            total=Sum("rating"),
+        )
+
+        for row in rows:
+            food_id = row["reservation__reservation_foods__food_item_id"]
+            count, total = stats.get(food_id, (0, 0))
+            stats[food_id] = (count + row["count"], total + row["total"])
+
+    foods = foods.in_bulk()
+
+    for food in foods.values():
+        food.rating_count = 0
+        food.rating_sum = 0
+        food.avg_rating = None
+
+    for food_id, (count, total) in stats.items():
+        food = foods.get(food_id)
+
+        if food is None:
+            continue
+
+        food.rating_count = count
+        food.rating_sum = total
+        food.avg_rating = (Decimal(total) / count).quantize(
+            Decimal("0.01"), rounding=ROUND_HALF_UP
+        )
+
+    FoodItem.all_objects.bulk_update(
+        foods.values(),
+        ["rating_count", "rating_sum", "avg_rating"],
+        batch_size=500,
+    )
+    bump_menu_version()
+    return len(stats)
@@ -1,11 +1,167 @@
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import ReservationFood
+from common.signals import pre_set_deleted
+from seating.models import CafeTable, TimeSlot, WorkingHour
+from dashboard.models import CafeSetting
+from dashboard.stats import mark_stats_dirty
+from .models import Reservation, ReservationFood, Comment
+from .availability import invalidate_availability, invalidate_all_availability
+from .totals import mark_total_dirty
+from .ratings import (
+    rated_food_ids, apply_rating_change, rebuild_rating_summaries, mark_ratings_dirty,
+)
+from .utils import reset_slot_watermark
 
 @receiver(post_save, sender=ReservationFood)
-def update_total_after_food_save(sender, instance, **kwargs):
-    instance.reservation.update_total_price()
+@receiver(post_delete, sender=ReservationFood)
+def mark_total_dirty_after_food_change(sender, instance, **kwargs):
+    mark_total_dirty(instance.reservation_id)
+
+@receiver(post_save, sender=Reservation)
+@receiver(post_delete, sender=Reservation)
+def invalidate_availability_for_reservation(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not {"date", "time_slot", "status", "is_deleted"} & set(update_fields):
+        return
+
+    invalidate_availability(instance.date, getattr(instance, "_previous_date", None))
+
+@receiver(pre_save, sender=Reservation)
+def remember_previous_date(sender, instance, update_fields=None, **kwargs):
+    instance._previous_date = None
+
+    if instance.pk and (update_fields is None or "date" in update_fields):
+        instance._previous_date = Reservation.all_objects.filter(
+            pk=instance.pk
+        ).values_list("date", flat=True).first()
+
+@receiver(post_save, sender=Reservation)
+def mark_stats_dirty_after_date_change(sender, instance, **kwargs):
+    if instance._previous_date not in (None, instance.date):
+        mark_stats_dirty(instance._previous_date)
+
+@receiver(post_delete, sender=Reservation)
+def mark_stats_dirty_after_reservation_delete(sender, instance, **kwargs):
+    mark_stats_dirty(instance.date)
+
+@receiver(post_save, sender=TimeSlot)
+@receiver(post_delete, sender=TimeSlot)
+def invalidate_availability_for_slot(sender, instance, **kwargs):
+    invalidate_availability(instance.date)
+
+@receiver(post_save, sender=CafeTable)
+@receiver(post_delete, sender=CafeTable)
+@receiver(post_save, sender=WorkingHour)
+@receiver(post_delete, sender=WorkingHour)
+@receiver(post_save, sender=CafeSetting)
+def invalidate_availability_for_schedule(sender, instance, **kwargs):
+    invalidate_all_availability()
+
+@receiver(post_save, sender=CafeTable)
+@receiver(post_save, sender=WorkingHour)
+def reset_watermark_after_schedule_change(sender, instance, **kwargs):
+    reset_slot_watermark()
+
+
+def _rating_contribution(rating, is_deleted):
+    return None if is_deleted else rating
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous_rating = None
+    instance._previous_reservation_id = instance.reservation_id
+
+    if instance.pk:
+        previous = Comment.all_objects.filter(pk=instance.pk).values(
+            "reservation_id", "rating", "is_deleted"
+        ).first()
+
+        if previous:
+            instance._previous_reservation_id = previous["reservation_id"]
+            instance._previous_rating = _rating_contribution(
+                previous["rating"], previous["is_deleted"]
+            )
+
+@receiver(post_save, sender=Comment)
+def update_ratings_after_comment_save(sender, instance, **kwargs):
+    previous = instance._previous_rating
+    current = _rating_contribution(instance.rating, instance.is_deleted)
+
+    # A comment moved to another reservation: take its old rating off the old
+    # reservation's foods, then count the new one on the new reservation's.
+    if instance._previous_reservation_id != instance.reservation_id:
+        if previous is not None:
+            apply_rating_change(
+                rated_food_ids(instance._previous_reservation_id), -1, -previous
+            )
 
+        previous = None
+
+    apply_rating_change(
+        rated_food_ids(instance.reservation_id),
+        (current is not None) - (previous is not None),
+        (current or 0) - (previous or 0),
+    )
+
+@receiver(post_delete, sender=Comment)
+def update_ratings_after_comment_delete(sender, instance, **kwargs):
+    if instance.is_deleted:
+        return
+
+    apply_rating_change(
+        rated_food_ids(instance.reservation_id),
+        -1,
+        -instance.rating,
+    )
+
+@receiver(pre_save, sender=ReservationFood)
+def remember_previous_food(sender, instance, **kwargs):
+    instance._previous_food_id = None
+
+    if instance.pk:
+        instance._previous_food_id = ReservationFood.all_objects.filter(
+            pk=instance.pk
+        ).values_list("food_item_id", flat=True).first()
+
+@receiver(post_save, sender=ReservationFood)
 @receiver(post_delete, sender=ReservationFood)
-def update_total_after_food_delete(sender, instance, **kwargs):
-    instance.reservation.update_total_price()
\ No newline at end of file
+def mark_ratings_dirty_after_food_change(sender, instance, **kwargs):
+    mark_ratings_dirty(
+        instance.reservation_id,
+        instance.food_item_id,
+        getattr(instance, "_previous_food_id", None),
+    )
+
+
+@receiver(pre_set_deleted, sender=CafeTable)
+@receiver(pre_set_deleted, sender=TimeSlot)
+def invalidate_availability_for_bulk_slots(sender, **kwargs):
+    invalidate_all_availability()
+
+@receiver(pre_set_deleted, sender=Reservation)
+def invalidate_availability_for_bulk_reservations(sender, queryset, **kwargs):
+    dates = set(queryset.values_list("date", flat=True).distinct())
+
+    invalidate_availability(*dates)
+    mark_stats_dirty(*dates)
+
+@receiver(pre_set_deleted, sender=ReservationFood)
+def refresh_totals_for_bulk_food_lines(sender, queryset, **kwargs):
+    lines = list(queryset.values_list("reservation_id", "food_item_id"))
+    food_ids = {food_id for _, food_id in lines}
+
+    mark_total_dirty(*{reservation_id for reservation_id, _ in lines})
+
+    if food_ids:
+        transaction.on_commit(lambda: rebuild_rating_summaries(food_ids))
+
+@receiver(pre_set_deleted, sender=Comment)
+def refresh_ratings_for_bulk_comments(sender, queryset, **kwargs):
+    food_ids = set(
+        ReservationFood.objects.filter(
+            reservation__in=queryset.values("reservation")
+        ).values_list("food_item_id", flat=True)
+    )
+
+    if food_ids:
+        transaction.on_commit(lambda: rebuild_rating_summaries(food_ids))
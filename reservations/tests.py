@@ -1,3 +1,909 @@
-from django.test import TestCase
+import io
+import json
+import threading
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from common.explain import QueryPlanAssertions
+from dashboard.models import CafeSetting, DailyReservationStats
+from dashboard.stats import rebuild_daily_stats
+from menu.models import Category, FoodItem
+from seating.models import CafeTable, TimeSlot, WorkingHour, DayofWeek
+from .availability import build_available_tables, get_available_tables
+from .choices import Status
+from .models import Comment, Reservation, ReservationFood
+from .ratings import rebuild_rating_summaries
+from .totals import recompute_totals
+from .utils import generate_slots, slot_duration_minutes
+
+User = get_user_model()
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.day = date.today() + timedelta(days=1)
+        cache.clear()
+
+    def create_tables(self, table_count, slot_count, start_number=1):
+        tables = []
+
+        for number in range(start_number, start_number + table_count):
+            table = CafeTable.objects.create(
+                table_number=number,
+                capacity=4,
+                price_per_person=Decimal("5.00"),
+            )
+
+            for hour in range(slot_count):
+                TimeSlot.objects.create(
+                    table=table,
+                    date=self.day,
+                    start_time=time(8 + hour),
+                    end_time=time(9 + hour),
+                )
+
+            tables.append(table)
+
+        return tables
+
+    def test_grid_marks_reserved_slots(self):
+        table = self.create_tables(1, 2)[0]
+        slot = table.time_slots.first()
+
+        Reservation.objects.create(
+            user=self.user,
+            time_slot=slot,
+            date=self.day,
+            number_of_people=2,
+        )
+
+        table_data = get_available_tables(self.day)
+
+        self.assertEqual(len(table_data), 1)
+        self.assertTrue(table_data[0]["is_available"])
+        self.assertEqual(
+            [s["is_reserved"] for s in table_data[0]["slots"]],
+            [True, False],
+        )
+
+    def test_cancelled_reservation_frees_slot(self):
+        table = self.create_tables(1, 1)[0]
+
+        Reservation.objects.create(
+            user=self.user,
+            time_slot=table.time_slots.first(),
+            date=self.day,
+            number_of_people=2,
+            status=Status.CANCELLED,
+        )
+
+        table_data = get_available_tables(self.day)
+
+        self.assertFalse(table_data[0]["slots"][0]["is_reserved"])
+
+    @mock.patch.object(CafeSetting, "load", return_value=CafeSetting(pk=1))
+    def test_query_count_is_constant(self, load):
+        self.create_tables(2, 2)
+
+        with self.assertNumQueries(3):
+            build_available_tables(self.day)
+
+        self.create_tables(10, 6, start_number=3)
+
+        with self.assertNumQueries(3):
+            table_data = build_available_tables(self.day)
+
+        self.assertEqual(len(table_data), 12)
+
+    def test_snapshot_is_cached_until_reservation_changes(self):
+        table = self.create_tables(1, 1)[0]
+        get_available_tables(self.day)
+
+        with self.assertNumQueries(0):
+            get_available_tables(self.day)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation = Reservation.objects.create(
+                user=self.user,
+                time_slot=table.time_slots.first(),
+                date=self.day,
+                number_of_people=2,
+            )
+
+        self.assertTrue(get_available_tables(self.day)[0]["slots"][0]["is_reserved"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.status = Status.CANCELLED
+            reservation.save()
+
+        self.assertFalse(get_available_tables(self.day)[0]["slots"][0]["is_reserved"])
+
+    def test_moving_a_reservation_frees_the_old_date(self):
+        table = self.create_tables(1, 1)[0]
+        next_day = self.day + timedelta(days=1)
+        next_slot = TimeSlot.objects.create(
+            table=table, date=next_day, start_time=time(8), end_time=time(9),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation = Reservation.objects.create(
+                user=self.user,
+                time_slot=table.time_slots.get(date=self.day),
+                date=self.day,
+                number_of_people=2,
+            )
+
+        self.assertTrue(get_available_tables(self.day)[0]["slots"][0]["is_reserved"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.time_slot = next_slot
+            reservation.date = next_day
+            reservation.save()
+
+        self.assertFalse(get_available_tables(self.day)[0]["slots"][0]["is_reserved"])
+        self.assertTrue(get_available_tables(next_day)[0]["slots"][0]["is_reserved"])
+
+    def test_snapshot_is_invalidated_when_table_is_deactivated(self):
+        table = self.create_tables(1, 1)[0]
+        self.assertEqual(len(get_available_tables(self.day)), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            table.is_active = False
+            table.save()
+
+        self.assertEqual(get_available_tables(self.day), [])
+
+
+class VirtualSlotTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.day = date.today() + timedelta(days=1)
+        cache.clear()
+
+        CafeSetting.objects.create(virtual_slots=True, slot_duration_minutes=120)
+        WorkingHour.objects.create(
+            day_of_week=DayofWeek.values[self.day.weekday()],
+            start_time=time(8),
+            end_time=time(12),
+        )
+        self.table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        self.client.force_login(self.user)
+
+    def book(self, key):
+        return self.client.post(reverse("make_reservation"), {
+            "date": self.day.isoformat(),
+            "time_slot": key,
+            "number_of_people": 2,
+        })
+
+    def test_slots_are_listed_without_rows(self):
+        slots = get_available_tables(self.day)[0]["slots"]
+
+        self.assertEqual([s["slot"].start_time for s in slots], [time(8), time(10)])
+        self.assertEqual(
+            [s["key"] for s in slots],
+            [f"v{self.table.id}-{self.day:%Y%m%d}-0800", f"v{self.table.id}-{self.day:%Y%m%d}-1000"],
+        )
+        self.assertFalse(TimeSlot.all_objects.exists())
+
+    def test_booking_claims_a_single_row(self):
+        key = get_available_tables(self.day)[0]["slots"][0]["key"]
+
+        self.assertEqual(self.book(key).status_code, 302)
+
+        response = self.book(key)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "This time slot is already reserved.",
+            response.context["form"].non_field_errors(),
+        )
+        self.assertEqual(TimeSlot.all_objects.count(), 1)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_stored_slot_replaces_virtual_one(self):
+        TimeSlot.objects.create(
+            table=self.table,
+            date=self.day,
+            start_time=time(8),
+            end_time=time(10),
+            is_active=False,
+        )
+
+        slots = get_available_tables(self.day)[0]["slots"]
+
+        self.assertEqual([s["slot"].start_time for s in slots], [time(10)])
+
+    def test_key_outside_working_hours_is_rejected(self):
+        response = self.book(f"v{self.table.id}-{self.day:%Y%m%d}-0900")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(TimeSlot.all_objects.exists())
+
+    def test_rejected_booking_stores_no_slot(self):
+        key = f"v{self.table.id}-{self.day:%Y%m%d}-0800"
+        response = self.client.post(reverse("make_reservation"), {
+            "date": self.day.isoformat(),
+            "time_slot": key,
+            "number_of_people": 10,
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Exceeds table capacity!", response.context["form"].non_field_errors())
+
+        last_week = self.day - timedelta(days=7)
+        response = self.book(f"v{self.table.id}-{last_week:%Y%m%d}-0800")
+
+        self.assertIn("Cannot reserve in the past.", response.context["form"].non_field_errors())
+        self.assertFalse(TimeSlot.all_objects.exists())
+
+    def test_deleted_slot_blocks_its_virtual_key(self):
+        slot = TimeSlot.objects.create(
+            table=self.table,
+            date=self.day,
+            start_time=time(8),
+            end_time=time(10),
+        )
+        slot.delete()
+
+        response = self.book(f"v{self.table.id}-{self.day:%Y%m%d}-0800")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(TimeSlot.all_objects.get().is_deleted)
+        self.assertFalse(Reservation.objects.exists())
+
+
+class DoubleBookingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.day = date.today() + timedelta(days=1)
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        self.slot = TimeSlot.objects.create(
+            table=table,
+            date=self.day,
+            start_time=time(18),
+            end_time=time(20),
+        )
+        self.client.force_login(self.user)
+
+    def book(self):
+        return self.client.post(reverse("make_reservation"), {
+            "date": self.day.isoformat(),
+            "time_slot": self.slot.id,
+            "number_of_people": 2,
+        })
+
+    def test_taken_slot_is_reported_as_form_error(self):
+        self.assertEqual(self.book().status_code, 302)
+
+        response = self.book()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "This time slot is already reserved.",
+            response.context["form"].non_field_errors(),
+        )
+        self.assertEqual(Reservation.objects.filter(time_slot=self.slot).count(), 1)
+
+    def test_cancelled_slot_can_be_rebooked(self):
+        self.book()
+        Reservation.objects.update(status=Status.CANCELLED)
+
+        self.assertEqual(self.book().status_code, 302)
+        self.assertEqual(Reservation.objects.filter(time_slot=self.slot).count(), 2)
+
+
+class OrderTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="guest", password="secret")
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        slot = TimeSlot.objects.create(
+            table=table,
+            date=date.today() + timedelta(days=1),
+            start_time=time(18),
+            end_time=time(20),
+        )
+        self.reservation = Reservation.objects.create(
+            user=self.user,
+            time_slot=slot,
+            date=slot.date,
+            number_of_people=2,
+        )
+        category = Category.objects.create(name="Drinks")
+        self.foods = [
+            FoodItem.objects.create(name=f"Tea {index}", price=Decimal("2.00"), category=category)
+            for index in range(5)
+        ]
+        self.url = reverse("reservation_order", args=[self.reservation.pk])
+        self.client.force_login(self.user)
+
+    def order(self, items):
+        return self.client.post(
+            self.url,
+            json.dumps({"items": items}),
+            content_type="application/json",
+        )
+
+    def test_order_replaces_the_lines(self):
+        first, second = self.foods[:2]
+        self.order([{"food_item_id": str(first.id), "quantity": 3}])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.order([
+                {"food_item_id": str(second.id), "quantity": 1},
+                {"food_item_id": str(second.id), "quantity": 2},
+                {"food_item_id": str(first.id), "quantity": 0},
+            ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "success"})
+        self.assertEqual(
+            list(ReservationFood.objects.values_list("food_item_id", "quantity", "final_price")),
+            [(second.id, 3, Decimal("6.00"))],
+        )
+        self.reservation.refresh_from_db()
+        self.assertEqual(self.reservation.total_price, Decimal("16.00"))
+
+    def test_unknown_food_changes_nothing(self):
+        self.order([{"food_item_id": str(self.foods[0].id), "quantity": 1}])
+
+        response = self.order([{"food_item_id": "999999", "quantity": 1}])
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(ReservationFood.objects.get().food_item, self.foods[0])
+
+    @override_settings(QUERY_BUDGET_HEADERS=True)
+    def test_query_count_does_not_grow_with_items(self):
+        one_item = [{"food_item_id": str(self.foods[0].id), "quantity": 1}]
+        five_items = [{"food_item_id": str(food.id), "quantity": 2} for food in self.foods]
+        self.order(one_item)
+
+        one_item_queries = self.order(one_item)["X-Query-Count"]
+        response = self.order(five_items)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ReservationFood.objects.count(), 5)
+        self.assertEqual(response["X-Query-Count"], one_item_queries)
+
+
+class TotalPriceTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="guest", password="secret")
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        self.reservations = []
+
+        for hour in (16, 18):
+            slot = TimeSlot.objects.create(
+                table=table,
+                date=date.today() + timedelta(days=1),
+                start_time=time(hour),
+                end_time=time(hour + 2),
+            )
+            self.reservations.append(Reservation.objects.create(
+                user=user,
+                time_slot=slot,
+                date=slot.date,
+                number_of_people=2,
+            ))
+
+        category = Category.objects.create(name="Drinks")
+        self.food = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=category)
+
+    def test_deleting_a_food_in_the_admin_keeps_history(self):
+        staff = User.objects.create_superuser(username="admin", password="secret")
+        self.client.force_login(staff)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for reservation in self.reservations:
+                ReservationFood.objects.create(
+                    reservation=reservation, food_item=self.food, quantity=2,
+                )
+
+        rebuild_daily_stats()
+        totals = list(Reservation.objects.order_by("pk").values_list("total_price", flat=True))
+        stats = list(DailyReservationStats.objects.values_list("reservations", "revenue"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("admin:menu_fooditem_changelist"), {
+                "action": "delete_selected",
+                "_selected_action": [self.food.pk],
+                "post": "yes",
+            })
+
+        self.assertFalse(FoodItem.objects.exists())
+        self.assertEqual(ReservationFood.objects.count(), 2)
+        self.assertEqual(
+            list(Reservation.objects.order_by("pk").values_list("total_price", flat=True)),
+            totals,
+        )
+        self.assertEqual(
+            list(DailyReservationStats.objects.values_list("reservations", "revenue")),
+            stats,
+        )
+
+    def test_changes_are_recomputed_once_at_commit(self):
+        with mock.patch(
+            "reservations.totals.recompute_totals", wraps=recompute_totals
+        ) as recompute:
+            with self.captureOnCommitCallbacks(execute=True):
+                for reservation in self.reservations:
+                    ReservationFood.objects.create(
+                        reservation=reservation, food_item=self.food, quantity=1,
+                    )
+                    ReservationFood.objects.create(
+                        reservation=reservation, food_item=self.food, quantity=2,
+                    )
+
+                recompute.assert_not_called()
+
+        recompute.assert_called_once_with({reservation.pk for reservation in self.reservations})
+        self.assertEqual(
+            list(Reservation.objects.order_by("id").values_list("total_price", flat=True)),
+            [Decimal("16.00"), Decimal("16.00")],
+        )
+
+    def test_update_total_price_is_synchronous(self):
+        reservation = self.reservations[0]
+        ReservationFood.objects.create(reservation=reservation, food_item=self.food, quantity=1)
+
+        reservation.update_total_price()
+
+        self.assertEqual(reservation.total_price, Decimal("12.00"))
+        self.assertEqual(reservation.total_price, reservation.calculate_total_price())
+
+
+class RatingSummaryTests(TestCase):
+    def setUp(self):
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        category = Category.objects.create(name="Drinks")
+        self.tea = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=category)
+        self.cake = FoodItem.objects.create(name="Cake", price=Decimal("4.00"), category=category)
+        self.reservations = []
+
+        for hour in (12, 14, 16):
+            slot = TimeSlot.objects.create(
+                table=table,
+                date=date.today() - timedelta(days=1),
+                start_time=time(hour),
+                end_time=time(hour + 2),
+            )
+            reservation = Reservation.objects.create(
+                user=User.objects.create_user(username=f"guest{hour}", password="secret"),
+                time_slot=slot,
+                date=slot.date,
+                number_of_people=2,
+                status=Status.COMPELETED,
+            )
+            ReservationFood.objects.create(reservation=reservation, food_item=self.tea, quantity=1)
+            self.reservations.append(reservation)
+
+    def comment(self, reservation, rating):
+        return Comment.objects.create(
+            user=reservation.user, reservation=reservation, comment="Nice", rating=rating,
+        )
+
+    def summaries(self):
+        return list(
+            FoodItem.all_objects.order_by("id").values_list(
+                "rating_count", "rating_sum", "avg_rating"
+            )
+        )
+
+    def assertMatchesRebuild(self, expected):
+        self.assertEqual(self.summaries(), expected)
+        rebuild_rating_summaries()
+        self.assertEqual(self.summaries(), expected)
+
+    def test_comment_changes_match_a_rebuild(self):
+        first = self.comment(self.reservations[0], 5)
+        self.comment(self.reservations[1], 4)
+        third = self.comment(self.reservations[2], 4)
+        self.assertMatchesRebuild([(3, 13, Decimal("4.33")), (0, 0, None)])
+
+        first.rating = 2
+        first.save()
+        self.assertMatchesRebuild([(3, 10, Decimal("3.33")), (0, 0, None)])
+
+        third.delete()
+        self.assertMatchesRebuild([(2, 6, Decimal("3.00")), (0, 0, None)])
+
+        first.delete()
+        self.assertMatchesRebuild([(1, 4, Decimal("4.00")), (0, 0, None)])
+
+    def test_moving_a_comment_moves_its_rating(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            ReservationFood.objects.create(
+                reservation=self.reservations[2], food_item=self.cake, quantity=1,
+            )
+
+        comment = self.comment(self.reservations[0], 5)
+        self.assertMatchesRebuild([(1, 5, Decimal("5.00")), (0, 0, None)])
+
+        comment.reservation = self.reservations[2]
+        comment.rating = 3
+        comment.save()
+        self.assertMatchesRebuild([(1, 3, Decimal("3.00")), (1, 3, Decimal("3.00"))])
+
+    def test_average_rounds_half_up(self):
+        for reservation, rating in zip(self.reservations, (5, 5, 4)):
+            self.comment(reservation, rating)
+
+        extra = []
+        for number, rating in enumerate((5, 5, 5, 5, 5)):
+            reservation = Reservation.objects.create(
+                user=User.objects.create_user(username=f"extra{number}", password="secret"),
+                time_slot=TimeSlot.objects.create(
+                    table=self.reservations[0].time_slot.table,
+                    date=date.today() - timedelta(days=2),
+                    start_time=time(8 + number),
+                    end_time=time(9 + number),
+                ),
+                date=date.today() - timedelta(days=2),
+                number_of_people=2,
+                status=Status.COMPELETED,
+            )
+            ReservationFood.objects.create(reservation=reservation, food_item=self.tea, quantity=1)
+            extra.append(self.comment(reservation, rating))
+
+        extra[-1].rating = 1
+        extra[-1].save()
+
+        # 35 / 8 = 4.375
+        self.assertMatchesRebuild([(8, 35, Decimal("4.38")), (0, 0, None)])
+
+    def test_food_line_changes_on_a_rated_reservation(self):
+        reservation = self.reservations[0]
+        self.comment(reservation, 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            line = ReservationFood.objects.create(
+                reservation=reservation, food_item=self.cake, quantity=1,
+            )
+        self.assertMatchesRebuild([(1, 3, Decimal("3.00")), (1, 3, Decimal("3.00"))])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            line.delete()
+        self.assertMatchesRebuild([(1, 3, Decimal("3.00")), (0, 0, None)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReservationFood.objects.filter(reservation=self.reservations[1]).delete()
+        self.assertMatchesRebuild([(1, 3, Decimal("3.00")), (0, 0, None)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ReservationFood.all_objects.filter(reservation=reservation).delete()
+        self.assertMatchesRebuild([(0, 0, None), (0, 0, None)])
+
+    def test_lines_without_a_comment_skip_the_rebuild(self):
+        with mock.patch("reservations.ratings.rebuild_rating_summaries") as rebuild:
+            with self.captureOnCommitCallbacks(execute=True):
+                for reservation in self.reservations:
+                    ReservationFood.objects.create(
+                        reservation=reservation, food_item=self.cake, quantity=1,
+                    )
+
+        rebuild.assert_not_called()
+
+
+class SlotGenerationTests(TestCase):
+    def setUp(self):
+        CafeSetting.objects.create(slot_duration_minutes=60)
+        self.day = date.today() + timedelta(days=1)
+
+        for day in DayofWeek.values:
+            WorkingHour.objects.create(day_of_week=day, start_time=time(8), end_time=time(12))
+
+        for number in (1, 2):
+            CafeTable.objects.create(
+                table_number=number,
+                capacity=4,
+                price_per_person=Decimal("5.00"),
+            )
+
+    def test_counts_created_skipped_and_restored(self):
+        self.assertEqual(generate_slots(self.day, 7), (56, 0))
+        self.assertEqual(generate_slots(self.day, 7), (0, 56))
+
+        TimeSlot.objects.filter(date=self.day, start_time__lt=time(10)).soft_delete()
+
+        self.assertEqual(generate_slots(self.day, 7), (4, 52))
+        self.assertEqual(TimeSlot.all_objects.count(), 56)
+
+    def test_existing_rows_are_read_in_one_range_query(self):
+        CafeSetting.load()
+
+        with CaptureQueriesContext(connection) as week:
+            generate_slots(self.day, 7)
+
+        with CaptureQueriesContext(connection) as two_months:
+            generate_slots(self.day + timedelta(days=7), 60)
+
+        self.assertEqual(TimeSlot.objects.count(), 4 * 2 * 67)
+
+        for queries in (week, two_months):
+            reads = [q for q in queries if q["sql"].startswith('SELECT "seating_timeslot"')]
+            self.assertEqual(len(reads), 1)
+
+        self.assertEqual(
+            len([q for q in week if not q["sql"].startswith("INSERT")]),
+            len([q for q in two_months if not q["sql"].startswith("INSERT")]),
+        )
+
+    def test_rows_inserted_after_planning_are_not_counted(self):
+        duration = slot_duration_minutes
+
+        def insert_while_planning(slot_date, start, end):
+            # Another process adds one of the planned slots before the insert.
+            if not TimeSlot.all_objects.exists():
+                TimeSlot.objects.create(
+                    table=CafeTable.objects.get(table_number=1),
+                    date=slot_date,
+                    start_time=start,
+                    end_time=end,
+                )
+            return duration(slot_date, start, end)
+
+        with mock.patch("reservations.utils.slot_duration_minutes", insert_while_planning):
+            self.assertEqual(generate_slots(self.day), (7, 1))
+
+        self.assertEqual(TimeSlot.objects.count(), 8)
+
+
+class MaterializeSlotsTests(TestCase):
+    def setUp(self):
+        self.settings = CafeSetting.objects.create(slot_duration_minutes=120, auto_generate_days_ahead=3)
+        self.today = date.today()
+
+        for day in DayofWeek.values:
+            WorkingHour.objects.create(day_of_week=day, start_time=time(8), end_time=time(12))
+
+        self.table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+
+    def materialize(self, *args):
+        out = io.StringIO()
+        call_command("materialize_slots", *args, stdout=out)
+        return out.getvalue()
+
+    def watermark(self):
+        return CafeSetting.objects.values_list("slots_materialized_through", flat=True).get()
+
+    def test_watermark_advances_with_the_horizon(self):
+        self.assertIn("6 created, 0 skipped", self.materialize())
+        self.assertEqual(self.watermark(), self.today + timedelta(days=2))
+
+        self.assertIn("already materialized", self.materialize())
+
+        CafeSetting.objects.filter(pk=1).update(auto_generate_days_ahead=5)
+        output = self.materialize()
+
+        self.assertIn(f"Materialized {self.today + timedelta(days=3)} to", output)
+        self.assertIn("4 created, 0 skipped", output)
+        self.assertEqual(self.watermark(), self.today + timedelta(days=4))
+        self.assertEqual(TimeSlot.objects.count(), 10)
+
+    def test_schedule_change_resets_the_watermark(self):
+        self.materialize()
+
+        CafeTable.objects.create(table_number=2, capacity=2, price_per_person=Decimal("5.00"))
+
+        self.assertIsNone(self.watermark())
+        self.assertIn("6 created, 6 skipped", self.materialize())
+
+    def test_full_regenerates_the_whole_horizon(self):
+        self.materialize()
+
+        self.assertIn("0 created, 6 skipped", self.materialize("--full"))
+
+
+@skipIf(connection.vendor != "postgresql", "SKIP LOCKED is checked on PostgreSQL only.")
+class MaterializeSlotsLockTests(TransactionTestCase):
+    def setUp(self):
+        CafeSetting.objects.create(auto_generate_days_ahead=3)
+        WorkingHour.objects.create(
+            day_of_week=DayofWeek.values[date.today().weekday()],
+            start_time=time(8),
+            end_time=time(12),
+        )
+        CafeTable.objects.create(table_number=1, capacity=4, price_per_person=Decimal("5.00"))
+
+    def test_concurrent_run_is_skipped(self):
+        out = io.StringIO()
+
+        def materialize():
+            try:
+                call_command("materialize_slots", stdout=out)
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            CafeSetting.objects.select_for_update().get(pk=1)
+
+            worker = threading.Thread(target=materialize)
+            worker.start()
+            worker.join(timeout=10)
+
+        self.assertIn("Another run is materializing slots, skipping.", out.getvalue())
+        self.assertFalse(TimeSlot.objects.exists())
+
+        call_command("materialize_slots", stdout=out)
+
+        self.assertIn("2 created", out.getvalue())
+
+
+@skipIf(connection.vendor == "sqlite", "SQLite locks the whole database for writers.")
+class ConcurrentBookingTests(TransactionTestCase):
+    workers = 8
+
+    def test_only_one_parallel_booking_wins(self):
+        day = date.today() + timedelta(days=1)
+        table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        slot = TimeSlot.objects.create(
+            table=table,
+            date=day,
+            start_time=time(18),
+            end_time=time(20),
+        )
+        users = [
+            User.objects.create_user(username=f"guest{i}", password="secret")
+            for i in range(self.workers)
+        ]
+
+        barrier = threading.Barrier(self.workers)
+        status_codes = []
+        errors = []
+
+        def book(user):
+            try:
+                client = Client()
+                client.force_login(user)
+                barrier.wait()
+
+                response = client.post(reverse("make_reservation"), {
+                    "date": day.isoformat(),
+                    "time_slot": slot.id,
+                    "number_of_people": 2,
+                })
+                status_codes.append(response.status_code)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=book, args=(user,)) for user in users]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(status_codes.count(302), 1)
+        self.assertEqual(status_codes.count(200), self.workers - 1)
+        self.assertEqual(Reservation.objects.filter(time_slot=slot).count(), 1)
+
+
+@skipIf(connection.vendor != "postgresql", "Query plans are checked on PostgreSQL only.")
+class QueryPlanTests(QueryPlanAssertions, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.day = date.today() + timedelta(days=1)
+        users = User.objects.bulk_create([
+            User(username=f"guest{i}") for i in range(20)
+        ])
+        cls.user = users[3]
+        tables = CafeTable.objects.bulk_create([
+            CafeTable(table_number=i, capacity=4, price_per_person=Decimal("5.00"))
+            for i in range(1, 21)
+        ])
+        slots = TimeSlot.objects.bulk_create([
+            TimeSlot(
+                table=table,
+                date=cls.day + timedelta(days=offset),
+                start_time=time(8 + hour * 2),
+                end_time=time(10 + hour * 2),
+                duration_minutes=120,
+                is_deleted=offset % 7 == 0,
+            )
+            for offset in range(30)
+            for table in tables
+            for hour in range(6)
+        ])
+        Reservation.objects.bulk_create([
+            Reservation(
+                user=users[i % 20],
+                time_slot=slot,
+                date=slot.date,
+                number_of_people=2,
+                status=Status.values[i % len(Status.values)],
+            )
+            for i, slot in enumerate(slots)
+        ])
+        categories = Category.objects.bulk_create([
+            Category(name=f"Category {i}") for i in range(10)
+        ])
+        FoodItem.objects.bulk_create([
+            FoodItem(
+                name=f"Food {i}",
+                price=Decimal("2.00"),
+                category=categories[i % 10],
+                is_available=i % 3 != 0,
+                is_deleted=i % 5 == 0,
+            )
+            for i in range(500)
+        ])
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_availability_queries(self):
+        # Both lead with date, and the planner costs them the same here.
+        self.assertUsesIndex(
+            Reservation.objects.filter(
+                date=self.day,
+                status__in=[Status.PENDING, Status.CONFIRMED],
+            ).values_list("time_slot_id", flat=True),
+            "reservation_live_date_idx",
+            "reservation_date_id_idx",
+        )
+        self.assertUsesIndex(
+            TimeSlot.objects.filter(date=self.day, is_active=True, table__is_active=True),
+            "timeslot_live_date_idx",
+        )
+
+    def test_reservation_list_queries(self):
+        self.assertUsesIndex(
+            Reservation.objects.order_by("-date", "-id")[:26],
+            "reservation_date_id_idx",
+        )
+        self.assertUsesIndex(
+            Reservation.objects.filter(status=Status.CANCELLED).order_by("-date", "-id")[:26],
+            "reservation_status_date_idx",
+        )
+        self.assertUsesIndex(
+            Reservation.objects.filter(user=self.user).order_by("-date", "-id")[:26],
+            "reservation_user_date_idx",
+        )
+
+    def test_menu_queries(self):
+        category = Category.objects.first()
+
+        # The category foreign key index serves this as well as the partial one.
+        self.assertUsesIndex(FoodItem.objects.filter(category=category, is_available=True))
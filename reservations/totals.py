@@ -0,0 +1,68 @@
+import threading
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from seating.models import CafeTable
+from dashboard.stats import mark_stats_dirty
+
+_state = threading.local()
+
+
+def _dirty_ids():
+    if not hasattr(_state, "dirty"):
+        _state.dirty = set()
+
+    return _state.dirty
+
+
+def mark_total_dirty(*reservation_ids):
+    reservation_ids = {pk for pk in reservation_ids if pk is not None}
+
+    if not reservation_ids:
+        return
+
+    _dirty_ids().update(reservation_ids)
+    transaction.on_commit(flush_dirty_totals)
+
+
+def flush_dirty_totals():
+    dirty = _dirty_ids()
+
+    if not dirty:
+        return
+
+    reservation_ids = set(dirty)
+    dirty.clear()
+    recompute_totals(reservation_ids)
+
+
+def recompute_totals(reservation_ids):
+    from .models import Reservation, ReservationFood
+
+    reservation_ids = set(reservation_ids)
+    _dirty_ids().difference_update(reservation_ids)
+
+    food_total = ReservationFood.objects.filter(
+        reservation=OuterRef("pk")
+    ).values("reservation").annotate(
+        total=Sum("final_price")
+    ).values("total")
+
+    table_price = CafeTable.all_objects.filter(
+        time_slots=OuterRef("time_slot")
+    ).values("price_per_person")
+
+    reservations = Reservation.all_objects.filter(pk__in=reservation_ids)
+
+    updated = reservations.update(
+        total_price=ExpressionWrapper(
+            Coalesce(Subquery(food_total), Value(Decimal("0")))
+            + Subquery(table_price) * F("number_of_people"),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+    )
+
+    mark_stats_dirty(*reservations.values_list("date", flat=True).distinct())
+
+    return updated
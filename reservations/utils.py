@@ -1,59 +1,204 @@
 from datetime import datetime, timedelta
+from django.core.exceptions import ValidationError
+from django.db import transaction, IntegrityError
 from seating.models import TimeSlot, CafeTable, WorkingHour, DayofWeek
 from dashboard.models import CafeSetting
 
 
-def generate_time_ranges(start_time, end_time):
+def generate_time_ranges(start_time, end_time, slot_duration_minutes=None):
     slots = []
     current = datetime.combine(datetime.today(), start_time)
     end = datetime.combine(datetime.today(), end_time)
-    settings = CafeSetting.load()
 
+    if slot_duration_minutes is None:
+        slot_duration_minutes = CafeSetting.load().slot_duration_minutes
 
-    while current + timedelta(hours=settings.slot_duration_minutes/60) <= end:
-        
+    duration = timedelta(minutes=slot_duration_minutes)
 
-        slot_end = current + timedelta(
-            minutes=settings.slot_duration_minutes
-        )
+    while current + duration <= end:
+        slot_end = current + duration
 
         slots.append((current.time(), slot_end.time()))
         current = slot_end
 
     return slots
 
+def slot_duration_minutes(slot_date, start_time, end_time):
+    duration = (
+        datetime.combine(slot_date, end_time) - datetime.combine(slot_date, start_time)
+    )
+    return int(duration.total_seconds() / 60)
+
+def generate_slots(start_date, days=1):
+    from .availability import invalidate_availability
+
+    settings = CafeSetting.load()
+    end_date = start_date + timedelta(days=days - 1)
+
+    ranges_by_day = {
+        hours.day_of_week: generate_time_ranges(
+            hours.start_time,
+            hours.end_time,
+            settings.slot_duration_minutes
+        )
+        for hours in WorkingHour.objects.filter(is_closed=False)
+    }
+
+    table_ids = list(
+        CafeTable.objects.filter(is_active=True).values_list("id", flat=True)
+    )
+
+    target = {}
+
+    for day_offset in range(days):
+        current_date = start_date + timedelta(days=day_offset)
+        weekday_code = DayofWeek.values[current_date.weekday()]
+
+        for start, end in ranges_by_day.get(weekday_code, []):
+            for table_id in table_ids:
+                target[(table_id, current_date, start)] = end
+
+    existing = {
+        (table_id, slot_date, start): (pk, is_deleted)
+        for pk, table_id, slot_date, start, is_deleted in TimeSlot.all_objects.filter(
+            date__range=(start_date, end_date),
+            table_id__in=table_ids,
+        ).values_list("id", "table_id", "date", "start_time", "is_deleted")
+    }
+
+    missing = []
+    deleted_ids = []
+
+    for key, end in target.items():
+        table_id, slot_date, start = key
+
+        if key in existing:
+            pk, is_deleted = existing[key]
+
+            if is_deleted:
+                deleted_ids.append(pk)
+            continue
+
+        missing.append(TimeSlot(
+            table_id=table_id,
+            date=slot_date,
+            start_time=start,
+            end_time=end,
+            duration_minutes=slot_duration_minutes(slot_date, start, end),
+        ))
+
+    # Count around the insert so rows another process added since the read
+    # above, which ignore_conflicts skips, are not reported as ours. The count
+    # is approximate: rows another writer inserts between the two counts are
+    # still included.
+    live = TimeSlot.objects.filter(date__range=(start_date, end_date), table_id__in=table_ids)
+    live_before = live.count() if missing else 0
+
+    TimeSlot.objects.bulk_create(missing, batch_size=1000, ignore_conflicts=True)
+    created = live.count() - live_before if missing else 0
+
+    if deleted_ids:
+        created += TimeSlot.all_objects.filter(id__in=deleted_ids).restore()
+
+    invalidate_availability(*{slot.date for slot in missing})
+
+    return created, len(target) - created
+
+def reset_slot_watermark():
+    CafeSetting.objects.filter(pk=1).update(slots_materialized_through=None)
+
 def ensure_slots_exist_for_date(selected_date):
     if TimeSlot.objects.filter(date=selected_date).exists():
         return
 
-    weekday_number = selected_date.weekday()
+    generate_slots(selected_date)
 
-    weekday_map = {
-        0: DayofWeek.MONDAY,
-        1: DayofWeek.TUESDAY,
-        2: DayofWeek.WEDNESDAY,
-        3: DayofWeek.THURSDAY,
-        4: DayofWeek.FRIDAY,
-        5: DayofWeek.SATURDAY,
-        6: DayofWeek.SUNDAY,
-    }
 
-    weekday_code = weekday_map[weekday_number]
+def virtual_slots_for_date(selected_date, tables):
+    weekday_code = DayofWeek.values[selected_date.weekday()]
+    hours = WorkingHour.objects.filter(
+        day_of_week=weekday_code,
+        is_closed=False
+    ).first()
+
+    if hours is None:
+        return []
+
+    ranges = generate_time_ranges(hours.start_time, hours.end_time)
+
+    return [
+        TimeSlot(
+            table=table,
+            date=selected_date,
+            start_time=start,
+            end_time=end,
+            duration_minutes=slot_duration_minutes(selected_date, start, end),
+        )
+        for table in tables
+        for start, end in ranges
+    ]
+
+def slot_key(slot):
+    if slot.pk:
+        return str(slot.pk)
+
+    return f"v{slot.table_id}-{slot.date:%Y%m%d}-{slot.start_time:%H%M}"
+
+def resolve_slot(key):
+    if not key.startswith("v"):
+        try:
+            return TimeSlot.objects.select_related("table").filter(pk=int(key)).first()
+        except ValueError:
+            return None
+
     try:
-        working_hours = WorkingHour.objects.get(day_of_week=weekday_code)
-    except WorkingHour.DoesNotExist:
-        return
+        table_id, day, start = key[1:].split("-")
+        table_id = int(table_id)
+        selected_date = datetime.strptime(day, "%Y%m%d").date()
+        start_time = datetime.strptime(start, "%H%M").time()
+    except ValueError:
+        return None
 
-    ranges = generate_time_ranges(
-        working_hours.start_time,
-        working_hours.end_time
-    )
+    existing = TimeSlot.all_objects.select_related("table").filter(
+        table_id=table_id,
+        date=selected_date,
+        start_time=start_time
+    ).first()
+
+    # A stored row always wins over the virtual slot, and a deleted or
+    # inactive one blocks it.
+    if existing:
+        return existing if existing.is_active and not existing.is_deleted else None
+
+    table = CafeTable.objects.filter(pk=table_id, is_active=True).first()
+
+    if table is None:
+        return None
+
+    for slot in virtual_slots_for_date(selected_date, [table]):
+        if slot.start_time == start_time:
+            return slot
+
+    return None
+
+def claim_slot(slot):
+    """
+    Store a virtual slot, or return the row another booking stored first.
+    Call it inside the booking's transaction so that a rejected booking rolls
+    the row back.
+    """
+    if slot.pk:
+        return slot
+
+    try:
+        with transaction.atomic():
+            slot.save()
+    except (ValidationError, IntegrityError):
+        slot = TimeSlot.objects.select_related("table").filter(
+            table_id=slot.table_id,
+            date=slot.date,
+            start_time=slot.start_time,
+            is_active=True
+        ).first()
 
-    for table in CafeTable.objects.filter(is_active=True):
-        for start, end in ranges:
-            TimeSlot.objects.create(
-                date=selected_date,
-                table=table,
-                start_time=start,
-                end_time=end
-            )
\ No newline at end of file
+    return slot
@@ -1,4 +1,5 @@
 from datetime import datetime
+import hashlib
 from django.utils import timezone
 from django.views.generic import CreateView, ListView, DetailView, View
 from django.shortcuts import get_object_or_404, redirect
@@ -6,53 +7,48 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import HttpResponseForbidden
-from django.http import JsonResponse
-from django.db.models import Prefetch
+from django.http import JsonResponse, Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.middleware.csrf import get_token
+from django.db import transaction, IntegrityError
+from django.core.exceptions import ValidationError
 import json
 
-from menu.models import FoodItem, Category
-from .models import Reservation, TimeSlot, CafeTable, Status, AttendanceStatus, ReservationFood
+from menu.models import FoodItem
+from menu.snapshot import get_menu_snapshot
+from .models import Reservation, Status, AttendanceStatus, ReservationFood
 from .forms import ReservationCreateForm
+from .availability import get_available_tables
+from .utils import claim_slot, resolve_slot
+from .totals import mark_total_dirty
+from .ratings import mark_ratings_dirty
 
 
 class ReservationCreateView(LoginRequiredMixin, CreateView):
+    query_budget = 24
     model = Reservation
     form_class = ReservationCreateForm
     template_name = "reservations/make_reservation.html"
     success_url = reverse_lazy("my_reservations")
 
-    def get_available_tables(self, selected_date):
-        tables = CafeTable.objects.filter(is_active=True)
-        table_data = []
-
-        for table in tables:
-            slots = TimeSlot.objects.filter(
-                date=selected_date,
-                table=table,
-                is_active=True
-            )
-
-            slot_list = []
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        data = kwargs.get("data")
 
-            for slot in slots:
-                is_reserved = Reservation.objects.filter(
-                    date=selected_date,
-                    time_slot=slot,
-                    status__in=[Status.PENDING, Status.CONFIRMED]
-                ).exists()
+        if data and data.get("time_slot", "").startswith("v"):
+            slot = resolve_slot(data["time_slot"])
+            data = data.copy()
+            data["time_slot"] = slot.pk if slot and slot.pk else ""
+            kwargs["data"] = data
 
-                slot_list.append({
-                    "slot": slot,
-                    "is_reserved": is_reserved
-                })
+            if slot and not slot.pk:
+                kwargs["virtual_slot"] = slot
 
-            table_data.append({
-                "table": table,
-                "slots": slot_list,
-                "is_available": any(not s["is_reserved"] for s in slot_list)
-            })
+        return kwargs
 
-        return table_data
+    def get_available_tables(self, selected_date):
+        return get_available_tables(selected_date)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -71,12 +67,11 @@ class ReservationCreateView(LoginRequiredMixin, CreateView):
                 pass
 
         if slot_id:
-            try:
-                slot = TimeSlot.objects.get(id=slot_id)
+            slot = resolve_slot(slot_id)
+
+            if slot:
                 context["selected_slot"] = slot
                 context["price_per_person"] = slot.table.price_per_person
-            except TimeSlot.DoesNotExist:
-                pass
 
         return context
 
@@ -86,11 +81,11 @@ class ReservationCreateView(LoginRequiredMixin, CreateView):
         reservation.status = Status.PENDING
         reservation.attendance_status = AttendanceStatus.UNKNOWN
 
-        selected_date = reservation.date
-        slot = reservation.time_slot
+        slot = form.virtual_slot or reservation.time_slot
+        reservation.date = slot.date
 
         reservation_datetime = datetime.combine(
-            selected_date,
+            slot.date,
             slot.start_time
         )
         reservation_datetime = timezone.make_aware(reservation_datetime)
@@ -99,23 +94,31 @@ class ReservationCreateView(LoginRequiredMixin, CreateView):
             form.add_error(None, "Cannot reserve in the past.")
             return self.form_invalid(form)
 
-        if Reservation.objects.filter(
-            date=selected_date,
-            time_slot=slot,
-            status__in=[Status.PENDING, Status.CONFIRMED]
-        ).exists():
-            form.add_error(None, "This time slot is already reserved.")
-            return self.form_invalid(form)
-
         reservation.total_price = (
             reservation.number_of_people *
             slot.table.price_per_person
         )
 
-        reservation.save()
+        try:
+            with transaction.atomic():
+                if form.virtual_slot is not None:
+                    reservation.time_slot = claim_slot(form.virtual_slot)
+
+                    if reservation.time_slot is None:
+                        raise ValidationError("This time slot is no longer available.")
+
+                reservation.save()
+        except ValidationError as e:
+            form.add_error(None, e.messages)
+            return self.form_invalid(form)
+        except IntegrityError:
+            form.add_error(None, "This time slot is already reserved.")
+            return self.form_invalid(form)
+
         return redirect(self.success_url)
 
 class MyReservationsView(LoginRequiredMixin, ListView):
+    query_budget = 5
     model = Reservation
     template_name = "reservations/my_reservations.html"
     context_object_name = "reservations"
@@ -129,6 +132,7 @@ class MyReservationsView(LoginRequiredMixin, ListView):
 ).order_by("-created_at")
 
 class ReservationDetailView(LoginRequiredMixin, DetailView):
+    query_budget = 7
     model = Reservation
     template_name = "reservations/reservation_detail.html"
     context_object_name = "reservation"
@@ -142,18 +146,21 @@ class ReservationDetailView(LoginRequiredMixin, DetailView):
         ).prefetch_related("reservation_foods__food_item")
 
 class ReservationOrderView(LoginRequiredMixin, DetailView):
+    query_budget = 14
     model = Reservation
     template_name = "reservations/reservation_order.html"
     context_object_name = "reservation"
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user)
+        return Reservation.objects.filter(
+            user=self.request.user
+        ).select_related("time_slot__table")
 
     def dispatch(self, request, *args, **kwargs):
-        reservation = self.get_object()
+        self.object = self.get_object()
 
-        if reservation.status != Status.PENDING:
-            return redirect("reservation_detail", pk=reservation.pk)
+        if self.object.status != Status.PENDING:
+            return redirect("reservation_detail", pk=self.object.pk)
 
         return super().dispatch(request, *args, **kwargs)
 
@@ -166,21 +173,44 @@ class ReservationOrderView(LoginRequiredMixin, DetailView):
         context["existing_items"] = {
             str(item.food_item.id): {
                 "quantity": item.quantity,
-                "price": float(item.food_item.get_discounted_price()),
+                "price": float(item.food_item.effective_price),
                 "name": item.food_item.name
             }
             for item in existing_items
         }
 
-        food_qs = FoodItem.objects.all()
-        context["categories"] = Category.objects.prefetch_related(
-            Prefetch("food_items", queryset=food_qs)
-        )
+        context["menu_snapshot"] = get_menu_snapshot()
+        context["categories"] = context["menu_snapshot"]["categories"]
 
         return context
 
+    def get_etag(self, context):
+        get_token(self.request)
+
+        payload = json.dumps([
+            context["menu_snapshot"]["etag"],
+            self.object.pk,
+            self.object.status,
+            context["existing_items"],
+            self.request.user.pk,
+            self.request.META.get("CSRF_COOKIE"),
+        ], sort_keys=True)
+
+        return quote_etag(hashlib.sha256(payload.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        context = self.get_context_data(object=self.object)
+        etag = self.get_etag(context)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.render_to_response(context)
+
+        response["ETag"] = etag
+        return response
+
     def post(self, request, *args, **kwargs):
-        reservation = self.get_object()
+        reservation = self.object
 
         if reservation.status != Status.PENDING:
             return JsonResponse(
@@ -191,21 +221,34 @@ class ReservationOrderView(LoginRequiredMixin, DetailView):
         data = json.loads(request.body)
         items = data.get("items", [])
 
-        reservation.reservation_foods.all().delete()
+        quantities = {}
 
         for item in items:
-            food = get_object_or_404(
-                FoodItem,
-                id=int(item["food_item_id"])
-            )
-            quantity = int(item["quantity"])
+            food_id = int(item["food_item_id"])
+            quantities[food_id] = quantities.get(food_id, 0) + int(item["quantity"])
 
+        foods = FoodItem.objects.in_bulk(quantities)
+
+        if len(foods) != len(quantities):
+            raise Http404("No FoodItem matches the given query.")
+
+        lines = []
+
+        for food_id, quantity in quantities.items():
             if quantity > 0:
-                ReservationFood.objects.create(
+                line = ReservationFood(
                     reservation=reservation,
-                    food_item=food,
+                    food_item=foods[food_id],
                     quantity=quantity
                 )
+                line.final_price = line.calculate_final_price()
+                lines.append(line)
+
+        with transaction.atomic():
+            reservation.reservation_foods.all().delete()
+            ReservationFood.objects.bulk_create(lines)
+            mark_total_dirty(reservation.pk)
+            mark_ratings_dirty(reservation.pk, *quantities)
 
         return JsonResponse({"status": "success"})
     
@@ -227,7 +270,7 @@ class CancelReservationView(LoginRequiredMixin, View):
             messages.error(request, "Reservation already started.")
             return redirect("reservation_detail", pk=pk)
 
-        reservation.status = Status.CANCELED
+        reservation.status = Status.CANCELLED
         reservation.save()
 
         messages.success(request, "Reservation cancelled.")
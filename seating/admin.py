@@ -1,10 +1,13 @@
 from django.contrib import admin, messages
 from common.admin import BaseAdmin
 from .models import CafeTable, TimeSlot, WorkingHour
+from reservations.availability import invalidate_all_availability
+from reservations.utils import reset_slot_watermark
 
 
 @admin.register(CafeTable)
 class CafeTableAdmin(BaseAdmin):
+    cascade_delete = True
     list_display = (
         "id",
         "table_number",
@@ -24,16 +27,20 @@ class CafeTableAdmin(BaseAdmin):
     @admin.action(description="Active selected tables")
     def active(self, request, queryset):
         queryset.update(is_active=True)
+        invalidate_all_availability()
+        reset_slot_watermark()
         self.message_user(request, "Selected table or tables are active now!", messages.SUCCESS)
 
     @admin.action(description="Deactive selected tables")
     def deactive(self, request, queryset):
         queryset.update(is_active=False)
+        invalidate_all_availability()
         self.message_user(request, "Selected table or tables are deactive now!", messages.SUCCESS)
 
 
 @admin.register(TimeSlot)
 class TimeSlotAdmin(BaseAdmin):
+    cascade_delete = True
     list_display = ("id", "start_time", "end_time", "duration_minutes")
     ordering = ("start_time",)
 
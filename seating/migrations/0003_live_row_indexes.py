@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('seating', '0002_workinghour_is_closed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeslot',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['date', 'table'], name='timeslot_live_date_idx'),
+        ),
+    ]
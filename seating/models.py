@@ -80,6 +80,13 @@ class TimeSlot(BaseModel):
     class Meta:
         unique_together = ("table", "date", "start_time")
         ordering = ["date", "start_time"]
+        indexes = [
+            models.Index(
+                fields=["date", "table"],
+                condition=models.Q(is_deleted=False),
+                name="timeslot_live_date_idx",
+            ),
+        ]
 
     def clean(self):
         if self.start_time and self.end_time:
@@ -1,3 +1,148 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+
+from common.signals import pre_set_deleted
+from dashboard.models import CafeSetting, DailyReservationStats
+from menu.models import Category, FoodItem
+from reservations.models import Comment, Reservation, ReservationFood
+from reservations.utils import generate_slots
+from .models import CafeTable, DayofWeek, TimeSlot, WorkingHour
+
+User = get_user_model()
+
+
+class SoftDeleteCascadeTests(TestCase):
+    def setUp(self):
+        self.day = date.today() + timedelta(days=1)
+        self.user = User.objects.create_user(username="guest", password="secret")
+        self.table = CafeTable.objects.create(
+            table_number=1,
+            capacity=4,
+            price_per_person=Decimal("5.00"),
+        )
+        self.slots = TimeSlot.objects.bulk_create([
+            TimeSlot(
+                table=self.table,
+                date=self.day,
+                start_time=time(8 + hour),
+                end_time=time(9 + hour),
+                duration_minutes=60,
+            )
+            for hour in range(10)
+        ])
+
+        category = Category.objects.create(name="Drinks")
+        self.food = FoodItem.objects.create(name="Tea", price=Decimal("2.00"), category=category)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reservation = Reservation.objects.create(
+                user=self.user,
+                time_slot=self.slots[0],
+                date=self.day,
+                number_of_people=2,
+            )
+            ReservationFood.objects.create(
+                reservation=self.reservation,
+                food_item=self.food,
+                quantity=1,
+            )
+            Comment.objects.create(
+                user=self.user,
+                reservation=self.reservation,
+                comment="Nice",
+                rating=5,
+            )
+
+    def test_table_cascade_marks_every_dependent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.table.delete(cascade=True)
+
+        self.assertFalse(CafeTable.objects.exists())
+        self.assertFalse(TimeSlot.objects.exists())
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(ReservationFood.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(TimeSlot.all_objects.count(), 10)
+
+        self.assertEqual(DailyReservationStats.objects.get(date=self.day).reservations, 0)
+        self.food.refresh_from_db()
+        self.assertEqual(self.food.rating_count, 0)
+
+    def test_cascade_restore_brings_everything_back(self):
+        self.table.delete(cascade=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restored = CafeTable.all_objects.filter(pk=self.table.pk).restore(cascade=True)
+
+        self.assertEqual(restored, 1)
+        self.assertEqual(TimeSlot.objects.count(), 10)
+        self.assertEqual(Reservation.objects.get().reservation_foods.count(), 1)
+
+        self.food.refresh_from_db()
+        self.assertEqual(self.food.rating_count, 1)
+
+    def test_cascade_restore_skips_rows_deleted_on_their_own(self):
+        self.reservation.delete()
+        rebooked = Reservation.objects.create(
+            user=self.user,
+            time_slot=self.slots[0],
+            date=self.day,
+            number_of_people=2,
+        )
+        self.table.delete(cascade=True)
+
+        CafeTable.all_objects.filter(pk=self.table.pk).restore(cascade=True)
+
+        self.assertEqual(list(Reservation.objects.all()), [rebooked])
+        self.assertTrue(Reservation.all_objects.get(pk=self.reservation.pk).is_deleted)
+        self.assertEqual(TimeSlot.objects.count(), 10)
+
+    def test_nothing_to_change_sends_no_signal(self):
+        receiver = mock.Mock()
+        pre_set_deleted.connect(receiver, sender=TimeSlot)
+        self.addCleanup(pre_set_deleted.disconnect, receiver, sender=TimeSlot)
+
+        updated = TimeSlot.all_objects.filter(pk=self.slots[1].pk).restore()
+
+        self.assertEqual(updated, 0)
+        receiver.assert_not_called()
+
+    def test_update_count_does_not_grow_with_rows(self):
+        TimeSlot.objects.bulk_create([
+            TimeSlot(
+                table=self.table,
+                date=self.day + timedelta(days=offset),
+                start_time=time(8),
+                end_time=time(9),
+                duration_minutes=60,
+            )
+            for offset in range(1, 200)
+        ])
+
+        with self.assertNumQueries(16):
+            CafeTable.objects.filter(pk=self.table.pk).soft_delete(cascade=True)
+
+    def test_cleared_slots_are_restored_by_generation(self):
+        WorkingHour.objects.create(
+            day_of_week=DayofWeek.values[self.day.weekday()],
+            start_time=time(8),
+            end_time=time(18),
+        )
+        CafeSetting.objects.update_or_create(pk=1, defaults={"slot_duration_minutes": 60})
+
+        staff = User.objects.create_user(username="staff", password="secret", is_staff=True)
+        self.client.force_login(staff)
+        self.client.post(reverse("clear_slots"))
+
+        self.assertEqual(TimeSlot.objects.count(), 1)
+
+        created, skipped = generate_slots(self.day)
 
-# Create your tests here.
+        self.assertEqual((created, skipped), (9, 1))
+        self.assertEqual(TimeSlot.objects.count(), 10)
+        self.assertEqual(TimeSlot.all_objects.count(), 10)
@@ -1,6 +1,7 @@
 from decimal import Decimal
 from menu.models import Category, FoodItem, Discount
 from menu.choices import Type
+from menu.pricing import refresh_effective_prices
 
 FoodItem.objects.all().delete()
 Category.objects.all().delete()
@@ -101,6 +102,8 @@ FoodItem.objects.bulk_create([
     ),
 ])
 
+refresh_effective_prices(FoodItem.objects.filter(category=cat))
+
 print("SEEDED")
 
 
@@ -1,3 +1,28 @@
 from django.contrib import admin
+from .models import OutboxEmail
 
-# Register your models here.
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        "subject",
+        "to",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+    )
+
+    list_filter = (
+        "status",
+    )
+
+    search_fields = (
+        "subject",
+        "last_error",
+    )
+
+    readonly_fields = (
+        "created_at",
+        "sent_at",
+    )
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db import router
+
+USER_CACHE_TIMEOUT = 5 * 60
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_entry(user):
+    # Everything but the password hash. Sessions are checked against the
+    # HMAC Django derives from it, which is cached in its place.
+    values = {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields
+        if field.attname != "password"
+    }
+
+    return values, user.get_session_auth_hash()
+
+
+def _user_from_entry(entry):
+    values, session_auth_hash = entry
+    User = get_user_model()
+
+    # password is left deferred: reading it, e.g. to check a session against
+    # SECRET_KEY_FALLBACKS, loads it from the database, and save() skips it.
+    user = User.from_db(router.db_for_read(User), list(values), list(values.values()))
+    user.get_session_auth_hash = lambda: session_auth_hash
+
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose per-request user lookup is served from the cache.
+    Saving or deleting a user drops the entry (see users.signals); changes
+    made with queryset.update() show up once the entry times out.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username, password, **kwargs)
+
+        # ModelBackend is listed after this one only to keep older sessions
+        # valid; stop before it hashes the same password again.
+        if user is None and password is not None:
+            raise PermissionDenied
+
+        return user
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+
+        if entry is None:
+            try:
+                user = get_user_model()._default_manager.get(pk=user_id)
+            except get_user_model().DoesNotExist:
+                return None
+
+            cache.set(key, _cache_entry(user), USER_CACHE_TIMEOUT)
+        else:
+            user = _user_from_entry(entry)
+
+        return user if self.user_can_authenticate(user) else None
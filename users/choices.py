@@ -0,0 +1,6 @@
+from django.db import models
+
+class OutboxStatus(models.TextChoices):
+    PENDING = "PEN", "Pending"
+    SENT = "SNT", "Sent"
+    FAILED = "FAI", "Failed"
@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand
+from users.outbox import OUTBOX_BATCH_SIZE, OUTBOX_MAX_ATTEMPTS, drain_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Send queued outbox emails in batches over one mail connection. Failed "
+        "messages are retried with exponential backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=OUTBOX_BATCH_SIZE)
+        parser.add_argument("--max-attempts", type=int, default=OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting once it is drained.",
+        )
+        parser.add_argument("--interval", type=float, default=5, help="Seconds between polls.")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                counts = drain_outbox(options["batch_size"], options["max_attempts"])
+            except OSError as e:
+                if not options["loop"]:
+                    raise
+
+                self.stderr.write(f"Mail server unavailable: {e}")
+            else:
+                if sum(counts.values()) or not options["loop"]:
+                    self.stdout.write(
+                        f"Sent {counts['sent']}, will retry {counts['retried']}, "
+                        f"gave up on {counts['failed']}."
+                    )
+
+            if not options["loop"]:
+                return
+
+            time.sleep(options["interval"])
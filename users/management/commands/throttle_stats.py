@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from users.throttling import throttle_stats
+
+
+class Command(BaseCommand):
+    help = "Show the login throttling counters kept in the cache."
+
+    def handle(self, *args, **options):
+        stats = throttle_stats()
+
+        for name, value in stats.items():
+            self.stdout.write(f"{name:<32}{value:>10}")
+
+        self.stdout.write(
+            f"{'password hashes avoided':<32}"
+            f"{stats['login_throttled'] + stats['password_checks_skipped']:>10}"
+        )
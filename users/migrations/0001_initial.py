@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-18 09:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255, verbose_name='Subject')),
+                ('body', models.TextField(verbose_name='Body')),
+                ('from_email', models.CharField(blank=True, max_length=255, verbose_name='From')),
+                ('to', models.JSONField(verbose_name='Recipients')),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('SNT', 'Sent'), ('FAI', 'Failed')], default='PEN', max_length=3, verbose_name='Status')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='Attempts')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next Attempt')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Create Time')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Send Time')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('status', 'PEN')), fields=['next_attempt_at'], name='outbox_pending_due_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,70 @@
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+from .choices import OutboxStatus
 
-# Create your models here.
+
+class OutboxEmail(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(status=OutboxStatus.PENDING),
+                name="outbox_pending_due_idx",
+            ),
+        ]
+
+    subject = models.CharField(
+        max_length=255,
+        verbose_name="Subject"
+    )
+
+    body = models.TextField(
+        verbose_name="Body"
+    )
+
+    from_email = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="From"
+    )
+
+    to = models.JSONField(
+        verbose_name="Recipients"
+    )
+
+    status = models.CharField(
+        max_length=3,
+        choices=OutboxStatus.choices,
+        default=OutboxStatus.PENDING,
+        verbose_name="Status"
+    )
+
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Attempts"
+    )
+
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Next Attempt"
+    )
+
+    last_error = models.TextField(
+        blank=True,
+        verbose_name="Last Error"
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Create Time"
+    )
+
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Send Time"
+    )
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)}"
@@ -0,0 +1,123 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .choices import OutboxStatus
+from .models import OutboxEmail
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_BACKOFF_SECONDS = 30
+OUTBOX_MAX_BACKOFF_SECONDS = 60 * 60
+OUTBOX_CLAIM_SECONDS = 10 * 60
+
+
+def enqueue_mail(subject, body, recipients, from_email=None):
+    """
+    Store the message for the send_outbox worker instead of talking to SMTP
+    inside the request. Written in the caller's transaction, so a rolled back
+    signup never sends mail.
+    """
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(recipients),
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(
+        OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1),
+        OUTBOX_MAX_BACKOFF_SECONDS,
+    ))
+
+
+def claim_outbox_batch(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Take up to batch_size due messages for this worker. The rows are only
+    locked while their next attempt is pushed OUTBOX_CLAIM_SECONDS ahead, so
+    other workers skip them while they are sent, and a worker that dies
+    mid-batch leaves them to be retried once the claim runs out.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                status=OutboxStatus.PENDING,
+                next_attempt_at__lte=now,
+            ).order_by("next_attempt_at", "id")[:batch_size]
+        )
+
+        for email in emails:
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=OUTBOX_CLAIM_SECONDS)
+
+        OutboxEmail.objects.bulk_update(emails, ["attempts", "next_attempt_at"])
+
+    return emails
+
+
+def send_outbox_batch(connection, batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    emails = claim_outbox_batch(batch_size)
+
+    for email in emails:
+        try:
+            EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                email.to,
+                connection=connection,
+            ).send()
+        except Exception as e:
+            email.last_error = f"{type(e).__name__}: {e}"
+
+            if email.attempts >= max_attempts:
+                email.status = OutboxStatus.FAILED
+                counts["failed"] += 1
+            else:
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                counts["retried"] += 1
+
+            # The SMTP session may be unusable after an error. Open a fresh one
+            # for the rest of the batch; if that fails too, the next send tries
+            # again and records the error against its own message.
+            connection.close()
+            try:
+                connection.open()
+            except Exception:
+                pass
+            continue
+
+        email.status = OutboxStatus.SENT
+        email.sent_at = timezone.now()
+        email.last_error = ""
+        counts["sent"] += 1
+
+    OutboxEmail.objects.bulk_update(
+        emails,
+        ["status", "next_attempt_at", "last_error", "sent_at"],
+    )
+
+    return counts
+
+
+def drain_outbox(batch_size=OUTBOX_BATCH_SIZE, max_attempts=OUTBOX_MAX_ATTEMPTS):
+    """
+    Send every due message, batch after batch, over a single mail connection.
+    """
+    totals = {"sent": 0, "retried": 0, "failed": 0}
+
+    with get_connection() as connection:
+        while True:
+            counts = send_outbox_batch(connection, batch_size, max_attempts)
+
+            for key, value in counts.items():
+                totals[key] += value
+
+            if sum(counts.values()) < batch_size:
+                return totals
@@ -1,3 +1,294 @@
-from django.test import TestCase
+import io
+import os
+import pickle
+import tempfile
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection
+from django.core.management import call_command
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .backends import user_cache_key
+from .choices import OutboxStatus
+from .models import OutboxEmail
+from .outbox import drain_outbox, enqueue_mail
+from .throttling import TokenBucket, client_ip, throttle_stats
+
+User = get_user_model()
+
+
+class OutboxTests(TestCase):
+    def test_signup_only_enqueues_the_activation_mail(self):
+        response = self.client.post(reverse("users:signup"), {
+            "username": "newbie",
+            "email": "newbie@example.com",
+            "password1": "a-Long-passw0rd",
+            "password2": "a-Long-passw0rd",
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(mail.outbox, [])
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to, ["newbie@example.com"])
+        self.assertIn("/accounts/activate/", email.body)
+
+        call_command("send_outbox", stdout=io.StringIO())
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, "Activate your account")
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxStatus.SENT)
+        self.assertIsNotNone(email.sent_at)
+
+    def test_batches_share_one_connection(self):
+        for number in range(5):
+            enqueue_mail("Hello", "Body", [f"guest{number}@example.com"])
+
+        with mock.patch.object(EmailBackend, "open", autospec=True) as opened:
+            counts = drain_outbox(batch_size=2)
+
+        self.assertEqual(counts, {"sent": 5, "retried": 0, "failed": 0})
+        self.assertEqual(opened.call_count, 1)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_failures_back_off_then_give_up(self):
+        email = enqueue_mail("Hello", "Body", ["guest@example.com"])
+
+        with mock.patch.object(EmailBackend, "send_messages", side_effect=SMTPException("busy")):
+            self.assertEqual(drain_outbox(max_attempts=2)["retried"], 1)
+
+            email.refresh_from_db()
+            self.assertEqual(email.attempts, 1)
+            self.assertEqual(email.last_error, "SMTPException: busy")
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=20))
+
+            self.assertEqual(drain_outbox(max_attempts=2)["retried"], 0)
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(drain_outbox(max_attempts=2)["failed"], 1)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxStatus.FAILED)
+        self.assertEqual(mail.outbox, [])
+
+    @mock.patch("django.core.mail.backends.smtp.smtplib.SMTP")
+    def test_a_failed_send_reopens_one_connection_for_the_rest(self, smtp):
+        smtp.return_value.sendmail.side_effect = [SMTPException("busy"), {}, {}, {}]
+        for number in range(4):
+            enqueue_mail("Hello", "Body", [f"guest{number}@example.com"])
+
+        with self.settings(EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend"):
+            counts = drain_outbox()
+
+        self.assertEqual(counts, {"sent": 3, "retried": 1, "failed": 0})
+        self.assertEqual(smtp.call_count, 2)
+
+    def test_file_backend_needs_no_network(self):
+        enqueue_mail("Hello", "Body", ["guest@example.com"])
+        directory = tempfile.mkdtemp()
+
+        with self.settings(
+            EMAIL_BACKEND="django.core.mail.backends.filebased.EmailBackend",
+            EMAIL_FILE_PATH=directory,
+        ):
+            self.assertEqual(drain_outbox()["sent"], 1)
+
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="guest", password="secret-pass")
+        self.url = reverse("users:login")
+
+    def login(self, username="guest", password="wrong"):
+        return self.client.post(self.url, {"username": username, "password": password})
+
+    @mock.patch("users.throttling.time.time", return_value=1000)
+    def test_throttled_attempts_never_hash(self, now):
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, 302)
+
+        with mock.patch("django.contrib.auth.base_user.check_password") as check_password:
+            response = self.login()
+
+        self.assertEqual(response.status_code, 429)
+        check_password.assert_not_called()
+        self.assertEqual(throttle_stats()["login_throttled"], 1)
+
+    @mock.patch("users.throttling.time.time", return_value=1000)
+    def test_ip_bucket_covers_many_usernames(self, now):
+        for number in range(20):
+            self.assertEqual(self.login(username=f"user{number}").status_code, 302)
+
+        self.assertEqual(self.login(username="someone-else").status_code, 429)
+
+    @mock.patch("users.throttling.time.time", return_value=1000)
+    def test_ip_bucket_ignores_forwarded_for_by_default(self, now):
+        for number in range(20):
+            self.client.post(
+                self.url,
+                {"username": f"user{number}", "password": "wrong"},
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{number}",
+            )
+
+        self.assertEqual(self.login(username="someone-else").status_code, 429)
+
+    @override_settings(
+        THROTTLE_CLIENT_IP_HEADER="HTTP_X_FORWARDED_FOR",
+        THROTTLE_TRUSTED_PROXIES=1,
+    )
+    def test_client_ip_comes_from_the_trusted_proxy_entry(self):
+        factory = RequestFactory()
+
+        forged = factory.get(
+            "/", HTTP_X_FORWARDED_FOR="1.1.1.1, 203.0.113.7", REMOTE_ADDR="10.0.0.1"
+        )
+        direct = factory.get("/", REMOTE_ADDR="10.0.0.1")
+
+        self.assertEqual(client_ip(forged), "203.0.113.7")
+        self.assertEqual(client_ip(direct), "10.0.0.1")
+
+    def test_bucket_refills_over_time(self):
+        bucket = TokenBucket("test", capacity=2, refill_seconds=10)
+
+        with mock.patch("users.throttling.time.time", return_value=1000):
+            self.assertTrue(bucket.consume("key"))
+            self.assertTrue(bucket.consume("key"))
+            self.assertFalse(bucket.consume("key"))
+
+        with mock.patch("users.throttling.time.time", return_value=1010):
+            self.assertTrue(bucket.consume("key"))
+            self.assertFalse(bucket.consume("key"))
+
+    def test_active_user_failure_hashes_once(self):
+        with mock.patch(
+            "django.contrib.auth.base_user.check_password", return_value=False
+        ) as check_password:
+            self.login()
+
+        self.assertEqual(check_password.call_count, 1)
+        self.assertEqual(throttle_stats()["password_checks_skipped"], 1)
+
+    @mock.patch("users.throttling.time.time", return_value=1000)
+    def test_successful_login_resets_the_username_bucket(self, now):
+        for _ in range(4):
+            self.login()
+
+        self.assertEqual(self.login(password="secret-pass").status_code, 302)
+        self.client.logout()
+
+        for _ in range(5):
+            self.assertEqual(self.login().status_code, 302)
+
+    def test_activation_resend_has_a_cooldown(self):
+        self.user.is_active = False
+        self.user.email = "guest@example.com"
+        self.user.save()
+
+        self.login(password="secret-pass")
+        self.login(password="secret-pass")
+
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+        self.assertEqual(throttle_stats()["activation_resends_suppressed"], 1)
+
+
+class CachedAuthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="guest", password="secret-pass")
+        self.client.force_login(self.user)
+
+    def test_warm_requests_skip_session_and_user_queries(self):
+        self.client.get(reverse("my_reservations"))
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("my_reservations"))
+
+        self.assertEqual(response.context["user"], self.user)
+        tables = " ".join(query["sql"] for query in captured)
+        self.assertNotIn("django_session", tables)
+        self.assertNotIn('FROM "auth_user"', tables)
+
+    def test_session_survives_a_cache_flush(self):
+        self.client.get(reverse("my_reservations"))
+        cache.clear()
+
+        response = self.client.get(reverse("my_reservations"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["user"], self.user)
+
+    def test_saving_the_user_drops_the_cached_copy(self):
+        self.client.get(reverse("my_reservations"))
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        response = self.client.get(reverse("my_reservations"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_deleted_user_is_logged_out(self):
+        self.client.get(reverse("my_reservations"))
+        self.user.delete()
+
+        response = self.client.get(reverse("my_reservations"))
+
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivating_in_the_admin_logs_the_user_out(self):
+        self.client.get(reverse("my_reservations"))
+
+        admin = User.objects.create_superuser(username="admin", password="secret-pass")
+        admin_client = Client()
+        admin_client.force_login(admin)
+        joined = timezone.localtime(self.user.date_joined)
+
+        response = admin_client.post(
+            reverse("admin:auth_user_change", args=[self.user.pk]),
+            {
+                "username": "guest",
+                "date_joined_0": joined.date().isoformat(),
+                "date_joined_1": joined.time().isoformat(),
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.get(pk=self.user.pk).is_active)
+        self.assertEqual(self.client.get(reverse("my_reservations")).status_code, 302)
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(reverse("my_reservations"))
+
+        entry = pickle.dumps(cache.get(user_cache_key(self.user.pk)))
+
+        self.assertNotIn(self.user.password.encode(), entry)
+
+    def test_changing_the_password_ends_other_sessions(self):
+        self.client.get(reverse("my_reservations"))
+
+        self.user.set_password("new-secret-pass")
+        self.user.save()
+
+        self.assertEqual(self.client.get(reverse("my_reservations")).status_code, 302)
+
+    def test_sessions_from_model_backend_stay_valid(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+
+        response = self.client.get(reverse("my_reservations"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["user"], self.user)
@@ -0,0 +1,122 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+
+LOGIN_IP_BUCKET = (20, 6)          # burst of 20, then one attempt every 6 seconds
+LOGIN_USERNAME_BUCKET = (5, 30)    # burst of 5, then one attempt every 30 seconds
+ACTIVATION_RESEND_COOLDOWN = 15 * 60
+
+STATS_KEY = "throttle:stats:{}"
+STATS_COUNTERS = [
+    "login_attempts",
+    "login_throttled",
+    "password_checks_skipped",
+    "activation_resends",
+    "activation_resends_suppressed",
+]
+
+
+def _hashed(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class TokenBucket:
+    """
+    Token bucket kept in the cache: up to capacity requests at once, refilled
+    with one token every refill_seconds. The read and write are not atomic, so
+    under a race a few extra requests may get through, which is fine here.
+    """
+
+    def __init__(self, name, capacity, refill_seconds):
+        self.name = name
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+
+    def key(self, identifier):
+        return f"throttle:{self.name}:{_hashed(identifier)}"
+
+    def consume(self, identifier):
+        key = self.key(identifier)
+        now = time.time()
+        tokens, updated_at = cache.get(key, (self.capacity, now))
+
+        tokens = min(self.capacity, tokens + (now - updated_at) / self.refill_seconds)
+        allowed = tokens >= 1
+
+        if allowed:
+            tokens -= 1
+
+        cache.set(key, (tokens, now), int(self.capacity * self.refill_seconds) + 1)
+        return allowed
+
+    def reset(self, identifier):
+        cache.delete(self.key(identifier))
+
+
+login_ip_bucket = TokenBucket("login-ip", *LOGIN_IP_BUCKET)
+login_username_bucket = TokenBucket("login-username", *LOGIN_USERNAME_BUCKET)
+
+
+def client_ip(request):
+    """
+    The address the IP bucket is keyed on. Behind reverse proxies, set
+    THROTTLE_CLIENT_IP_HEADER to the META key of the forwarded-for header
+    they append to, and THROTTLE_TRUSTED_PROXIES to how many of them do. The
+    client is the entry that many places from the right; anything further
+    left was sent by the client and can be forged.
+    """
+    header = getattr(settings, "THROTTLE_CLIENT_IP_HEADER", None)
+    proxies = getattr(settings, "THROTTLE_TRUSTED_PROXIES", 1)
+
+    if header:
+        addresses = [
+            address.strip()
+            for address in request.META.get(header, "").split(",")
+            if address.strip()
+        ]
+
+        if len(addresses) >= proxies:
+            return addresses[-proxies]
+
+    return request.META.get("REMOTE_ADDR") or "unknown"
+
+
+def count(name):
+    key = STATS_KEY.format(name)
+
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def throttle_stats():
+    values = cache.get_many([STATS_KEY.format(name) for name in STATS_COUNTERS])
+    return {name: values.get(STATS_KEY.format(name), 0) for name in STATS_COUNTERS}
+
+
+def allow_login_attempt(request, username):
+    """
+    Spend a token from both the client IP and the username bucket. Checked
+    before the form authenticates, so a throttled attempt never hashes.
+    """
+    count("login_attempts")
+
+    allowed = login_ip_bucket.consume(client_ip(request))
+    allowed = login_username_bucket.consume((username or "").lower()) and allowed
+
+    if not allowed:
+        count("login_throttled")
+
+    return allowed
+
+
+def allow_activation_resend(user):
+    if cache.add(f"throttle:activation:{user.pk}", True, ACTIVATION_RESEND_COOLDOWN):
+        count("activation_resends")
+        return True
+
+    count("activation_resends_suppressed")
+    return False
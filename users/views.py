@@ -6,11 +6,14 @@ from django.shortcuts import redirect, render
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from django.contrib import messages
-from django.core.mail import send_mail
-from django.conf import settings
+from django.db import transaction
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from .tokens import account_activation_token
+from .outbox import enqueue_mail
+from .throttling import (
+    allow_login_attempt, allow_activation_resend, count, login_username_bucket,
+)
 from django.contrib.auth.forms import AuthenticationForm
 
 
@@ -27,21 +30,22 @@ class SignupView(CreateView):
     def form_valid(self, form):
         user = form.save(commit=False)
         user.is_active = False
-        user.save()
 
-        uid = urlsafe_base64_encode(force_bytes(user.pk))
-        token = account_activation_token.make_token(user)
+        with transaction.atomic():
+            user.save()
 
-        activation_link = self.request.build_absolute_uri(
-            reverse("users:activate", kwargs={"uidb64": uid, "token": token})
-        )
+            uid = urlsafe_base64_encode(force_bytes(user.pk))
+            token = account_activation_token.make_token(user)
 
-        send_mail(
-            "Activate your account",
-            f"Click the link to activate your account:\n{activation_link}",
-            settings.DEFAULT_FROM_EMAIL,
-            [user.email],
-        )
+            activation_link = self.request.build_absolute_uri(
+                reverse("users:activate", kwargs={"uidb64": uid, "token": token})
+            )
+
+            enqueue_mail(
+                "Activate your account",
+                f"Click the link to activate your account:\n{activation_link}",
+                [user.email],
+            )
 
         messages.success(
             self.request,
@@ -76,6 +80,22 @@ class CustomLoginView(LoginView):
     template_name = "registration/login.html"
     authentication_form = SilentAuthenticationForm
 
+    def post(self, request, *args, **kwargs):
+        if not allow_login_attempt(request, request.POST.get("username")):
+            messages.error(
+                request,
+                "Too many login attempts. Please try again later."
+            )
+
+            form = self.get_form_class()(request)
+            return self.render_to_response(self.get_context_data(form=form), status=429)
+
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        login_username_bucket.reset(form.get_user().get_username().lower())
+        return super().form_valid(form)
+
     def form_invalid(self, form):
         username = self.request.POST.get("username")
         password = self.request.POST.get("password")
@@ -83,7 +103,19 @@ class CustomLoginView(LoginView):
         try:
             user = User.objects.get(username=username)
 
-            if user.check_password(password) and not user.is_active:
+            # Authentication already hashed the password once. Only inactive
+            # accounts need the second check, to tell a resend from a typo.
+            if user.is_active:
+                count("password_checks_skipped")
+
+            elif user.check_password(password):
+                if not allow_activation_resend(user):
+                    messages.info(
+                        self.request,
+                        "Your account is not activated. An activation email was sent recently."
+                    )
+
+                    return redirect("login")
 
                 uid = urlsafe_base64_encode(force_bytes(user.pk))
                 token = account_activation_token.make_token(user)
@@ -92,10 +124,9 @@ class CustomLoginView(LoginView):
                     reverse("users:activate", kwargs={"uidb64": uid, "token": token})
                 )
 
-                send_mail(
+                enqueue_mail(
                     "Activate your account",
                     f"Click the link to activate your account:\n{activation_link}",
-                    settings.DEFAULT_FROM_EMAIL,
                     [user.email],
                 )
 